@@ -0,0 +1,44 @@
+"""History and problem indexes
+
+Revision ID: 2f8a6c0e7d35
+Revises: 9e6b1a4d2c58
+Create Date: 2026-10-18 15:48:03.214977
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f8a6c0e7d35'
+down_revision: Union[str, Sequence[str], None] = '9e6b1a4d2c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Indexes created on the partitioned parent are created on every partition, current and future.
+    op.create_index(
+        'ix_monitor_history_monitor_id_checked_at',
+        'monitor_history',
+        ['monitor_id', sa.text('checked_at DESC')],
+    )
+    op.create_index(
+        'ix_monitor_history_failures',
+        'monitor_history',
+        ['monitor_id', sa.text('checked_at DESC')],
+        postgresql_where=sa.text('error_message IS NOT NULL'),
+    )
+    op.create_index(op.f('ix_problem_monitor_id'), 'problem', ['monitor_id'])
+    op.create_index(op.f('ix_problem_history_id'), 'problem', ['history_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_problem_history_id'), table_name='problem')
+    op.drop_index(op.f('ix_problem_monitor_id'), table_name='problem')
+    op.drop_index('ix_monitor_history_failures', table_name='monitor_history')
+    op.drop_index('ix_monitor_history_monitor_id_checked_at', table_name='monitor_history')
@@ -0,0 +1,29 @@
+"""Monitor next_check_at
+
+Revision ID: 3b9f1c2d7a41
+Revises: e4c3eabe1d60
+Create Date: 2026-10-18 10:02:41.318514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9f1c2d7a41'
+down_revision: Union[str, Sequence[str], None] = 'e4c3eabe1d60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing monitors become due immediately.
+    op.add_column('monitors', sa.Column('next_check_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('monitors', 'next_check_at')
@@ -0,0 +1,43 @@
+"""Monitor rollups
+
+Revision ID: 5a2d8e6c4f93
+Revises: f1d7c3b8e920
+Create Date: 2026-10-18 14:05:52.731946
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a2d8e6c4f93'
+down_revision: Union[str, Sequence[str], None] = 'f1d7c3b8e920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('monitor_rollups',
+    sa.Column('monitor_id', sa.Integer(), nullable=False),
+    sa.Column('resolution', sa.Integer(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('check_count', sa.Integer(), nullable=False),
+    sa.Column('down_count', sa.Integer(), nullable=False),
+    sa.Column('degraded_count', sa.Integer(), nullable=False),
+    sa.Column('latency_count', sa.Integer(), nullable=False),
+    sa.Column('latency_sum', sa.Float(), nullable=False),
+    sa.Column('latency_min', sa.Float(), nullable=True),
+    sa.Column('latency_max', sa.Float(), nullable=True),
+    sa.Column('latency_sketch', postgresql.ARRAY(sa.Integer()), nullable=True),
+    sa.ForeignKeyConstraint(['monitor_id'], ['monitors.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('monitor_id', 'resolution', 'bucket_start')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('monitor_rollups')
@@ -0,0 +1,62 @@
+"""Incidents
+
+Revision ID: 7c3d9f1a6e24
+Revises: 2f8a6c0e7d35
+Create Date: 2026-10-18 16:21:37.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3d9f1a6e24'
+down_revision: Union[str, Sequence[str], None] = '2f8a6c0e7d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('incidents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('monitor_id', sa.Integer(), nullable=False),
+    sa.Column('state', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('failure_count', sa.Integer(), nullable=False),
+    sa.Column('opened_history_id', sa.Integer(), nullable=True),
+    sa.Column('resolved_history_id', sa.Integer(), nullable=True),
+    sa.Column('opened_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_failure_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('acknowledged_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['monitor_id'], ['monitors.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'uq_incidents_monitor_unresolved',
+        'incidents',
+        ['monitor_id'],
+        unique=True,
+        postgresql_where=sa.text("state != 'resolved'"),
+    )
+    op.create_index('ix_incidents_monitor_id_opened_at', 'incidents', ['monitor_id', sa.text('opened_at DESC')])
+
+    op.add_column('problem', sa.Column('incident_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'problem_incident_id_fkey', 'problem', 'incidents', ['incident_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index(op.f('ix_problem_incident_id'), 'problem', ['incident_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_problem_incident_id'), table_name='problem')
+    op.drop_constraint('problem_incident_id_fkey', 'problem', type_='foreignkey')
+    op.drop_column('problem', 'incident_id')
+    op.drop_index('ix_incidents_monitor_id_opened_at', table_name='incidents')
+    op.drop_index('uq_incidents_monitor_unresolved', table_name='incidents')
+    op.drop_table('incidents')
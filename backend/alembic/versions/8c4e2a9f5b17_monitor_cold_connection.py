@@ -0,0 +1,28 @@
+"""Monitor cold_connection
+
+Revision ID: 8c4e2a9f5b17
+Revises: 3b9f1c2d7a41
+Create Date: 2026-10-18 11:24:09.604127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e2a9f5b17'
+down_revision: Union[str, Sequence[str], None] = '3b9f1c2d7a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('monitors', sa.Column('cold_connection', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('monitors', 'cold_connection')
@@ -0,0 +1,104 @@
+"""Partition monitor_history by checked_at
+
+Revision ID: 9e6b1a4d2c58
+Revises: 5a2d8e6c4f93
+Create Date: 2026-10-18 15:12:40.518203
+
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e6b1a4d2c58'
+down_revision: Union[str, Sequence[str], None] = '5a2d8e6c4f93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "id, monitor_id, status, status_code, latency, dns_ms, connect_ms, tls_ms, ttfb_ms, body_ms, "
+    "error_message, checked_at"
+)
+PARTITIONS_AHEAD = 3
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('monitors', sa.Column('history_retention_days', sa.Integer(), nullable=True))
+
+    # A primary key of a partitioned table must include the partition key, so monitor_history.id is
+    # no longer unique on its own and problem.history_id cannot keep its foreign key.
+    op.drop_constraint('problem_history_id_fkey', 'problem', type_='foreignkey')
+
+    op.execute("ALTER TABLE monitor_history RENAME TO monitor_history_legacy")
+    op.execute("ALTER TABLE monitor_history_legacy RENAME CONSTRAINT monitor_history_pkey TO monitor_history_legacy_pkey")
+    op.execute("ALTER SEQUENCE monitor_history_id_seq OWNED BY NONE")
+
+    op.execute("""
+        CREATE TABLE monitor_history (
+            id INTEGER NOT NULL DEFAULT nextval('monitor_history_id_seq'),
+            monitor_id INTEGER NOT NULL REFERENCES monitors (id),
+            status VARCHAR,
+            status_code INTEGER,
+            latency DOUBLE PRECISION,
+            dns_ms REAL,
+            connect_ms REAL,
+            tls_ms REAL,
+            ttfb_ms REAL,
+            body_ms REAL,
+            error_message TEXT,
+            checked_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, checked_at)
+        ) PARTITION BY RANGE (checked_at)
+    """)
+    op.execute("CREATE TABLE monitor_history_default PARTITION OF monitor_history DEFAULT")
+
+    # Daily partitions from the oldest existing row up to a few days ahead; the maintenance task keeps extending them.
+    oldest = op.get_bind().execute(sa.text("SELECT min(checked_at) FROM monitor_history_legacy")).scalar()
+    now = datetime.now(timezone.utc)
+    start = (oldest or now).astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    while start <= now + timedelta(days=PARTITIONS_AHEAD):
+        end = start + timedelta(days=1)
+        op.execute(
+            f"CREATE TABLE monitor_history_p{start:%Y%m%d} PARTITION OF monitor_history "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+
+    op.execute(f"INSERT INTO monitor_history ({COLUMNS}) SELECT {COLUMNS} FROM monitor_history_legacy")
+    op.execute("DROP TABLE monitor_history_legacy")
+    op.execute("ALTER SEQUENCE monitor_history_id_seq OWNED BY monitor_history.id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE monitor_history RENAME TO monitor_history_partitioned")
+    op.execute("ALTER TABLE monitor_history_partitioned RENAME CONSTRAINT monitor_history_pkey TO monitor_history_partitioned_pkey")
+    op.execute("ALTER SEQUENCE monitor_history_id_seq OWNED BY NONE")
+
+    op.execute("""
+        CREATE TABLE monitor_history (
+            id INTEGER NOT NULL DEFAULT nextval('monitor_history_id_seq') PRIMARY KEY,
+            monitor_id INTEGER NOT NULL REFERENCES monitors (id),
+            status VARCHAR,
+            status_code INTEGER,
+            latency DOUBLE PRECISION,
+            dns_ms REAL,
+            connect_ms REAL,
+            tls_ms REAL,
+            ttfb_ms REAL,
+            body_ms REAL,
+            error_message TEXT,
+            checked_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute(f"INSERT INTO monitor_history ({COLUMNS}) SELECT {COLUMNS} FROM monitor_history_partitioned")
+    op.execute("DROP TABLE monitor_history_partitioned")
+    op.execute("ALTER SEQUENCE monitor_history_id_seq OWNED BY monitor_history.id")
+
+    op.execute("DELETE FROM problem WHERE history_id NOT IN (SELECT id FROM monitor_history)")
+    op.create_foreign_key('problem_history_id_fkey', 'problem', 'monitor_history', ['history_id'], ['id'])
+    op.drop_column('monitors', 'history_retention_days')
@@ -0,0 +1,54 @@
+"""Problem clusters
+
+Revision ID: b5e1f9a3c7d2
+Revises: 7c3d9f1a6e24
+Create Date: 2026-10-18 16:34:12.417093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e1f9a3c7d2'
+down_revision: Union[str, Sequence[str], None] = '7c3d9f1a6e24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('problem_clusters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('key', sa.String(length=32), nullable=False),
+    sa.Column('host', sa.String(), nullable=False),
+    sa.Column('remote_ip', sa.String(), nullable=True),
+    sa.Column('error_class', sa.String(), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('problem_count', sa.Integer(), nullable=False),
+    sa.Column('opened_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('analyzed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('duckduckgo_search_data', sa.JSON(), nullable=True),
+    sa.Column('ai_analysis', sa.Text(), nullable=True),
+    sa.Column('ai_recommendations', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_problem_clusters_key_opened_at', 'problem_clusters', ['key', sa.text('opened_at DESC')])
+
+    op.add_column('problem', sa.Column('cluster_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'problem_cluster_id_fkey', 'problem', 'problem_clusters', ['cluster_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index(op.f('ix_problem_cluster_id'), 'problem', ['cluster_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_problem_cluster_id'), table_name='problem')
+    op.drop_constraint('problem_cluster_id_fkey', 'problem', type_='foreignkey')
+    op.drop_column('problem', 'cluster_id')
+    op.drop_index('ix_problem_clusters_key_opened_at', table_name='problem_clusters')
+    op.drop_table('problem_clusters')
@@ -0,0 +1,69 @@
+"""Monitor status
+
+Revision ID: d2a7f4c8e1b6
+Revises: b5e1f9a3c7d2
+Create Date: 2026-10-18 19:02:47.581306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7f4c8e1b6'
+down_revision: Union[str, Sequence[str], None] = 'b5e1f9a3c7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('monitor_status',
+    sa.Column('monitor_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('latency', sa.Float(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('checked_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_change_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('consecutive_failures', sa.Integer(), nullable=False),
+    sa.Column('incident_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['monitor_id'], ['monitors.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['incident_id'], ['incidents.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('monitor_id')
+    )
+    op.create_index(op.f('ix_monitors_owner_id'), 'monitors', ['owner_id'])
+
+    # Latest check of every monitor (one index lookup per monitor). Failures are counted and dated
+    # by the unresolved incident; a healthy monitor has been healthy since its last incident was resolved
+    # (or since its first check).
+    op.execute("""
+        INSERT INTO monitor_status (
+            monitor_id, status, status_code, latency, error_message, checked_at,
+            last_change_at, consecutive_failures, incident_id
+        )
+        SELECT
+            m.id, h.status, h.status_code, h.latency, h.error_message, h.checked_at,
+            CASE WHEN h.error_message IS NOT NULL THEN coalesce(i.opened_at, h.checked_at)
+                 ELSE coalesce(
+                     (SELECT max(r.resolved_at) FROM incidents r WHERE r.monitor_id = m.id),
+                     (SELECT f.checked_at FROM monitor_history f WHERE f.monitor_id = m.id
+                      ORDER BY f.checked_at LIMIT 1)
+                 )
+            END,
+            CASE WHEN h.error_message IS NOT NULL THEN coalesce(i.failure_count, 1) ELSE 0 END,
+            CASE WHEN h.error_message IS NOT NULL THEN i.id END
+        FROM monitors m
+        CROSS JOIN LATERAL (
+            SELECT * FROM monitor_history WHERE monitor_id = m.id ORDER BY checked_at DESC, id DESC LIMIT 1
+        ) h
+        LEFT JOIN incidents i ON i.monitor_id = m.id AND i.state != 'resolved'
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_monitors_owner_id'), table_name='monitors')
+    op.drop_table('monitor_status')
@@ -0,0 +1,33 @@
+"""History latency phases
+
+Revision ID: f1d7c3b8e920
+Revises: 8c4e2a9f5b17
+Create Date: 2026-10-18 12:47:33.215870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1d7c3b8e920'
+down_revision: Union[str, Sequence[str], None] = '8c4e2a9f5b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PHASE_COLUMNS = ('dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'body_ms')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # REAL (4 bytes), NULL phases cost only a bit in the null bitmap.
+    for column in PHASE_COLUMNS:
+        op.add_column('monitor_history', sa.Column(column, sa.REAL(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in PHASE_COLUMNS:
+        op.drop_column('monitor_history', column)
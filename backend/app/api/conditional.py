@@ -0,0 +1,83 @@
+import hashlib
+import json
+from logging import getLogger
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response
+from redis.exceptions import RedisError
+
+from backend.app.core.config import settings
+from backend.app.core.redis import redis_client
+from backend.app.services.versions import versions
+
+logger = getLogger(__name__)
+
+# Headers of a cached response that are replayed with its body
+REPLAYED_HEADERS = ("content-type", "x-next-cursor")
+
+
+def make_etag(user_id: int, request: Request, version: list[str]) -> str:
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    payload = f"{user_id}:{request.url.path}?{query}:{':'.join(version)}"
+    return f'"{hashlib.md5(payload.encode()).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Weak comparison (RFC 9110), ignoring the "-br" / "-gzip" suffix api.compression adds to compressed variants.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate == "*" or candidate.strip('"').split("-", 1)[0] == etag.strip('"'):
+            return True
+    return False
+
+
+async def conditional_get(
+        request: Request,
+        user_id: int,
+        scopes: list[str],
+        render: Callable[[], Awaitable[Response]],
+) -> Response:
+    """
+    Answers a GET with a strong ETag derived from the versions of `scopes` (see services.versions).
+    A matching If-None-Match gets 304 before `render` runs, so without touching the database.
+    With RESPONSE_CACHE_SECONDS, 200 responses are also kept in Redis under their ETag
+    and served to any API worker until a version changes or the entry expires.
+    """
+    version = await versions.get(scopes)
+    if version is None:
+        return await render()
+
+    etag = make_etag(user_id, request, version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    cache_key = "response:" + etag.strip('"')
+    if settings.RESPONSE_CACHE_SECONDS:
+        try:
+            cached = await redis_client.get(cache_key)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            cached = None
+        if cached is not None:
+            cached = json.loads(cached)
+            return Response(content=cached["body"], headers={**cached["headers"], "ETag": etag})
+
+    response = await render()
+    if response.status_code != 200:
+        return response
+
+    response.headers["ETag"] = etag
+    if settings.RESPONSE_CACHE_SECONDS:
+        entry = {
+            "body": response.body.decode(),
+            "headers": {name: response.headers[name] for name in REPLAYED_HEADERS if name in response.headers},
+        }
+        try:
+            await redis_client.set(cache_key, json.dumps(entry), ex=settings.RESPONSE_CACHE_SECONDS)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Response cache unavailable: {e}")
+    return response
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.core.database import get_async_session
@@ -44,12 +44,13 @@ async def refresh_token(data: RefreshSchema):
 
 @router.post("/logout/")
 async def logout(
-        authorization: str = None,
+        data: RefreshSchema | None = None,
+        authorization: str = Header(None),
         db: AsyncSession = Depends(get_async_session),
 ):
     """
     User Logout
-    The client must delete tokens on its side.
+    Revokes the access token and, if sent in the body, the refresh token; the client must delete tokens on its side.
     """
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(
@@ -59,6 +60,6 @@ async def logout(
 
     access_token = authorization.replace("Bearer ", "").strip()
 
-    user = await AuthService.logout_user(db, access_token)
+    user = await AuthService.logout_user(db, access_token, data.refresh_token if data else None)
 
     return {"message": f"User {user.full_name} successfully logged out"}
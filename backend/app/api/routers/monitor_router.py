@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.app.api.conditional import conditional_get
 from backend.app.auth.dependencies import get_current_user
 from backend.app.core.database import get_async_session
 from backend.app.models import User
-from backend.app.schemas.monitor import MonitorOut, MonitorCreate
-from backend.app.services.monitor_services import MonitorCRUD, HistoryCRUD
+from backend.app.schemas.incident import IncidentOut
+from backend.app.schemas.monitor import MonitorOut, MonitorCreate, MonitorStatusOut
+from backend.app.services.monitor_services import MonitorCRUD, HistoryCRUD, IncidentCRUD, RollupCRUD
+from backend.app.services.rollups import LatencySketch
+from backend.app.services.status_stream import status_broker, status_events
+from backend.app.services.utils.cursor import InvalidCursor, decode_cursor, encode_cursor
+from backend.app.services.versions import monitor_scope, owner_scope, versions
 
 router = APIRouter(
     prefix="/monitors",
@@ -13,13 +23,46 @@ router = APIRouter(
 )
 
 
+def _as_utc(moment: datetime | None) -> datetime | None:
+    """
+    Naive datetimes from query parameters are taken as UTC.
+    """
+    if moment is None or moment.tzinfo:
+        return moment
+    return moment.replace(tzinfo=timezone.utc)
+
+
+def _decode(token: str | None) -> tuple[datetime, int] | None:
+    if token is None:
+        return None
+    try:
+        return decode_cursor(token)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _page_cursors(records, limit: int) -> dict:
+    """
+    `next_cursor` continues to older records (pass it as `before`), `prev_cursor` to newer ones (`after`).
+    """
+    if not records:
+        return {"next_cursor": None, "prev_cursor": None}
+    first, last = records[0], records[-1]
+    return {
+        "next_cursor": encode_cursor(last.checked_at, last.id) if len(records) == limit else None,
+        "prev_cursor": encode_cursor(first.checked_at, first.id),
+    }
+
+
 @router.post("/", response_model=MonitorOut, status_code=201)
 async def create_monitor(
         data: MonitorCreate,
         db: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(get_current_user)
 ):
-    return await MonitorCRUD.create(db, data, current_user.id)
+    monitor = await MonitorCRUD.create(db, data, current_user.id)
+    await versions.bump([owner_scope(current_user.id)])
+    return monitor
 
 
 @router.delete("/{monitor_id}/", status_code=200)
@@ -28,100 +71,187 @@ async def delete_monitor(
         db: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(get_current_user)
 ):
-    return await MonitorCRUD.delete(db, monitor_id)
+    result = await MonitorCRUD.delete(db, monitor_id)
+    await versions.bump([monitor_scope(monitor_id), owner_scope(current_user.id)])
+    return result
 
 
 @router.get("/", response_model=list[MonitorOut])
 async def get_all_monitors(
+        request: Request,
         skip: int = 0,
         limit: int = 100,
+        cursor: str | None = None,
         db: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(get_current_user)
 
 ):
-    return await MonitorCRUD.get_all(db=db, current_user=current_user.id, skip=skip, limit=limit)
+    """
+    Monitors, newest first. When a page is full, the X-Next-Cursor header holds the `cursor` for the next one.
+    Supports If-None-Match (see api.conditional).
+    """
+    before = _decode(cursor)
+
+    async def render():
+        monitors = await MonitorCRUD.get_all(
+            db=db, current_user=current_user.id, skip=skip, limit=limit, before=before
+        )
+        response = ORJSONResponse([MonitorOut.from_orm(monitor).dict() for monitor in monitors])
+        if monitors and len(monitors) == limit:
+            response.headers["X-Next-Cursor"] = encode_cursor(monitors[-1].created_at, monitors[-1].id)
+        return response
+
+    return await conditional_get(request, current_user.id, [owner_scope(current_user.id)], render)
+
+
+# "/status/" and "/stream/" are declared before "/{monitor_id}/" so that they are not taken for monitor ids.
+@router.get("/status/", response_model=list[MonitorStatusOut], response_class=ORJSONResponse)
+async def get_monitors_status(
+        db: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Latest check result of every monitor of the user, in one query over monitor_status.
+    """
+    statuses = await MonitorCRUD.get_statuses(db=db, current_user=current_user.id)
+    return ORJSONResponse([
+        {**row._asdict(), "consecutive_failures": row.consecutive_failures or 0} for row in statuses
+    ])
+
+
+@router.get("/stream/")
+async def stream_status(
+        db: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Server-Sent Events with the result of every check of the user's monitors, as they are written.
+    Events: "check" (JSON data), "dropped" (number of events skipped because the client fell behind).
+    """
+    # The stream may stay open for hours: give back the connection authentication may have checked out.
+    await db.close()
+    subscription = await status_broker.subscribe(current_user.id)
+
+    async def events():
+        try:
+            async for event in status_events(subscription):
+                yield event
+        finally:
+            # Runs in the cancelled scope of a disconnected client: the UNSUBSCRIBE must not be cancelled too.
+            await asyncio.shield(asyncio.ensure_future(status_broker.unsubscribe(subscription)))
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{monitor_id}/", response_model=MonitorOut)
 async def get_monitor(
+        request: Request,
         monitor_id: int,
         db: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(get_current_user)
 ):
-    monitor = await MonitorCRUD.get_by_id(db=db, current_user=current_user.id, monitor_id=monitor_id)
-    if not monitor:
-        raise HTTPException(status_code=404, detail="Monitor not found")
-    return monitor
+    """
+    Supports If-None-Match (see api.conditional).
+    """
+    async def render():
+        monitor = await MonitorCRUD.get_by_id(db=db, current_user=current_user.id, monitor_id=monitor_id)
+        if not monitor:
+            raise HTTPException(status_code=404, detail="Monitor not found")
+        return ORJSONResponse(MonitorOut.from_orm(monitor).dict())
+
+    return await conditional_get(request, current_user.id, [monitor_scope(monitor_id)], render)
 
 
-@router.get("/{monitor_id}/history/")
+@router.get("/{monitor_id}/history/", response_class=ORJSONResponse)
 async def get_monitor_history(
+        request: Request,
         monitor_id: int,
         limit: int = 10,
+        before: str | None = None,
+        after: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
         db: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(get_current_user)
 ):
-    history = await HistoryCRUD.get_history(
-        db=db,
-        current_user=current_user.id,
-        monitor_id=monitor_id,
-        limit=limit
-    )
-    if not history:
-        raise HTTPException(status_code=404, detail="History for this monitor not found")
+    """
+    Supports If-None-Match (see api.conditional).
+    """
+    before_key, after_key = _decode(before), _decode(after)
 
-    return {
-        "monitor_id": monitor_id,
-        "total_records": len(history),
-        "history": [
-            {
-                "id": record.id,
-                "status": record.status,
-                "status_code": record.status_code,
-                "latency": record.latency,
-                "error_message": record.error_message,
-                "checked_at": record.checked_at.isoformat()
-            }
-            for record in history
-        ]
-    }
+    async def render():
+        history = await HistoryCRUD.get_history(
+            db=db,
+            current_user=current_user.id,
+            monitor_id=monitor_id,
+            limit=limit,
+            before=before_key,
+            after=after_key,
+            since=_as_utc(since),
+            until=_as_utc(until),
+        )
+        paginated = any(value is not None for value in (before, after, since, until))
+        if not history and not paginated:
+            raise HTTPException(status_code=404, detail="History for this monitor not found")
+
+        # Returned as a response, so FastAPI skips jsonable_encoder; orjson encodes the datetimes itself.
+        return ORJSONResponse({
+            "monitor_id": monitor_id,
+            "total_records": len(history),
+            "history": [record._asdict() for record in history],
+            **_page_cursors(history, limit),
+        })
 
+    return await conditional_get(request, current_user.id, [monitor_scope(monitor_id)], render)
 
-@router.get("/{monitor_id}/problem_history/")
+
+@router.get("/{monitor_id}/problem_history/", response_class=ORJSONResponse)
 async def get_monitor_problems(
+        request: Request,
         monitor_id: int,
         limit: int = 10,
+        before: str | None = None,
+        after: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
         db: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(get_current_user)
 ):
     """
-    Get only problem history (with error_messages)
+    Get only problem history (with error_messages).
+    Pages newest first: pass `next_cursor` as `before` for older records, `prev_cursor` as `after` for newer ones.
+    Supports If-None-Match (see api.conditional).
     """
-    problem_history = await HistoryCRUD.get_problem_history(
-        db=db,
-        current_user=current_user.id,
-        monitor_id=monitor_id,
-        limit=limit
-    )
+    before_key, after_key = _decode(before), _decode(after)
 
-    if not problem_history:
-        raise HTTPException(status_code=404, detail="Problem History for this monitor not found")
+    async def render():
+        problem_history = await HistoryCRUD.get_problem_history(
+            db=db,
+            current_user=current_user.id,
+            monitor_id=monitor_id,
+            limit=limit,
+            before=before_key,
+            after=after_key,
+            since=_as_utc(since),
+            until=_as_utc(until),
+        )
 
-    return {
-        "monitor_id": monitor_id,
-        "problems_count": len(problem_history),
-        "problems": [
-            {
-                "id": record.id,
-                "status": record.status,
-                "status_code": record.status_code,
-                "latency": record.latency,
-                "error_message": record.error_message,
-                "checked_at": record.checked_at.isoformat(),
-            }
-            for record in problem_history
-        ]
-    }
+        paginated = any(value is not None for value in (before, after, since, until))
+        if not problem_history and not paginated:
+            raise HTTPException(status_code=404, detail="Problem History for this monitor not found")
+
+        return ORJSONResponse({
+            "monitor_id": monitor_id,
+            "problems_count": len(problem_history),
+            "problems": [record._asdict() for record in problem_history],
+            **_page_cursors(problem_history, limit),
+        })
+
+    return await conditional_get(request, current_user.id, [monitor_scope(monitor_id)], render)
 
 
 @router.get("/{monitor_id}/problem_history/{problem_id}/")
@@ -150,9 +280,119 @@ async def get_more_about_current_monitor_problem(
             {
                 "id": problem.id,
                 "monitor_id": problem.monitor_id,
+                "incident_id": problem.incident_id,
+                "cluster_id": problem.cluster_id,
                 "error_message": problem.history.error_message,
                 "duckduckgo_search_data": problem.duckduckgo_search_data,
                 "ai_analysis": problem.ai_analysis,
                 "ai_recommendations": problem.ai_recommendations,
             }
     }
+
+
+@router.get("/{monitor_id}/incidents/", response_model=list[IncidentOut])
+async def get_monitor_incidents(
+        monitor_id: int,
+        state: str | None = None,
+        limit: int = 20,
+        db: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Incidents of the monitor, newest first. `state`: open, acknowledged or resolved.
+    """
+    return await IncidentCRUD.get_incidents(
+        db=db, current_user=current_user.id, monitor_id=monitor_id, state=state, limit=limit
+    )
+
+
+@router.post("/{monitor_id}/incidents/{incident_id}/acknowledge/", response_model=IncidentOut)
+async def acknowledge_incident(
+        monitor_id: int,
+        incident_id: int,
+        db: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(get_current_user)
+):
+    incident = await IncidentCRUD.acknowledge(
+        db=db, current_user=current_user.id, monitor_id=monitor_id, incident_id=incident_id
+    )
+    if not incident:
+        raise HTTPException(status_code=404, detail="Incident not found")
+    return incident
+
+
+async def _window_stats(
+        db: AsyncSession,
+        current_user: User,
+        monitor_id: int,
+        start: datetime | None,
+        end: datetime | None,
+) -> tuple[datetime, datetime, dict]:
+    monitor = await MonitorCRUD.get_by_id(db=db, current_user=current_user.id, monitor_id=monitor_id)
+    if not monitor:
+        raise HTTPException(status_code=404, detail="Monitor not found")
+
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=1)
+    start, end = _as_utc(start), _as_utc(end)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="'start' must be earlier than 'end'")
+
+    stats = await RollupCRUD.get_window_stats(db=db, monitor_id=monitor_id, start=start, end=end)
+    return start, end, stats
+
+
+@router.get("/{monitor_id}/uptime/")
+async def get_monitor_uptime(
+        monitor_id: int,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        db: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Uptime over [start, end) (default: last 24 hours), computed from rollups.
+    """
+    start, end, stats = await _window_stats(db, current_user, monitor_id, start, end)
+    checks = stats["checks"]
+    healthy = checks - stats["down"] - stats["degraded"]
+
+    return {
+        "monitor_id": monitor_id,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "checks": checks,
+        "down": stats["down"],
+        "degraded": stats["degraded"],
+        "uptime_percent": round(healthy / checks * 100, 3) if checks else None,
+    }
+
+
+@router.get("/{monitor_id}/latency/")
+async def get_monitor_latency(
+        monitor_id: int,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        db: AsyncSession = Depends(get_async_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Latency statistics over [start, end) (default: last 24 hours), computed from rollups.
+    Percentiles are estimated from the rollup latency sketch.
+    """
+    start, end, stats = await _window_stats(db, current_user, monitor_id, start, end)
+    samples = stats["latency_count"]
+    sketch = stats["latency_sketch"]
+
+    return {
+        "monitor_id": monitor_id,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "samples": samples,
+        "avg_ms": stats["latency_sum"] / samples if samples else None,
+        "min_ms": stats["latency_min"],
+        "max_ms": stats["latency_max"],
+        "p50_ms": LatencySketch.quantile(sketch, 0.50),
+        "p95_ms": LatencySketch.quantile(sketch, 0.95),
+        "p99_ms": LatencySketch.quantile(sketch, 0.99),
+    }
@@ -5,6 +5,8 @@ from fastapi.security import HTTPBearer
 from jwt import ExpiredSignatureError, InvalidTokenError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.app.auth.revocation import token_revocation
+from backend.app.auth.user_cache import user_cache
 from backend.app.core.database import get_async_session
 from backend.app.core.security import decode_token
 from backend.app.models import User
@@ -23,6 +25,14 @@ async def get_current_user(token: str = Depends(security), db: AsyncSession = De
     except InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    if payload.get("type") != "access":
+        raise HTTPException(status_code=401, detail="Invalid token type")
+
+    # Tokens issued before revocation existed have no jti; they expire on their own.
+    jti = payload.get("jti")
+    if jti is not None and await token_revocation.is_revoked(jti):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+
     sub = payload.get("sub")
     if sub is None:
         raise HTTPException(status_code=401, detail="Token payload missing 'sub'")
@@ -32,8 +42,14 @@ async def get_current_user(token: str = Depends(security), db: AsyncSession = De
     except (TypeError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid user ID inside token")
 
+    # The session only checks out a connection on a cache miss.
+    user = await user_cache.get(user_id)
+    if user is not None:
+        return user
+
     user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
+    await user_cache.set(user)
     return user
@@ -0,0 +1,98 @@
+import time
+from logging import getLogger
+
+from redis.exceptions import RedisError
+
+from backend.app.core.config import settings
+from backend.app.core.redis import redis_client
+from backend.app.services.utils.bloom import BloomFilter
+
+logger = getLogger(__name__)
+
+REVOKED_KEY = "revoked:{jti}"
+# jti of every revoked access token, scored by its expiry: the source of the Bloom filters
+REVOKED_ACCESS_KEY = "revoked:access"
+
+
+class TokenRevocation:
+    """
+    Revoked tokens, by jti. Entries live in Redis until the token would expire anyway.
+
+    Access tokens are checked on every request: an in-process Bloom filter of the revoked ones,
+    rebuilt from Redis every `sync_interval` seconds, answers "not revoked" without a round trip.
+    Only filter hits (revoked tokens and rare false positives) are checked in Redis.
+    Other processes see a logout within `sync_interval`, this one immediately.
+
+    Refresh tokens are single use: `consume` marks them revoked and tells whether they were before.
+    If Redis is unavailable, access token checks fail open (tokens stay valid until they expire),
+    revoking and consuming fail: a refresh token is never rotated without its use being recorded.
+    """
+
+    def __init__(
+            self,
+            redis,
+            sync_interval: float = settings.TOKEN_REVOCATION_SYNC_SECONDS,
+            bloom_bits: int = settings.TOKEN_REVOCATION_BLOOM_BITS,
+            bloom_hashes: int = settings.TOKEN_REVOCATION_BLOOM_HASHES,
+            clock=time.time,
+    ):
+        self._redis = redis
+        self._sync_interval = sync_interval
+        self._bloom_bits = bloom_bits
+        self._bloom_hashes = bloom_hashes
+        self._clock = clock
+        self._bloom = BloomFilter(bloom_bits, bloom_hashes)
+        self._next_sync = 0.0
+
+    def _ttl(self, expires_at: float) -> int:
+        return max(int(expires_at - self._clock()) + 1, 1)
+
+    async def revoke(self, jti: str, expires_at: float):
+        """
+        Revokes an access token until `expires_at` (unix time). Raises RedisError if Redis is unavailable.
+        """
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(REVOKED_KEY.format(jti=jti), 1, ex=self._ttl(expires_at))
+            pipe.zadd(REVOKED_ACCESS_KEY, {jti: expires_at})
+            await pipe.execute()
+        self._bloom.add(jti)
+
+    async def consume(self, jti: str, expires_at: float) -> bool:
+        """
+        Marks a refresh token as used. Returns False if it already was (or was revoked).
+        Raises RedisError if Redis is unavailable.
+        """
+        return bool(await self._redis.set(REVOKED_KEY.format(jti=jti), 1, ex=self._ttl(expires_at), nx=True))
+
+    async def is_revoked(self, jti: str) -> bool:
+        await self._maybe_sync()
+        if jti not in self._bloom:
+            return False
+        try:
+            return bool(await self._redis.exists(REVOKED_KEY.format(jti=jti)))
+        except (RedisError, OSError) as e:
+            logger.warning(f"Token revocation unavailable: {e}")
+            return False
+
+    async def _maybe_sync(self):
+        now = self._clock()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + self._sync_interval  # concurrent requests keep using the current filter
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.zremrangebyscore(REVOKED_ACCESS_KEY, "-inf", now)
+                pipe.zrange(REVOKED_ACCESS_KEY, 0, -1)
+                _, revoked = await pipe.execute()
+        except (RedisError, OSError) as e:
+            logger.warning(f"Failed to sync revoked tokens: {e}")
+            return
+
+        bloom = BloomFilter(self._bloom_bits, self._bloom_hashes)
+        for jti in revoked:
+            bloom.add(jti)
+        self._bloom = bloom
+
+
+token_revocation = TokenRevocation(redis_client)
@@ -0,0 +1,134 @@
+import asyncio
+import json
+from datetime import datetime
+from logging import getLogger
+
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from backend.app.core.config import settings
+from backend.app.core.redis import redis_client, sync_redis_client
+from backend.app.models import User
+from backend.app.services.utils.cache import TTLCache
+
+logger = getLogger(__name__)
+
+# Columns kept in the cache. The password hash is not: authentication never reads it from here.
+CACHED_COLUMNS = ("id", "email", "full_name", "created_at")
+
+
+class UserCache:
+    """
+    Short-lived cache of authenticated users, keyed on user id: in process, then optionally in Redis.
+    Cached users are detached snapshots of CACHED_COLUMNS, relationships can't be loaded from them.
+
+    Committed changes to users invalidate both tiers in this process and Redis (see the session events
+    below); other processes may serve their local copy for up to `ttl` seconds.
+    Redis errors are logged and ignored: the caller falls back to the database.
+    """
+
+    def __init__(self, ttl: float, max_size: int, redis=None, sync_redis=None):
+        self._ttl = ttl
+        self._local = TTLCache(max_size=max_size, ttl=ttl)
+        self._redis = redis
+        self._sync_redis = sync_redis  # for invalidations outside an event loop (Celery, scripts)
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    async def get(self, user_id: int) -> User | None:
+        data = self._local.get(user_id)
+        if data is None and self._redis is not None:
+            try:
+                cached = await self._redis.get(self._key(user_id))
+            except (RedisError, OSError) as e:
+                logger.warning(f"User cache unavailable: {e}")
+                cached = None
+            if cached is not None:
+                data = json.loads(cached)
+                self._local.set(user_id, data)
+
+        return None if data is None else self._to_user(data)
+
+    async def set(self, user: User):
+        data = {
+            column: value.isoformat() if isinstance(value, datetime) else value
+            for column in CACHED_COLUMNS
+            for value in [getattr(user, column)]
+        }
+        self._local.set(user.id, data)
+        if self._redis is not None:
+            try:
+                await self._redis.set(self._key(user.id), json.dumps(data), ex=self._ttl)
+            except (RedisError, OSError) as e:
+                logger.warning(f"User cache unavailable: {e}")
+
+    def invalidate(self, user_ids):
+        user_ids = list(user_ids)
+        for user_id in user_ids:
+            self._local.pop(user_id)
+
+        if self._redis is None or not user_ids:
+            return
+        keys = [self._key(user_id) for user_id in user_ids]
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        try:
+            if loop is not None:
+                loop.create_task(self._invalidate_redis(keys))
+            elif self._sync_redis is not None:
+                self._sync_redis.delete(*keys)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Failed to invalidate cached users {user_ids}: {e}")
+
+    async def _invalidate_redis(self, keys: list[str]):
+        try:
+            await self._redis.delete(*keys)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Failed to invalidate cached users {keys}: {e}")
+
+    def clear(self):
+        self._local.clear()
+
+    @staticmethod
+    def _to_user(data: dict) -> User:
+        user = User(**{
+            **data,
+            "created_at": datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None,
+        })
+        make_transient_to_detached(user)
+        return user
+
+
+user_cache = UserCache(
+    ttl=settings.USER_CACHE_TTL,
+    max_size=settings.USER_CACHE_SIZE,
+    redis=redis_client if settings.USER_CACHE_REDIS else None,
+    sync_redis=sync_redis_client if settings.USER_CACHE_REDIS else None,
+)
+
+_CHANGED_USERS = "changed_user_ids"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = {user.id for user in (*session.dirty, *session.deleted) if isinstance(user, User)}
+    if changed:
+        session.info.setdefault(_CHANGED_USERS, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    changed = session.info.pop(_CHANGED_USERS, None)
+    if changed:
+        user_cache.invalidate(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop(_CHANGED_USERS, None)
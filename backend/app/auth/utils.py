@@ -1,12 +1,29 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from passlib.context import CryptContext
 
+from backend.app.core.config import settings
 from backend.app.models import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# bcrypt takes 100+ ms of CPU per call and releases the GIL: hashing runs in its own bounded pool,
+# so register/login never stall the event loop and at most PASSWORD_HASH_THREADS cores are spent on it.
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_THREADS, thread_name_prefix="bcrypt")
+
+
+async def hash_password(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, pwd_context.hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(
+        _hash_executor, pwd_context.verify, plain_password, hashed_password
+    )
 
 
 async def get_user_by_email(db: AsyncSession, email: str):
@@ -20,7 +37,7 @@ async def get_user_by_id(db: AsyncSession, user_id: int):
 
 
 async def create_user(db: AsyncSession, email: str, password: str, full_name: str | None = None):
-    hashed_password = pwd_context.hash(password)
+    hashed_password = await hash_password(password)
     user = User(
         email=email,
         hashed_password=hashed_password,
@@ -30,7 +47,3 @@ async def create_user(db: AsyncSession, email: str, password: str, full_name: st
     await db.commit()
     await db.refresh(user)
     return user
-
-
-def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
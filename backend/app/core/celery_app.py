@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.schedules import crontab
 
 from backend.app.core.config import settings
 
@@ -10,9 +11,33 @@ celery = Celery(
 
 celery.autodiscover_tasks(['backend.app.tasks'])
 
+# With SCHEDULER_BACKEND="memory" the scheduler keeps its due-queue in process memory,
+# so this queue must be consumed by exactly one solo worker. The "redis" backend allows several replicas.
+celery.conf.task_routes = {
+    'backend.app.tasks.scheduler.schedule_monitoring': {'queue': 'scheduler'},
+    # DuckDuckGo + LLM enrichment of incidents has its own workers, so it never delays probes.
+    'backend.app.tasks.enrichment.enrich_problem': {'queue': 'enrichment'},
+    'backend.app.tasks.enrichment.enrich_cluster': {'queue': 'enrichment'},
+    # Alerts that reuse a finished analysis only read a few rows and queue an email: they stay on the
+    # default queue, so they are not stuck behind the enrichment backlog.
+    'backend.app.tasks.enrichment.notify_problem': {'queue': 'celery'},
+    'backend.app.tasks.enrichment.notify_incident_resolved': {'queue': 'celery'},
+}
+
+# Lets the Redis broker order tasks of a queue by priority (0 is the highest).
+celery.conf.broker_transport_options = {
+    'priority_steps': list(range(10)),
+    'sep': ':',
+    'queue_order_strategy': 'priority',
+}
+
 celery.conf.beat_schedule = {
     'schedule-dynamic-monitoring': {
         'task': 'backend.app.tasks.scheduler.schedule_monitoring',
         'schedule': 1.0,
     },
+    'maintain-history-partitions': {
+        'task': 'backend.app.tasks.maintenance.maintain_history_partitions',
+        'schedule': crontab(minute=7),
+    },
 }
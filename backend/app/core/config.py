@@ -24,6 +24,12 @@ class Settings(BaseSettings):
 
     EMAIL_HOST_USER: str = os.getenv('EMAIL_HOST_USER')
     EMAIL_HOST_PASSWORD: str = os.getenv('EMAIL_HOST_PASSWORD')
+    EMAIL_HOST: str = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
+    EMAIL_PORT: int = os.getenv('EMAIL_PORT', 587)
+    EMAIL_USE_TLS: bool = os.getenv('EMAIL_USE_TLS', True)
+    SMTP_IDLE_SECONDS: int = os.getenv('SMTP_IDLE_SECONDS', 60)  # idle connections are closed after this
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = os.getenv('SMTP_MAX_MESSAGES_PER_CONNECTION', 100)
+    ALERT_DIGEST_SECONDS: int = os.getenv('ALERT_DIGEST_SECONDS', 0)  # 0 disables digests
 
     GEMINI_API_KEY: str = os.getenv('GEMINI_API_KEY')
     DEEPSEEK_API_KEY: str = os.getenv('DEEPSEEK_API_KEY')
@@ -31,6 +37,78 @@ class Settings(BaseSettings):
 
     REDIS_URL: str = os.getenv('REDIS_URL')
 
+    LLM_PROVIDERS: str = os.getenv('LLM_PROVIDERS', 'huggingface,gemini,deepseek')  # fallback order
+    LLM_TIMEOUT: float = os.getenv('LLM_TIMEOUT', 15)  # per provider request
+    LLM_TOTAL_TIMEOUT: float = os.getenv('LLM_TOTAL_TIMEOUT', 35)  # whole fallback chain
+    LLM_CONCURRENCY: int = os.getenv('LLM_CONCURRENCY', 4)  # per provider and worker process
+    LLM_HEDGE_AFTER_SECONDS: float = os.getenv('LLM_HEDGE_AFTER_SECONDS', 0)  # 0 disables hedging
+
+    PROBE_CONCURRENCY: int = os.getenv('PROBE_CONCURRENCY', 500)
+    PROBE_TIMEOUT: float = os.getenv('PROBE_TIMEOUT', 10)
+    PROBE_BATCH_SIZE: int = os.getenv('PROBE_BATCH_SIZE', 200)
+    PROBE_HTTP2: bool = os.getenv('PROBE_HTTP2', True)
+    PROBE_MAX_CONNECTIONS: int = os.getenv('PROBE_MAX_CONNECTIONS', 1000)
+    PROBE_MAX_KEEPALIVE: int = os.getenv('PROBE_MAX_KEEPALIVE', 200)
+    PROBE_KEEPALIVE_EXPIRY: float = os.getenv('PROBE_KEEPALIVE_EXPIRY', 90)
+
+    DNS_CACHE_MIN_TTL: float = os.getenv('DNS_CACHE_MIN_TTL', 5)
+    DNS_CACHE_MAX_TTL: float = os.getenv('DNS_CACHE_MAX_TTL', 300)
+
+    HISTORY_FLUSH_ROWS: int = os.getenv('HISTORY_FLUSH_ROWS', 500)
+    HISTORY_FLUSH_MS: int = os.getenv('HISTORY_FLUSH_MS', 1000)
+
+    HISTORY_RETENTION_DAYS: int = os.getenv('HISTORY_RETENTION_DAYS', 30)
+    HISTORY_PARTITION_DAYS: int = os.getenv('HISTORY_PARTITION_DAYS', 1)
+    HISTORY_PARTITIONS_AHEAD: int = os.getenv('HISTORY_PARTITIONS_AHEAD', 3)
+    HISTORY_DOWNSAMPLE_ON_DROP: bool = os.getenv('HISTORY_DOWNSAMPLE_ON_DROP', True)
+    ROLLUP_MINUTE_RETENTION_DAYS: int = os.getenv('ROLLUP_MINUTE_RETENTION_DAYS', 7)
+    ROLLUP_HOUR_RETENTION_DAYS: int = os.getenv('ROLLUP_HOUR_RETENTION_DAYS', 180)
+
+    SCHEDULER_BACKEND: str = os.getenv('SCHEDULER_BACKEND', 'memory')  # 'memory', 'redis'
+    SCHEDULER_RESYNC_SECONDS: int = os.getenv('SCHEDULER_RESYNC_SECONDS', 30)
+    SCHEDULER_LEASE_SECONDS: int = os.getenv('SCHEDULER_LEASE_SECONDS', 10)
+    SCHEDULER_CLAIM_LIMIT: int = os.getenv('SCHEDULER_CLAIM_LIMIT', 5000)
+
+    SINGLE_FLIGHT_LOCK_SECONDS: int = os.getenv('SINGLE_FLIGHT_LOCK_SECONDS', 60)
+    SINGLE_FLIGHT_WAIT_SECONDS: float = os.getenv('SINGLE_FLIGHT_WAIT_SECONDS', 40)
+    AI_CACHE_TTL: int = os.getenv('AI_CACHE_TTL', 3600)
+    AI_CACHE_SIZE: int = os.getenv('AI_CACHE_SIZE', 1024)
+    DDG_CACHE_TTL: int = os.getenv('DDG_CACHE_TTL', 900)
+    DDG_CACHE_SIZE: int = os.getenv('DDG_CACHE_SIZE', 1024)  # in-process entries
+    DDG_MAX_THREADS: int = os.getenv('DDG_MAX_THREADS', 4)
+
+    BCRYPT_ROUNDS: int = os.getenv('BCRYPT_ROUNDS', 12)  # work factor of new password hashes
+    PASSWORD_HASH_THREADS: int = os.getenv('PASSWORD_HASH_THREADS', 4)
+
+    # Revoked access tokens: Bloom filter rebuilt from Redis this often in every API process
+    TOKEN_REVOCATION_SYNC_SECONDS: float = os.getenv('TOKEN_REVOCATION_SYNC_SECONDS', 5)
+    TOKEN_REVOCATION_BLOOM_BITS: int = os.getenv('TOKEN_REVOCATION_BLOOM_BITS', 1 << 20)
+    TOKEN_REVOCATION_BLOOM_HASHES: int = os.getenv('TOKEN_REVOCATION_BLOOM_HASHES', 7)
+
+    # Responses of at least COMPRESSION_MIN_SIZE bytes are compressed (brotli, else gzip)
+    COMPRESSION_MIN_SIZE: int = os.getenv('COMPRESSION_MIN_SIZE', 1024)
+    BROTLI_QUALITY: int = os.getenv('BROTLI_QUALITY', 4)
+    GZIP_LEVEL: int = os.getenv('GZIP_LEVEL', 6)
+
+    # GET responses are also cached in Redis under their ETag for this long; 0 disables it
+    RESPONSE_CACHE_SECONDS: int = os.getenv('RESPONSE_CACHE_SECONDS', 0)
+
+    # Live status stream: events buffered per client (oldest dropped beyond) and keep-alive interval
+    STATUS_STREAM_QUEUE_SIZE: int = os.getenv('STATUS_STREAM_QUEUE_SIZE', 100)
+    STATUS_STREAM_KEEPALIVE_SECONDS: float = os.getenv('STATUS_STREAM_KEEPALIVE_SECONDS', 15)
+
+    # Authenticated users are cached in process (and in Redis with USER_CACHE_REDIS) for this long
+    USER_CACHE_TTL: int = os.getenv('USER_CACHE_TTL', 30)
+    USER_CACHE_SIZE: int = os.getenv('USER_CACHE_SIZE', 10000)
+    USER_CACHE_REDIS: bool = os.getenv('USER_CACHE_REDIS', False)
+
+    # Problems opened this close to the first one of a cluster share its analysis; 0 disables clustering
+    CLUSTER_WINDOW_SECONDS: int = os.getenv('CLUSTER_WINDOW_SECONDS', 300)
+
+    # Priorities on the "enrichment" queue, 0 is the highest
+    ENRICHMENT_PRIORITY_DOWN: int = os.getenv('ENRICHMENT_PRIORITY_DOWN', 0)
+    ENRICHMENT_PRIORITY_DEGRADED: int = os.getenv('ENRICHMENT_PRIORITY_DEGRADED', 5)
+
     class Config:
         env_file = ".env"
 
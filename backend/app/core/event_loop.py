@@ -0,0 +1,58 @@
+import asyncio
+import os
+from logging import getLogger
+from typing import Any, Awaitable, Callable, Coroutine
+
+from celery.signals import worker_process_shutdown
+
+logger = getLogger(__name__)
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_pid: int | None = None
+
+_shutdown_hooks: list[Callable[[], Awaitable[None]]] = []
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the long-lived event loop of the current worker process.
+    The loop is created lazily, so every prefork child gets its own one after the fork.
+    """
+    global _loop, _loop_pid
+
+    if _loop is None or _loop.is_closed() or _loop_pid != os.getpid():
+        _loop = asyncio.new_event_loop()
+        _loop_pid = os.getpid()
+        asyncio.set_event_loop(_loop)
+
+    return _loop
+
+
+def run_in_worker_loop(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Runs a coroutine on the worker loop instead of creating a new loop per call (asyncio.run).
+    Loop-bound resources (HTTP clients, Redis pools) can therefore be reused between tasks.
+    """
+    return get_worker_loop().run_until_complete(coro)
+
+
+def on_worker_loop_shutdown(hook: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """
+    Registers a coroutine function that releases loop-bound resources on worker shutdown.
+    """
+    _shutdown_hooks.append(hook)
+    return hook
+
+
+@worker_process_shutdown.connect
+def _close_worker_loop(**kwargs):
+    if _loop is None or _loop.is_closed() or _loop_pid != os.getpid():
+        return
+
+    for hook in _shutdown_hooks:
+        try:
+            _loop.run_until_complete(hook())
+        except Exception as e:
+            logger.error(f"Worker loop shutdown hook failed: {e}")
+
+    _loop.close()
@@ -1,11 +1,23 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from backend.app.api.compression import CompressionMiddleware
 from backend.app.api.routers.monitor_router import router as monitor_router
 from backend.app.api.routers.auth_router import router as auth_router
+from backend.app.core.config import settings
+from backend.app.services.status_stream import status_broker
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await status_broker.aclose()
+
 
-app = FastAPI(title="API Health Monitor")
+app = FastAPI(title="API Health Monitor", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,6 +30,14 @@ app.add_middleware(
     allow_headers=["*"],  # Разрешить все заголовки
 )
 
+# Large JSON pages (history, problems) are sent brotli- or gzip-compressed when the client accepts it.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    compresslevel=settings.GZIP_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
+)
+
 
 app.include_router(monitor_router)
 app.include_router(auth_router)
@@ -1,6 +1,19 @@
+from .incident import Incident
 from .monitor_history import MonitorHistory
 from .monitor import Monitor
+from .monitor_rollup import MonitorRollup
+from .monitor_status import MonitorStatus
 from .problem import Problem
+from .problem_cluster import ProblemCluster
 from .user import User
 
-__all__ = ["User", "Monitor", "MonitorHistory", "Problem"]
+__all__ = [
+    "User",
+    "Monitor",
+    "MonitorHistory",
+    "MonitorRollup",
+    "MonitorStatus",
+    "Problem",
+    "ProblemCluster",
+    "Incident",
+]
@@ -0,0 +1,47 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Text, Index
+from sqlalchemy.orm import relationship
+
+from ..core.database import Base
+
+
+class Incident(Base):
+    """
+    A period during which a monitor keeps failing: opened by the first failed check,
+    resolved by the first healthy one. Failures in between only bump the counters.
+    """
+    __tablename__ = "incidents"
+
+    OPEN = "open"
+    ACKNOWLEDGED = "acknowledged"
+    RESOLVED = "resolved"
+
+    id = Column(Integer, primary_key=True)
+    monitor_id = Column(Integer, ForeignKey("monitors.id", ondelete="CASCADE"), nullable=False)
+
+    state = Column(String, nullable=False, default=OPEN)  # 'open', 'acknowledged', 'resolved'
+    status = Column(String)  # status of the check that opened the incident: 'down', 'degraded'
+    error_message = Column(Text)
+
+    failure_count = Column(Integer, nullable=False, default=1)
+    opened_history_id = Column(Integer)
+    resolved_history_id = Column(Integer)
+
+    opened_at = Column(DateTime(timezone=True), nullable=False)
+    last_failure_at = Column(DateTime(timezone=True), nullable=False)
+    acknowledged_at = Column(DateTime(timezone=True))
+    resolved_at = Column(DateTime(timezone=True))
+
+    monitor = relationship("Monitor", back_populates="incidents")
+    problems = relationship("Problem", back_populates="incident")
+
+    __table_args__ = (
+        # at most one unresolved incident per monitor
+        Index(
+            "uq_incidents_monitor_unresolved",
+            monitor_id,
+            unique=True,
+            postgresql_where=state != RESOLVED,
+            sqlite_where=state != RESOLVED,
+        ),
+        Index("ix_incidents_monitor_id_opened_at", monitor_id, opened_at.desc()),
+    )
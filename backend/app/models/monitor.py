@@ -1,5 +1,5 @@
 from ..core.database import Base
-from sqlalchemy import Column, Integer, String, DateTime, func, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, func, Boolean, ForeignKey, false
 from sqlalchemy.orm import relationship
 
 
@@ -14,6 +14,14 @@ class Monitor(Base):
 
     check_interval = Column(Integer, default=60)
     is_active = Column(Boolean, default=True)
+    cold_connection = Column(Boolean, default=False, server_default=false(), nullable=False)
+    history_retention_days = Column(Integer, nullable=True)  # None: settings.HISTORY_RETENTION_DAYS
+
+    next_check_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
 
     created_at = Column(
         DateTime(timezone=True),
@@ -21,8 +29,9 @@ class Monitor(Base):
         nullable=False
     )
 
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     owner = relationship("User", back_populates="monitors")
 
     history = relationship("MonitorHistory", back_populates="monitor")
     problem = relationship("Problem", back_populates="monitor")
+    incidents = relationship("Incident", back_populates="monitor")
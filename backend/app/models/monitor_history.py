@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime, String, Text, func
+from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime, String, Text, REAL, Index, func
 from sqlalchemy.orm import relationship
 
 from ..core.database import Base
 
 
 class MonitorHistory(Base):
+    # In Postgres the table is range-partitioned by checked_at with the primary key (id, checked_at),
+    # see the "history partitioning" migration and tasks.maintenance. id alone is unique (sequence).
     __tablename__ = "monitor_history"
 
     id = Column(Integer, primary_key=True)
@@ -13,6 +15,14 @@ class MonitorHistory(Base):
     status = Column(String)  # 'healthy', 'down', 'degraded'
     status_code = Column(Integer)  # 200, 300, 400, 500
     latency = Column(Float)  # ms
+
+    # Latency breakdown, ms (None when the phase was skipped, e.g. on a reused connection)
+    dns_ms = Column(REAL)
+    connect_ms = Column(REAL)
+    tls_ms = Column(REAL)
+    ttfb_ms = Column(REAL)
+    body_ms = Column(REAL)
+
     error_message = Column(Text, default=None)
     checked_at = Column(
         DateTime(timezone=True),
@@ -21,4 +31,21 @@ class MonitorHistory(Base):
     )
 
     monitor = relationship("Monitor", back_populates="history")
-    problem = relationship("Problem", back_populates="history")
+    problem = relationship(
+        "Problem",
+        primaryjoin="MonitorHistory.id == foreign(Problem.history_id)",
+        back_populates="history",
+    )
+
+    __table_args__ = (
+        # "latest checks of a monitor": history and keyset pagination
+        Index("ix_monitor_history_monitor_id_checked_at", monitor_id, checked_at.desc()),
+        # "latest failed checks of a monitor": failures are a small share of the rows
+        Index(
+            "ix_monitor_history_failures",
+            monitor_id,
+            checked_at.desc(),
+            postgresql_where=error_message.isnot(None),
+            sqlite_where=error_message.isnot(None),
+        ),
+    )
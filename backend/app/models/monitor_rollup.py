@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime, JSON
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from ..core.database import Base
+
+
+class MonitorRollup(Base):
+    """
+    Per-monitor aggregates of check results over fixed buckets (1m, 1h, 1d).
+    """
+    __tablename__ = "monitor_rollups"
+
+    monitor_id = Column(Integer, ForeignKey("monitors.id", ondelete="CASCADE"), primary_key=True)
+    resolution = Column(Integer, primary_key=True)  # bucket size, seconds: 60, 3600, 86400
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+
+    check_count = Column(Integer, nullable=False, default=0)
+    down_count = Column(Integer, nullable=False, default=0)
+    degraded_count = Column(Integer, nullable=False, default=0)
+
+    latency_count = Column(Integer, nullable=False, default=0)
+    latency_sum = Column(Float, nullable=False, default=0)  # ms
+    latency_min = Column(Float)  # ms
+    latency_max = Column(Float)  # ms
+    latency_sketch = Column(ARRAY(Integer).with_variant(JSON(), "sqlite"))  # see services.rollups.LatencySketch
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime, String, Text
+
+from ..core.database import Base
+
+
+class MonitorStatus(Base):
+    """
+    Latest check result of a monitor, one row per monitor, updated with every flushed check
+    (see services.monitor_status). Lets "status of all my monitors" skip the history table.
+    """
+    __tablename__ = "monitor_status"
+
+    monitor_id = Column(Integer, ForeignKey("monitors.id", ondelete="CASCADE"), primary_key=True)
+
+    status = Column(String)  # 'healthy', 'down', 'degraded'
+    status_code = Column(Integer)
+    latency = Column(Float)  # ms
+    error_message = Column(Text)
+    checked_at = Column(DateTime(timezone=True), nullable=False)
+
+    last_change_at = Column(DateTime(timezone=True), nullable=False)  # first check with the current status
+    consecutive_failures = Column(Integer, nullable=False, default=0)
+    incident_id = Column(Integer, ForeignKey("incidents.id", ondelete="SET NULL"))  # unresolved incident, if any
@@ -8,12 +8,21 @@ class Problem(Base):
     __tablename__ = "problem"
 
     id = Column(Integer, primary_key=True)
-    history_id = Column(Integer, ForeignKey("monitor_history.id"), nullable=False)
-    monitor_id = Column(Integer, ForeignKey("monitors.id"), nullable=False)
+    # monitor_history is partitioned by checked_at, so its id alone can't be referenced by a foreign key.
+    history_id = Column(Integer, nullable=False, index=True)
+    monitor_id = Column(Integer, ForeignKey("monitors.id"), nullable=False, index=True)
+    incident_id = Column(Integer, ForeignKey("incidents.id", ondelete="SET NULL"), nullable=True, index=True)
+    cluster_id = Column(Integer, ForeignKey("problem_clusters.id", ondelete="SET NULL"), nullable=True, index=True)
 
     duckduckgo_search_data = Column(JSON, nullable=True)
     ai_analysis = Column(Text, nullable=True)
     ai_recommendations = Column(Text, nullable=True)
 
-    history = relationship("MonitorHistory", back_populates="problem")
+    history = relationship(
+        "MonitorHistory",
+        primaryjoin="foreign(Problem.history_id) == MonitorHistory.id",
+        back_populates="problem",
+    )
     monitor = relationship("Monitor", back_populates="problem")
+    incident = relationship("Incident", back_populates="problems")
+    cluster = relationship("ProblemCluster", back_populates="problems")
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, DateTime, String, Text, JSON, Index
+from sqlalchemy.orm import relationship
+
+from ..core.database import Base
+
+
+class ProblemCluster(Base):
+    """
+    Problems of one owner opened within a short window by the same root cause: the same address (or host)
+    failing with the same error class. Enrichment runs once per cluster and is shared by its problems.
+    """
+    __tablename__ = "problem_clusters"
+
+    id = Column(Integer, primary_key=True)
+    # md5 of "{owner_id}:{target}:{error class}", target is remote_ip or host,
+    # "{remote_ip}/{host}" for HTTP status classes (see services.clusters.cluster_key)
+    key = Column(String(32), nullable=False)
+
+    host = Column(String, nullable=False)
+    remote_ip = Column(String)
+    error_class = Column(String, nullable=False)
+    # failure of the first problem, the one analyzed for the whole cluster
+    url = Column(String, nullable=False)
+    error_message = Column(Text)
+
+    problem_count = Column(Integer, nullable=False, default=1)
+    opened_at = Column(DateTime(timezone=True), nullable=False)
+    analyzed_at = Column(DateTime(timezone=True))
+
+    duckduckgo_search_data = Column(JSON, nullable=True)
+    ai_analysis = Column(Text, nullable=True)
+    ai_recommendations = Column(Text, nullable=True)
+
+    problems = relationship("Problem", back_populates="cluster")
+
+    __table_args__ = (
+        Index("ix_problem_clusters_key_opened_at", key, opened_at.desc()),
+    )
@@ -0,0 +1,19 @@
+from datetime import datetime
+from pydantic.v1 import BaseModel
+
+
+# -------- Out --------
+class IncidentOut(BaseModel):
+    id: int
+    monitor_id: int
+    state: str
+    status: str | None = None
+    error_message: str | None = None
+    failure_count: int
+    opened_at: datetime
+    last_failure_at: datetime
+    acknowledged_at: datetime | None = None
+    resolved_at: datetime | None = None
+
+    class Config:
+        orm_mode = True
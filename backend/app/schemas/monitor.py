@@ -8,6 +8,8 @@ class MonitorBase(BaseModel):
     expected_status_code: int = 200
     check_interval: int = 60
     is_active: bool = True
+    cold_connection: bool = False
+    history_retention_days: int | None = None
 
 
 class MonitorCreate(MonitorBase):
@@ -20,6 +22,8 @@ class MonitorUpdate(BaseModel):
     expected_status_code: int | None = None
     check_interval: int | None = None
     is_active: bool | None = None
+    cold_connection: bool | None = None
+    history_retention_days: int | None = None
 
 
 class MonitorOut(BaseModel):
@@ -29,7 +33,24 @@ class MonitorOut(BaseModel):
     created_at: datetime
     expected_status_code: int = 200
     check_interval: int
+    cold_connection: bool = False
+    history_retention_days: int | None = None
     created_at: datetime
 
     class Config:
         orm_mode = True
+
+
+class MonitorStatusOut(BaseModel):
+    monitor_id: int
+    name: str | None = None
+    url: str
+    is_active: bool | None = None
+    status: str | None = None
+    status_code: int | None = None
+    latency: float | None = None
+    error_message: str | None = None
+    checked_at: datetime | None = None
+    last_change_at: datetime | None = None
+    consecutive_failures: int = 0
+    incident_id: int | None = None
@@ -1,51 +1,59 @@
 import asyncio
-import json
 from logging import getLogger
 
-from redis import asyncio as aioredis
-
-from backend.app.services.utils.hugging_face import call_huggingface
-from backend.app.services.utils.cache import prompt_cache_key
+from backend.app.core.redis import redis_client
+from backend.app.services.single_flight import SingleFlight
+from backend.app.services.utils.deepseek import deepseek
+from backend.app.services.utils.gemini import gemini
+from backend.app.services.utils.hugging_face import huggingface
+from backend.app.services.utils.providers import ProviderChain
+from backend.app.services.utils.cache import TTLCache, prompt_cache_key
 from backend.app.services.utils.prompts import create_analysis_prompt
 from backend.app.core.config import settings
 
 logger = getLogger(__name__)
 
-redis = aioredis.from_url(
-    settings.REDIS_URL,
-    encoding="utf-8",
-    decode_responses=True,
-    socket_timeout=5,
-    socket_connect_timeout=5,
-    retry_on_timeout=True,
+# Repeated incidents are answered from process memory; Redis is the shared second tier.
+local_cache = TTLCache(max_size=settings.AI_CACHE_SIZE, ttl=settings.AI_CACHE_TTL)
+
+single_flight = SingleFlight(redis_client, local=local_cache)
+
+PROVIDERS = {provider.name: provider for provider in (huggingface, gemini, deepseek)}
+
+llm_chain = ProviderChain(
+    [PROVIDERS[name.strip()] for name in settings.LLM_PROVIDERS.split(",") if name.strip()],
+    hedge_after=settings.LLM_HEDGE_AFTER_SECONDS,
 )
 
 
 async def ai_analyze_issue(url: str, error_message: str, ddg_results: list) -> tuple[str, str]:
     """
     AI-driven incident analysis with Redis caching.
+    Concurrent calls for the same incident, from any worker, share a single LLM request.
     Returns: (analysis_text, resolution_steps)
     """
 
     cache_key = prompt_cache_key(url, error_message[:200])
 
-    cached = await redis.get(cache_key)
-
     logger.info('-' * 50)
     logger.info('Inside_ai_analise')
     logger.info('-' * 50)
 
-    if cached:
-        try:
-            data = json.loads(cached)
+    result = await single_flight.do(
+        cache_key,
+        lambda: _analyze(url, error_message, ddg_results),
+        ttl=settings.AI_CACHE_TTL,
+        cache_if=lambda data: not data.get("error"),
+    )
+
+    logger.info('-' * 50)
+    logger.info(f'Returning_ai_analise, cache {single_flight.stats}')
+    logger.info('-' * 50)
+
+    return result["analysis"], result["resolution"]
 
-            logger.info('-' * 50)
-            logger.info('Returning data from cache: ', data)
-            logger.info('-' * 50)
-            return data["analysis"], data["resolution"]
-        except json.JSONDecodeError:
-            pass
 
+async def _analyze(url: str, error_message: str, ddg_results: list) -> dict:
     prompt = create_analysis_prompt(url, error_message, ddg_results)
 
     logger.debug('-' * 50)
@@ -54,14 +62,18 @@ async def ai_analyze_issue(url: str, error_message: str, ddg_results: list) -> t
 
     try:
         response = await asyncio.wait_for(
-            call_huggingface(prompt),
-            timeout=25
+            llm_chain.complete(prompt),
+            timeout=settings.LLM_TOTAL_TIMEOUT
         )
 
     except asyncio.TimeoutError:
-        return ("AI timeout", "AI service is not responding — handle manually.")
+        return {
+            "analysis": "AI timeout",
+            "resolution": "AI service is not responding — handle manually.",
+            "error": True,
+        }
     except Exception as e:
-        return ("AI error", f"Failed to process AI request: {e}")
+        return {"analysis": "AI error", "resolution": f"Failed to process AI request: {e}", "error": True}
 
     logger.info('-' * 50)
     logger.info(f'AI Model response: {response}')
@@ -90,15 +102,7 @@ async def ai_analyze_issue(url: str, error_message: str, ddg_results: list) -> t
         elif mode == "resolution":
             resolution.append(text)
 
-    result = {
+    return {
         "analysis": " ".join(analysis) if analysis else "Analysis not found",
         "resolution": "\n".join(resolution) if resolution else "Resolution steps not found"
     }
-
-    await redis.set(cache_key, json.dumps(result), ex=3600)
-
-    logger.info('-' * 50)
-    logger.info('Returning_ai_analise')
-    logger.info('-' * 50)
-
-    return result["analysis"], result["resolution"]
@@ -1,6 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from redis.exceptions import RedisError
 
+from backend.app.auth.revocation import token_revocation
 from backend.app.auth.utils import get_user_by_email, create_user, verify_password, get_user_by_id
 from backend.app.core.security import create_access_token, create_refresh_token, decode_token
 from backend.app.schemas.user import UserCreate, UserLogin
@@ -35,7 +37,7 @@ class AuthService:
     @staticmethod
     async def login_user(db: AsyncSession, login_data: UserLogin):
         user = await get_user_by_email(db, login_data.email)
-        if not user or not verify_password(login_data.password, user.hashed_password):
+        if not user or not await verify_password(login_data.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
@@ -62,6 +64,14 @@ class AuthService:
 
             user_id = payload.get("sub")
 
+            # Refresh tokens are single use: replaying a rotated one is rejected.
+            jti = payload.get("jti")
+            if jti is not None and not await token_revocation.consume(jti, payload["exp"]):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Refresh token has already been used"
+                )
+
             access_token = create_access_token({"sub": user_id})
             new_refresh_token = create_refresh_token({"sub": user_id})
 
@@ -69,6 +79,13 @@ class AuthService:
                 "access_token": access_token,
                 "refresh_token": new_refresh_token
             }
+        except HTTPException:
+            raise
+        except (RedisError, OSError):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Token revocation is unavailable, try again later"
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -76,13 +93,14 @@ class AuthService:
             )
 
     @staticmethod
-    async def logout_user(db: AsyncSession, access_token):
+    async def logout_user(db: AsyncSession, access_token, refresh_token: str | None = None):
         """
-        Базовая реализация logout
-        В production нужно добавлять токен в blacklist
+        Revokes the access token until it expires and, when given, the refresh token of the session,
+        see auth.revocation.
         """
         try:
-            user_id = await decode_token(access_token).get("sub")
+            payload = decode_token(access_token)
+            user_id = payload.get("sub")
 
             if not user_id:
                 raise HTTPException(
@@ -90,7 +108,7 @@ class AuthService:
                     detail="Invalid token"
                 )
 
-            user = await get_user_by_id(db, user_id)
+            user = await get_user_by_id(db, int(user_id))
 
             if not user:
                 raise HTTPException(
@@ -98,8 +116,27 @@ class AuthService:
                     detail="User not found"
                 )
 
+            refresh = decode_token(refresh_token) if refresh_token else None
+            if refresh is not None and (refresh.get("type") != "refresh" or refresh.get("sub") != user_id):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid refresh token"
+                )
+
+            if payload.get("jti") is not None:
+                await token_revocation.revoke(payload["jti"], payload["exp"])
+            if refresh is not None and refresh.get("jti") is not None:
+                await token_revocation.consume(refresh["jti"], refresh["exp"])
+
             return user
 
+        except HTTPException:
+            raise
+        except (RedisError, OSError):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Token revocation is unavailable, try again later"
+            )
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -0,0 +1,115 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.models import ProblemCluster
+from backend.app.services.incidents import OPENED
+from backend.app.services.utils.cache import error_class
+
+CREATED = "created"  # first problem of the cluster: its enrichment is queued
+PENDING = "pending"  # the cluster is being analyzed, the problem gets the analysis when it is done
+ANALYZED = "analyzed"  # the analysis was copied into the problem right away
+
+
+def cluster_key(owner_id: int, url: str, remote_ip: str | None, error: str) -> tuple[str, str, str]:
+    """
+    Returns: (key, host, error class). Keys never cross owners: the analysis of a cluster is run
+    against one monitor's URL and copied into every problem of the cluster.
+
+    An owner's monitors behind one address failing the same way share a key, so do monitors of one host
+    when its address is unknown (e.g. DNS failures). HTTP status errors come from the application,
+    not the address (virtual hosts behind a CDN or shared hosting), so their key includes the host.
+    """
+    host = (urlsplit(url).hostname or url).lower()
+    kind = error_class(error)
+    target = f"{remote_ip}/{host}" if remote_ip and kind.startswith("http_") else remote_ip or host
+    key = hashlib.md5(f"{owner_id}:{target}:{kind}".encode()).hexdigest()
+    return key, host, kind
+
+
+def _as_utc(moment: datetime) -> datetime:
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def cluster_problems(session: Session, checks):
+    """
+    HistorySink flush hook, runs after track_incidents: groups the problems of newly opened incidents
+    into clusters, so that a shared outage is searched and analyzed once (see tasks.enrichment.enrich_cluster).
+
+    A problem joins the latest cluster with its key opened at most CLUSTER_WINDOW_SECONDS before it.
+    Cluster rows are locked until the commit: a cluster analysis finishing meanwhile waits for it
+    and then fills in the new problems too.
+    """
+    if not settings.CLUSTER_WINDOW_SECONDS:
+        return
+
+    window = timedelta(seconds=settings.CLUSTER_WINDOW_SECONDS)
+    opened = []
+    for check in checks:
+        if check.transition != OPENED or check.problem is None:
+            continue
+        if not check.meta.get("url") or check.meta.get("owner_id") is None:
+            continue
+        checked_at = _as_utc(check.history.get("checked_at") or datetime.now(timezone.utc))
+        key, host, kind = cluster_key(
+            check.meta["owner_id"],
+            check.meta["url"], check.meta.get("remote_ip"), check.history.get("error_message") or ""
+        )
+        opened.append((check, checked_at, key, host, kind))
+
+    if not opened:
+        return
+
+    latest = {
+        cluster.key: cluster
+        for cluster in session.scalars(
+            select(ProblemCluster)
+            .where(
+                ProblemCluster.key.in_({key for _, _, key, _, _ in opened}),
+                ProblemCluster.opened_at >= min(checked_at for _, checked_at, _, _, _ in opened) - window,
+            )
+            .order_by(ProblemCluster.opened_at)
+            .with_for_update()
+        )
+    }
+
+    attached = []
+    for check, checked_at, key, host, kind in opened:
+        cluster = latest.get(key)
+
+        if cluster is None or _as_utc(cluster.opened_at) < checked_at - window:
+            cluster = ProblemCluster(
+                key=key,
+                host=host,
+                remote_ip=check.meta.get("remote_ip"),
+                error_class=kind,
+                url=check.meta["url"],
+                error_message=check.history.get("error_message"),
+                problem_count=1,
+                opened_at=checked_at,
+            )
+            session.add(cluster)
+            latest[key] = cluster
+            check.cluster_state = CREATED
+        else:
+            cluster.problem_count += 1
+            if cluster.analyzed_at is not None:
+                check.problem.update(
+                    duckduckgo_search_data=cluster.duckduckgo_search_data,
+                    ai_analysis=cluster.ai_analysis,
+                    ai_recommendations=cluster.ai_recommendations,
+                )
+                check.cluster_state = ANALYZED
+            else:
+                check.cluster_state = PENDING
+        attached.append((check, cluster))
+
+    session.flush()
+
+    for check, cluster in attached:
+        check.cluster_id = cluster.id
+        check.problem["cluster_id"] = cluster.id
@@ -0,0 +1,165 @@
+import asyncio
+import ipaddress
+import socket
+import time
+from logging import getLogger
+from typing import Awaitable, Callable, Iterable
+
+import dns.asyncresolver
+import dns.exception
+import httpcore
+import httpx
+
+from backend.app.core.config import settings
+from backend.app.services.phase_timing import current_phase_timer
+
+logger = getLogger(__name__)
+
+Lookup = Callable[[str], Awaitable[tuple[list[str], float]]]
+
+
+async def dns_lookup(host: str) -> tuple[list[str], float]:
+    """
+    Resolves A (then AAAA) records with dnspython, which exposes the record TTL.
+    Names the DNS does not know (/etc/hosts entries like localhost) fall back to getaddrinfo.
+    Returns: (addresses, ttl in seconds)
+    """
+    for record_type in ("A", "AAAA"):
+        try:
+            answer = await dns.asyncresolver.resolve(host, record_type)
+            return [record.to_text() for record in answer], answer.rrset.ttl
+        except dns.exception.DNSException:
+            continue
+
+    infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    return list(dict.fromkeys(info[4][0] for info in infos)), settings.DNS_CACHE_MIN_TTL
+
+
+class DNSCache:
+    """
+    Per-host cache of resolved addresses that honours record TTLs (clamped to DNS_CACHE_MIN_TTL..MAX_TTL).
+    Concurrent lookups of the same host share one query. The query runs in its own task,
+    so a caller that gives up (timeout, cancellation) does not cancel it for the others.
+    """
+
+    def __init__(
+            self,
+            lookup: Lookup = dns_lookup,
+            min_ttl: float = settings.DNS_CACHE_MIN_TTL,
+            max_ttl: float = settings.DNS_CACHE_MAX_TTL,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self._lookup = lookup
+        self._min_ttl = min_ttl
+        self._max_ttl = max_ttl
+        self._clock = clock
+        self._entries: dict[str, tuple[float, list[str]]] = {}
+        self._pending: dict[str, asyncio.Task] = {}
+
+    async def resolve(self, host: str) -> str:
+        addresses = await self.resolve_all(host)
+        return addresses[0]
+
+    async def resolve_all(self, host: str) -> list[str]:
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        entry = self._entries.get(host)
+        if entry is not None and entry[0] > self._clock():
+            return entry[1]
+
+        task = self._pending.get(host)
+        if task is None:
+            task = self._pending[host] = asyncio.create_task(self._query(host))
+            task.add_done_callback(lambda done: self._finish(host, done))
+        return await asyncio.shield(task)
+
+    async def _query(self, host: str) -> list[str]:
+        addresses, ttl = await self._lookup(host)
+        ttl = min(max(ttl, self._min_ttl), self._max_ttl)
+        self._entries[host] = (self._clock() + ttl, addresses)
+        return addresses
+
+    def _finish(self, host: str, task: asyncio.Task):
+        if self._pending.get(host) is task:
+            del self._pending[host]
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every caller has given up
+
+    def peek(self, host: str) -> str | None:
+        """
+        Last address the host resolved to, even if expired, without a lookup. None if never resolved.
+        """
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+        entry = self._entries.get(host)
+        return entry[1][0] if entry and entry[1] else None
+
+    def invalidate(self, hosts: Iterable[str] | None = None):
+        if hosts is None:
+            self._entries.clear()
+            return
+        for host in hosts:
+            self._entries.pop(host, None)
+
+
+class DNSCachingBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that connects to the cached address of the host.
+    TLS still uses the original host name for SNI and certificate checks (httpcore passes it separately).
+    """
+
+    def __init__(self, dns_cache: DNSCache, backend: httpcore.AsyncNetworkBackend | None = None):
+        self._dns_cache = dns_cache
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        started = time.perf_counter()
+        try:
+            address = await asyncio.wait_for(self._dns_cache.resolve(host), timeout)
+        except asyncio.TimeoutError:
+            raise httpcore.ConnectTimeout(f"DNS lookup of {host} timed out")
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise
+            # the shared lookup was cancelled, not this connection
+            raise httpcore.ConnectError(f"DNS lookup of {host} was cancelled")
+        except OSError as e:
+            raise httpcore.ConnectError(str(e))
+        except dns.exception.DNSException as e:
+            raise httpcore.ConnectError(f"DNS lookup of {host} failed: {e}")
+
+        timer = current_phase_timer.get()
+        if timer is not None:
+            timer.record("dns", (time.perf_counter() - started) * 1000)
+
+        return await self._backend.connect_tcp(
+            address,
+            port,
+            timeout=timeout,
+            local_address=local_address,
+            socket_options=socket_options,
+        )
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class PooledProbeTransport(httpx.AsyncHTTPTransport):
+    """
+    Keep-alive (and HTTP/2, when the server negotiates it) transport whose connections resolve through a DNSCache.
+    """
+
+    def __init__(self, dns_cache: DNSCache, **kwargs):
+        super().__init__(**kwargs)
+        # httpx has no public option for the network backend of its httpcore pool.
+        self._pool._network_backend = DNSCachingBackend(dns_cache)
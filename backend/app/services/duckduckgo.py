@@ -1,16 +1,46 @@
 import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
 
+from celery.signals import worker_process_shutdown
 from ddgs import DDGS
 
+from backend.app.core.config import settings
+from backend.app.core.redis import redis_client
+from backend.app.services.single_flight import SingleFlight
+from backend.app.services.utils.cache import TTLCache
+
 logger = getLogger(__name__)
 
+# Results are cached in process first, then in Redis (shared by all workers, see SingleFlight).
+local_cache = TTLCache(max_size=settings.DDG_CACHE_SIZE, ttl=settings.DDG_CACHE_TTL)
+
+single_flight = SingleFlight(redis_client, local=local_cache)
+
+# ddgs is synchronous: scrapes run in their own bounded pool instead of the loop's default executor.
+_executor = ThreadPoolExecutor(max_workers=settings.DDG_MAX_THREADS, thread_name_prefix="ddg")
 
-async def duckduckgo_search(query: str, max_results: int = 5):
+
+async def duckduckgo_search(query: str, max_results: int = 5, cache_key: str | None = None):
     """
     Performs a search in DuckDuckGo using the ddgs library and returns a list of words:
     [{'title': ..., 'href': ..., 'snippet': ...}, ...]
+
+    Identical searches running at the same time on any worker are made once.
+    Non-empty results are cached under `cache_key` (default: the query), see utils.cache.search_cache_key.
     """
+    key = f"ddg:{max_results}:" + (cache_key or hashlib.md5(query.encode()).hexdigest())
+
+    return await single_flight.do(
+        key,
+        lambda: _duckduckgo_search(query, max_results),
+        ttl=settings.DDG_CACHE_TTL,
+        cache_if=bool,
+    )
+
+
+async def _duckduckgo_search(query: str, max_results: int):
     loop = asyncio.get_running_loop()
 
     def _search():
@@ -38,4 +68,9 @@ async def duckduckgo_search(query: str, max_results: int = 5):
 
         return results
 
-    return await loop.run_in_executor(None, _search)
+    return await loop.run_in_executor(_executor, _search)
+
+
+@worker_process_shutdown.connect
+def _shutdown_executor(**kwargs):
+    _executor.shutdown(wait=False, cancel_futures=True)
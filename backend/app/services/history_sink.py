@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import Callable
+
+from celery.signals import worker_process_shutdown
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.app.core.config import settings
+from backend.app.core.database import sync_session_maker
+from backend.app.models import MonitorHistory, Problem
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class BufferedCheck:
+    """
+    One check result waiting in the sink. history_id and problem_id are set by the flush,
+    incident_id and transition by the incident flush hook, cluster_id by the cluster flush hook.
+    `meta` holds facts for the hooks that are not stored in monitor_history (url, remote_ip).
+    """
+    history: dict
+    problem: dict | None = None
+    meta: dict = field(default_factory=dict)
+    history_id: int | None = None
+    problem_id: int | None = None
+    incident_id: int | None = None
+    transition: str | None = None  # 'opened', 'resolved'
+    cluster_id: int | None = None
+    cluster_state: str | None = None  # 'created', 'pending', 'analyzed'
+
+    def __post_init__(self):
+        self._initial_problem = dict(self.problem) if self.problem is not None else None
+
+    def reset(self):
+        """
+        Forgets what a failed flush set (ids of rolled back rows, hook results) before the check is retried.
+        """
+        self.problem = dict(self._initial_problem) if self._initial_problem is not None else None
+        self.history_id = self.problem_id = self.incident_id = None
+        self.transition = self.cluster_id = self.cluster_state = None
+
+
+FlushHook = Callable[[Session, list[BufferedCheck]], None]
+AfterCommitHook = Callable[[list[BufferedCheck]], None]
+
+
+class HistorySink:
+    """
+    Buffers MonitorHistory rows and writes them with multi-row INSERT ... RETURNING id,
+    every `max_rows` rows or `max_delay_ms` milliseconds, in a single transaction.
+
+    Problem rows of failed checks are inserted in the same transaction with the generated history ids.
+    Hooks run inside that transaction (`on_flush`) or after the commit (`after_commit`).
+    """
+
+    def __init__(
+            self,
+            session_maker: sessionmaker = sync_session_maker,
+            max_rows: int = settings.HISTORY_FLUSH_ROWS,
+            max_delay_ms: int = settings.HISTORY_FLUSH_MS,
+    ):
+        self._session_maker = session_maker
+        self._max_rows = max_rows
+        self._max_delay = max_delay_ms / 1000
+
+        self._lock = threading.Lock()
+        self._buffer: list[BufferedCheck] = []
+        self._flush_hooks: list[FlushHook] = []
+        self._after_commit_hooks: list[AfterCommitHook] = []
+
+        self._timer: threading.Thread | None = None
+        self._timer_pid: int | None = None
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def on_flush(self, hook: FlushHook) -> FlushHook:
+        self._flush_hooks.append(hook)
+        return hook
+
+    def after_commit(self, hook: AfterCommitHook) -> AfterCommitHook:
+        self._after_commit_hooks.append(hook)
+        return hook
+
+    def add(self, history: dict, problem: dict | None = None, meta: dict | None = None) -> BufferedCheck:
+        check = BufferedCheck(history=history, problem=problem, meta=meta or {})
+
+        with self._lock:
+            self._buffer.append(check)
+            full = len(self._buffer) >= self._max_rows
+
+        if full:
+            self.flush()
+        else:
+            self._ensure_timer()
+
+        return check
+
+    def flush(self) -> list[BufferedCheck]:
+        with self._lock:
+            checks, self._buffer = self._buffer, []
+
+        if not checks:
+            return []
+
+        try:
+            with self._session_maker() as session:
+                self._write(session, checks)
+                session.commit()
+        except Exception as e:
+            logger.exception(f"Failed to flush {len(checks)} history rows: {e}")
+            for check in checks:
+                check.reset()
+            with self._lock:
+                if len(self._buffer) < self._max_rows * 10:
+                    self._buffer[:0] = checks
+            raise
+
+        for hook in self._after_commit_hooks:
+            try:
+                hook(checks)
+            except Exception as e:
+                logger.exception(f"History sink after-commit hook failed: {e}")
+
+        return checks
+
+    def _write(self, session: Session, checks: list[BufferedCheck]):
+        history_ids = session.scalars(
+            insert(MonitorHistory).returning(MonitorHistory.id, sort_by_parameter_order=True),
+            [check.history for check in checks],
+        ).all()
+        for check, history_id in zip(checks, history_ids):
+            check.history_id = history_id
+
+        for hook in self._flush_hooks:
+            hook(session, checks)
+
+        failed = [check for check in checks if check.problem is not None]
+        if not failed:
+            return
+
+        problem_ids = session.scalars(
+            insert(Problem).returning(Problem.id, sort_by_parameter_order=True),
+            [{**check.problem, "history_id": check.history_id} for check in failed],
+        ).all()
+        for check, problem_id in zip(failed, problem_ids):
+            check.problem_id = problem_id
+
+    def _ensure_timer(self):
+        if self._timer is not None and self._timer_pid == os.getpid() and self._timer.is_alive():
+            return
+
+        with self._lock:
+            if self._timer is not None and self._timer_pid == os.getpid() and self._timer.is_alive():
+                return
+            self._timer = threading.Thread(target=self._run_timer, name="history-sink", daemon=True)
+            self._timer_pid = os.getpid()
+            self._timer.start()
+
+    def _run_timer(self):
+        while True:
+            time.sleep(self._max_delay)
+            if not self._buffer:
+                continue
+            try:
+                self.flush()
+            except Exception:
+                pass  # already logged, rows stay buffered for the next attempt
+
+
+history_sink = HistorySink()
+
+
+@worker_process_shutdown.connect
+def _flush_history_sink(**kwargs):
+    try:
+        history_sink.flush()
+    except Exception:
+        pass
@@ -0,0 +1,80 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.app.models import Incident
+
+OPENED = "opened"
+RESOLVED = "resolved"
+
+
+def is_failure(history: dict) -> bool:
+    return history.get("error_message") is not None
+
+
+def track_incidents(session: Session, checks):
+    """
+    HistorySink flush hook: moves incidents through open -> (acknowledged) -> resolved.
+
+    A failure with no unresolved incident opens one and keeps its Problem row. Further failures only
+    bump the incident counters, their Problem rows (if any) are attached to it. A healthy check resolves it.
+    Transitions are recorded on the checks (`check.transition`) for after-commit hooks.
+    """
+    by_monitor = defaultdict(list)
+    for check in checks:
+        by_monitor[check.history["monitor_id"]].append(check)
+
+    unresolved = {
+        incident.monitor_id: incident
+        for incident in session.scalars(
+            select(Incident)
+            .where(Incident.monitor_id.in_(list(by_monitor)), Incident.state != Incident.RESOLVED)
+            .with_for_update()
+        )
+    }
+
+    attached = []
+    for monitor_id, monitor_checks in by_monitor.items():
+        incident = unresolved.get(monitor_id)
+
+        for check in monitor_checks:  # in the order they were checked
+            history = check.history
+            checked_at = history.get("checked_at") or datetime.now(timezone.utc)
+
+            if is_failure(history):
+                if incident is None:
+                    incident = Incident(
+                        monitor_id=monitor_id,
+                        state=Incident.OPEN,
+                        status=history.get("status"),
+                        error_message=history.get("error_message"),
+                        failure_count=1,
+                        opened_history_id=check.history_id,
+                        opened_at=checked_at,
+                        last_failure_at=checked_at,
+                    )
+                    session.add(incident)
+                    check.transition = OPENED
+                    if check.problem is None:
+                        check.problem = {"monitor_id": monitor_id}
+                else:
+                    incident.failure_count += 1
+                    incident.last_failure_at = checked_at
+                attached.append((check, incident))
+
+            elif incident is not None:
+                incident.state = Incident.RESOLVED
+                incident.resolved_at = checked_at
+                incident.resolved_history_id = check.history_id
+                check.transition = RESOLVED
+                attached.append((check, incident))
+                incident = None
+
+    session.flush()
+
+    for check, incident in attached:
+        check.incident_id = incident.id
+        if check.problem is not None:
+            check.problem["incident_id"] = incident.id
@@ -0,0 +1,102 @@
+import smtplib
+import ssl
+import threading
+import time
+from email.message import EmailMessage
+from logging import getLogger
+
+from celery.signals import worker_process_shutdown
+
+from backend.app.core.config import settings
+
+logger = getLogger(__name__)
+
+
+class SMTPMailer:
+    """
+    Sends messages over one authenticated SMTP connection, reused across messages.
+
+    The connection (connect, STARTTLS, login) is opened on the first message and kept until it has been idle
+    for `idle_timeout` seconds or has sent `max_messages`. A connection dropped by the server is reopened once
+    per message. Thread-safe: messages of concurrent threads are sent one after another.
+    """
+
+    def __init__(
+            self,
+            host: str = settings.EMAIL_HOST,
+            port: int = settings.EMAIL_PORT,
+            username: str | None = settings.EMAIL_HOST_USER,
+            password: str | None = settings.EMAIL_HOST_PASSWORD,
+            use_tls: bool = settings.EMAIL_USE_TLS,
+            idle_timeout: float = settings.SMTP_IDLE_SECONDS,
+            max_messages: int = settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+            timeout: float = 30,
+    ):
+        self._host = host
+        self._port = port
+        self._username = username
+        self._password = password
+        self._use_tls = use_tls
+        self._idle_timeout = idle_timeout
+        self._max_messages = max_messages
+        self._timeout = timeout
+
+        self._lock = threading.Lock()
+        self._connection: smtplib.SMTP | None = None
+        self._sent = 0
+        self._last_used = 0.0
+
+    def send(self, message: EmailMessage):
+        with self._lock:
+            try:
+                self._connect().send_message(message)
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                # A pooled connection may have been closed by the server since the last message.
+                logger.info(f"SMTP connection lost ({e}), reconnecting")
+                self._close()
+                self._connect().send_message(message)
+
+            self._sent += 1
+            self._last_used = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _connect(self) -> smtplib.SMTP:
+        if self._connection is not None:
+            idle = time.monotonic() - self._last_used
+            if idle < self._idle_timeout and self._sent < self._max_messages:
+                return self._connection
+            self._close()
+
+        connection = smtplib.SMTP(self._host, self._port, timeout=self._timeout)
+        try:
+            if self._use_tls:
+                connection.starttls(context=ssl.create_default_context())
+            if self._username:
+                connection.login(self._username, self._password)
+        except Exception:
+            connection.close()
+            raise
+
+        self._connection = connection
+        self._sent = 0
+        return connection
+
+    def _close(self):
+        if self._connection is None:
+            return
+        try:
+            self._connection.quit()
+        except (smtplib.SMTPException, OSError):
+            self._connection.close()
+        self._connection = None
+
+
+mailer = SMTPMailer()
+
+
+@worker_process_shutdown.connect
+def _close_mailer(**kwargs):
+    mailer.close()
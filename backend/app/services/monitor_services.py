@@ -1,14 +1,16 @@
+from datetime import datetime, timezone
 from typing import Optional, Sequence
 
 from sqlalchemy.orm import selectinload
 
 
-from sqlalchemy import select
+from sqlalchemy import Row, select, or_, and_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.models import User
-from backend.app.models import Monitor, MonitorHistory, Problem
+from backend.app.models import Incident, Monitor, MonitorHistory, MonitorRollup, MonitorStatus, Problem
 from backend.app.schemas.monitor import MonitorCreate
+from backend.app.services.rollups import LatencySketch, window_segments
 
 
 class MonitorCRUD:
@@ -38,17 +40,55 @@ class MonitorCRUD:
         return {'status_code': '200', 'detail': 'Deleted'}
 
     @staticmethod
-    async def get_all(db: AsyncSession, current_user: int, skip: int = 0, limit: int = 100) -> Sequence[Monitor]:
+    async def get_all(
+            db: AsyncSession,
+            current_user: int,
+            skip: int = 0,
+            limit: int = 100,
+            before: tuple[datetime, int] | None = None,
+    ) -> Sequence[Monitor]:
+        """
+        Newest first. `before` is a (created_at, id) keyset position: only monitors after it in that order
+        are returned, which costs the same on every page unlike `skip`.
+        """
         stmt = (
             select(Monitor)
             .where(Monitor.owner_id == current_user)
-            .order_by(Monitor.created_at.desc())
+            .order_by(Monitor.created_at.desc(), Monitor.id.desc())
             .offset(skip)
             .limit(limit)
         )
+        if before is not None:
+            stmt = stmt.where(tuple_(Monitor.created_at, Monitor.id) < tuple_(*before))
         result = await db.execute(stmt)
         return result.scalars().all()
 
+    @staticmethod
+    async def get_statuses(db: AsyncSession, current_user: int) -> Sequence[Row]:
+        """
+        Latest status of every monitor of the user, from monitor_status (never-checked monitors have None fields).
+        """
+        result = await db.execute(
+            select(
+                Monitor.id.label("monitor_id"),
+                Monitor.name,
+                Monitor.url,
+                Monitor.is_active,
+                MonitorStatus.status,
+                MonitorStatus.status_code,
+                MonitorStatus.latency,
+                MonitorStatus.error_message,
+                MonitorStatus.checked_at,
+                MonitorStatus.last_change_at,
+                MonitorStatus.consecutive_failures,
+                MonitorStatus.incident_id,
+            )
+            .outerjoin(MonitorStatus, MonitorStatus.monitor_id == Monitor.id)
+            .where(Monitor.owner_id == current_user)
+            .order_by(Monitor.id)
+        )
+        return result.all()
+
     @staticmethod
     async def get_by_id(db: AsyncSession, current_user: int, monitor_id: int) -> Optional[Monitor]:
         result = await db.execute(
@@ -61,41 +101,99 @@ class MonitorCRUD:
         return result.scalar_one_or_none()
 
 
+# Columns of the history endpoints: selected as plain rows, without ORM objects to hydrate.
+HISTORY_COLUMNS = (
+    MonitorHistory.id,
+    MonitorHistory.status,
+    MonitorHistory.status_code,
+    MonitorHistory.latency,
+    MonitorHistory.dns_ms,
+    MonitorHistory.connect_ms,
+    MonitorHistory.tls_ms,
+    MonitorHistory.ttfb_ms,
+    MonitorHistory.body_ms,
+    MonitorHistory.error_message,
+    MonitorHistory.checked_at,
+)
+
+
 class HistoryCRUD:
+    @staticmethod
+    async def _page(
+            db: AsyncSession,
+            stmt,
+            limit: int,
+            before: tuple[datetime, int] | None = None,
+            after: tuple[datetime, int] | None = None,
+            since: datetime | None = None,
+            until: datetime | None = None,
+    ) -> Sequence[Row]:
+        """
+        One page of history rows, newest first, seeking by the (checked_at, id) keyset.
+        `before` continues to older records, `after` goes back to newer ones; since/until bound checked_at.
+        """
+        position = tuple_(MonitorHistory.checked_at, MonitorHistory.id)
+        if since is not None:
+            stmt = stmt.where(MonitorHistory.checked_at >= since)
+        if until is not None:
+            stmt = stmt.where(MonitorHistory.checked_at < until)
+
+        if after is not None:
+            stmt = stmt.where(position > tuple_(*after)).order_by(
+                MonitorHistory.checked_at.asc(), MonitorHistory.id.asc()
+            )
+            result = await db.execute(stmt.limit(limit))
+            return list(reversed(result.all()))
+
+        if before is not None:
+            stmt = stmt.where(position < tuple_(*before))
+        result = await db.execute(
+            stmt.order_by(MonitorHistory.checked_at.desc(), MonitorHistory.id.desc()).limit(limit)
+        )
+        return result.all()
+
     @staticmethod
     async def get_history(
             db: AsyncSession,
             current_user: int,
             monitor_id: int,
-            limit: int = 10
-    ) -> Sequence[MonitorHistory]:
-        result = await db.execute(
-            select(MonitorHistory)
+            limit: int = 10,
+            before: tuple[datetime, int] | None = None,
+            after: tuple[datetime, int] | None = None,
+            since: datetime | None = None,
+            until: datetime | None = None,
+    ) -> Sequence[Row]:
+        stmt = (
+            select(*HISTORY_COLUMNS)
+            .join(Monitor, Monitor.id == MonitorHistory.monitor_id)
             .where(
-                MonitorHistory.monitor_id == monitor_id)
-            .order_by(MonitorHistory.checked_at.desc())
-            .limit(limit)
+                MonitorHistory.monitor_id == monitor_id,
+                Monitor.owner_id == current_user,
+            )
         )
-        return result.scalars().all()
+        return await HistoryCRUD._page(db, stmt, limit, before, after, since, until)
 
     @staticmethod
     async def get_problem_history(
             db: AsyncSession,
             current_user: int,
             monitor_id: int,
-            limit: int = 10
-    ) -> Sequence[MonitorHistory]:
-        result = await db.execute(
-            select(MonitorHistory)
+            limit: int = 10,
+            before: tuple[datetime, int] | None = None,
+            after: tuple[datetime, int] | None = None,
+            since: datetime | None = None,
+            until: datetime | None = None,
+    ) -> Sequence[Row]:
+        stmt = (
+            select(*HISTORY_COLUMNS)
+            .join(Monitor, Monitor.id == MonitorHistory.monitor_id)
             .where(
                 MonitorHistory.monitor_id == monitor_id,
                 Monitor.owner_id == current_user,
                 MonitorHistory.error_message.isnot(None)
             )
-            .order_by(MonitorHistory.checked_at.desc())
-            .limit(limit)
         )
-        return result.scalars().all()
+        return await HistoryCRUD._page(db, stmt, limit, before, after, since, until)
 
     @staticmethod
     async def get_problem_with_analysis(db: AsyncSession, current_user_id: int, problem_id: int,
@@ -114,3 +212,111 @@ class HistoryCRUD:
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
+
+class IncidentCRUD:
+    @staticmethod
+    async def get_incidents(
+            db: AsyncSession,
+            current_user: int,
+            monitor_id: int,
+            state: str | None = None,
+            limit: int = 20,
+    ) -> Sequence[Incident]:
+        stmt = (
+            select(Incident)
+            .join(Monitor, Monitor.id == Incident.monitor_id)
+            .where(Incident.monitor_id == monitor_id, Monitor.owner_id == current_user)
+            .order_by(Incident.opened_at.desc())
+            .limit(limit)
+        )
+        if state is not None:
+            stmt = stmt.where(Incident.state == state)
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
+    @staticmethod
+    async def acknowledge(db: AsyncSession, current_user: int, monitor_id: int, incident_id: int) -> Optional[Incident]:
+        """
+        Marks an open incident as acknowledged. Resolved or already acknowledged incidents are returned unchanged.
+        """
+        result = await db.execute(
+            select(Incident)
+            .join(Monitor, Monitor.id == Incident.monitor_id)
+            .where(
+                Incident.id == incident_id,
+                Incident.monitor_id == monitor_id,
+                Monitor.owner_id == current_user,
+            )
+        )
+        incident = result.scalar_one_or_none()
+        if incident is None or incident.state != Incident.OPEN:
+            return incident
+
+        incident.state = Incident.ACKNOWLEDGED
+        incident.acknowledged_at = datetime.now(timezone.utc)
+        await db.commit()
+        await db.refresh(incident)
+        return incident
+
+
+class RollupCRUD:
+    @staticmethod
+    async def get_window_stats(db: AsyncSession, monitor_id: int, start: datetime, end: datetime) -> dict:
+        """
+        Aggregates uptime and latency over [start, end) from the coarsest rollup buckets that cover it.
+        """
+        segments = window_segments(start, end)
+        if not segments:
+            return RollupCRUD._empty_stats()
+
+        result = await db.execute(
+            select(
+                MonitorRollup.check_count,
+                MonitorRollup.down_count,
+                MonitorRollup.degraded_count,
+                MonitorRollup.latency_count,
+                MonitorRollup.latency_sum,
+                MonitorRollup.latency_min,
+                MonitorRollup.latency_max,
+                MonitorRollup.latency_sketch,
+            )
+            .where(
+                MonitorRollup.monitor_id == monitor_id,
+                or_(*(
+                    and_(
+                        MonitorRollup.resolution == resolution,
+                        MonitorRollup.bucket_start >= segment_start,
+                        MonitorRollup.bucket_start < segment_end,
+                    )
+                    for resolution, segment_start, segment_end in segments
+                ))
+            )
+        )
+
+        stats = RollupCRUD._empty_stats()
+        for checks, down, degraded, latency_count, latency_sum, latency_min, latency_max, sketch in result:
+            stats["checks"] += checks
+            stats["down"] += down
+            stats["degraded"] += degraded
+            stats["latency_count"] += latency_count
+            stats["latency_sum"] += latency_sum
+            if latency_min is not None and (stats["latency_min"] is None or latency_min < stats["latency_min"]):
+                stats["latency_min"] = latency_min
+            if latency_max is not None and (stats["latency_max"] is None or latency_max > stats["latency_max"]):
+                stats["latency_max"] = latency_max
+            LatencySketch.merge(stats["latency_sketch"], sketch)
+
+        return stats
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        return {
+            "checks": 0,
+            "down": 0,
+            "degraded": 0,
+            "latency_count": 0,
+            "latency_sum": 0.0,
+            "latency_min": None,
+            "latency_max": None,
+            "latency_sketch": LatencySketch.empty(),
+        }
@@ -0,0 +1,68 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from backend.app.models import MonitorStatus
+from backend.app.services.incidents import is_failure
+
+
+def _insert(session: Session):
+    return sqlite.insert if session.get_bind().dialect.name == "sqlite" else postgresql.insert
+
+
+def _locked(session: Session, monitor_ids) -> dict[int, MonitorStatus]:
+    return {
+        row.monitor_id: row
+        for row in session.scalars(
+            select(MonitorStatus).where(MonitorStatus.monitor_id.in_(list(monitor_ids))).with_for_update()
+        )
+    }
+
+
+def update_monitor_status(session: Session, checks):
+    """
+    HistorySink flush hook, runs after track_incidents: folds the flushed checks into the monitor_status rows.
+
+    Rows are locked until the commit, so concurrent flushes for one monitor apply one after the other.
+    A monitor's first check creates its row (INSERT ... ON CONFLICT DO NOTHING, then the lock).
+    """
+    by_monitor = defaultdict(list)
+    for check in checks:
+        by_monitor[check.history["monitor_id"]].append(check)
+
+    rows = _locked(session, by_monitor)
+
+    missing = [monitor_id for monitor_id in by_monitor if monitor_id not in rows]
+    if missing:
+        now = datetime.now(timezone.utc)
+        session.execute(
+            _insert(session)(MonitorStatus)
+            .values([
+                {"monitor_id": monitor_id, "checked_at": now, "last_change_at": now, "consecutive_failures": 0}
+                for monitor_id in missing
+            ])
+            .on_conflict_do_nothing()
+        )
+        rows.update(_locked(session, missing))
+
+    for monitor_id, monitor_checks in by_monitor.items():
+        row = rows[monitor_id]
+        for check in monitor_checks:  # in the order they were checked
+            history = check.history
+            checked_at = history.get("checked_at") or datetime.now(timezone.utc)
+            failed = is_failure(history)
+
+            if row.status != history.get("status"):
+                row.last_change_at = checked_at
+            row.status = history.get("status")
+            row.status_code = history.get("status_code")
+            row.latency = history.get("latency")
+            row.error_message = history.get("error_message")
+            row.checked_at = checked_at
+            row.consecutive_failures = (row.consecutive_failures or 0) + 1 if failed else 0
+            row.incident_id = check.incident_id if failed else None
+
+    session.flush()
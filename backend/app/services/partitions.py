@@ -0,0 +1,202 @@
+import re
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.app.services.rollups import DAY, HOUR, MINUTE, LatencySketch
+
+logger = getLogger(__name__)
+
+PARENT = "monitor_history"
+DEFAULT = f"{PARENT}_default"
+
+_BOUND_RE = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+# Recomputes rollups of one partition. Buckets that already exist (maintained incrementally by the
+# check pipeline) are left as they are, only buckets missing from the rollups are filled.
+_DOWNSAMPLE_SQL = """
+WITH binned AS (
+    SELECT
+        monitor_id,
+        to_timestamp(floor(extract(epoch FROM checked_at) / :resolution) * :resolution) AS bucket_start,
+        CASE
+            WHEN latency IS NULL THEN NULL
+            WHEN latency < 1 THEN 0
+            ELSE least(floor(ln(latency) / ln(:gamma))::int, :bins - 1)
+        END AS bin,
+        count(*) AS checks,
+        count(*) FILTER (WHERE status = 'down') AS down,
+        count(*) FILTER (WHERE status = 'degraded') AS degraded,
+        count(latency) AS latency_count,
+        coalesce(sum(latency), 0) AS latency_sum,
+        min(latency) AS latency_min,
+        max(latency) AS latency_max
+    FROM {partition}
+    GROUP BY 1, 2, 3
+),
+sketches AS (
+    SELECT g.monitor_id, g.bucket_start, array_agg(coalesce(b.latency_count, 0) ORDER BY i) AS latency_sketch
+    FROM (SELECT DISTINCT monitor_id, bucket_start FROM binned) g
+    CROSS JOIN generate_series(0, :bins - 1) AS i
+    LEFT JOIN binned b ON b.monitor_id = g.monitor_id AND b.bucket_start = g.bucket_start AND b.bin = i
+    GROUP BY g.monitor_id, g.bucket_start
+)
+INSERT INTO monitor_rollups (
+    monitor_id, resolution, bucket_start, check_count, down_count, degraded_count,
+    latency_count, latency_sum, latency_min, latency_max, latency_sketch
+)
+SELECT
+    b.monitor_id, :resolution, b.bucket_start, sum(b.checks), sum(b.down), sum(b.degraded),
+    sum(b.latency_count), sum(b.latency_sum), min(b.latency_min), max(b.latency_max), s.latency_sketch
+FROM binned b
+JOIN sketches s ON s.monitor_id = b.monitor_id AND s.bucket_start = b.bucket_start
+GROUP BY b.monitor_id, b.bucket_start, s.latency_sketch
+ON CONFLICT (monitor_id, resolution, bucket_start) DO NOTHING
+"""
+
+
+def partition_name(start: datetime) -> str:
+    return f"{PARENT}_p{start:%Y%m%d}"
+
+
+def aligned_start(moment: datetime, span_days: int) -> datetime:
+    """
+    Start of the partition containing `moment`: partitions are aligned to multiples of span_days since the epoch.
+    """
+    day = datetime(moment.year, moment.month, moment.day, tzinfo=timezone.utc)
+    days = (day - datetime(1970, 1, 1, tzinfo=timezone.utc)).days
+    return day - timedelta(days=days % span_days)
+
+
+def list_partitions(session: Session) -> list[tuple[str, datetime, datetime]]:
+    """
+    Range partitions of monitor_history (the DEFAULT partition is skipped), oldest first.
+    Returns: [(name, lower bound, upper bound), ...]
+    """
+    rows = session.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+        "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": PARENT}).all()
+
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_RE.search(bound or "")
+        if match:
+            lower, upper = (datetime.fromisoformat(value).astimezone(timezone.utc) for value in match.groups())
+            partitions.append((name, lower, upper))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def create_partition(session: Session, start: datetime, end: datetime):
+    """
+    Rows written while no partition covered their range are in the DEFAULT partition, and Postgres refuses
+    to create a partition overlapping them. Those rows are moved into the new table before it is attached.
+    """
+    name = partition_name(start)
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    in_range = {"start": start, "end": end}
+
+    # blocks inserts into DEFAULT until the commit, so no row of the range lands there after the move
+    session.execute(text(f"LOCK TABLE {DEFAULT} IN EXCLUSIVE MODE"))
+    stray = session.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT} WHERE checked_at >= :start AND checked_at < :end)"
+    ), in_range).scalar()
+    if not stray:
+        session.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT} {bounds}"))
+        return
+
+    session.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    moved = session.execute(text(
+        f"WITH moved AS ("
+        f"DELETE FROM {DEFAULT} WHERE checked_at >= :start AND checked_at < :end RETURNING *"
+        f") INSERT INTO {name} SELECT * FROM moved"
+    ), in_range).rowcount
+    session.execute(text(f"ALTER TABLE {PARENT} ATTACH PARTITION {name} {bounds}"))
+    logger.info(f"Moved {moved} rows from {DEFAULT} into the new partition {name}")
+
+
+def ensure_future_partitions(session: Session, now: datetime, span_days: int, days_ahead: int) -> list[str]:
+    """
+    Creates consecutive partitions from today (or the end of the newest partition) up to now + days_ahead.
+    """
+    partitions = list_partitions(session)
+    start = aligned_start(now, span_days)
+    if partitions:
+        start = max(start, partitions[-1][2])
+
+    created = []
+    horizon = now + timedelta(days=days_ahead)
+    while start <= horizon:
+        end = start + timedelta(days=span_days)
+        create_partition(session, start, end)
+        created.append(partition_name(start))
+        start = end
+    return created
+
+
+def downsample_partition(session: Session, name: str):
+    for resolution in (HOUR, DAY):
+        session.execute(
+            text(_DOWNSAMPLE_SQL.format(partition=name)),
+            {"resolution": resolution, "gamma": LatencySketch.GAMMA, "bins": LatencySketch.BINS},
+        )
+
+
+def drop_expired_partitions(session: Session, cutoff: datetime, downsample: bool) -> list[str]:
+    """
+    Drops partitions whose upper bound is <= cutoff: O(1) per partition instead of a DELETE of its rows.
+    Problems pointing at the dropped rows are removed first.
+    """
+    dropped = []
+    for name, _, upper in list_partitions(session):
+        if upper > cutoff:
+            break
+        if downsample:
+            downsample_partition(session, name)
+        session.execute(text(f"DELETE FROM problem WHERE history_id IN (SELECT id FROM {name})"))
+        session.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        session.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+
+def apply_monitor_retention(session: Session, now: datetime, default_days: int) -> int:
+    """
+    Deletes history of monitors whose history_retention_days is shorter than what partition drops enforce,
+    with the problems of the deleted rows. Returns: number of history rows deleted.
+    """
+    shortest = session.execute(text(
+        "SELECT min(history_retention_days) FROM monitors WHERE history_retention_days IS NOT NULL"
+    )).scalar()
+    if shortest is None:
+        return 0
+
+    result = session.execute(text(
+        """
+        WITH deleted AS (
+            DELETE FROM monitor_history h
+            USING monitors m
+            WHERE h.monitor_id = m.id
+              AND h.checked_at < :upper
+              AND h.checked_at < CAST(:now AS timestamptz)
+                  - make_interval(days => coalesce(m.history_retention_days, :default_days))
+            RETURNING h.id
+        ), problems AS (
+            DELETE FROM problem WHERE history_id IN (SELECT id FROM deleted)
+        )
+        SELECT count(*) FROM deleted
+        """
+    ), {"now": now, "upper": now - timedelta(days=shortest), "default_days": default_days})
+    return result.scalar()
+
+
+def prune_rollups(session: Session, now: datetime, minute_days: int, hour_days: int):
+    session.execute(text(
+        "DELETE FROM monitor_rollups WHERE resolution = :minute AND bucket_start < :minute_cutoff"
+    ), {"minute": MINUTE, "minute_cutoff": now - timedelta(days=minute_days)})
+    session.execute(text(
+        "DELETE FROM monitor_rollups WHERE resolution = :hour AND bucket_start < :hour_cutoff"
+    ), {"hour": HOUR, "hour_cutoff": now - timedelta(days=hour_days)})
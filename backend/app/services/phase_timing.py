@@ -0,0 +1,65 @@
+import time
+from contextvars import ContextVar
+
+# Trace event (without the "http11."/"http2."/"connection." prefix) -> phase it times.
+_TRACE_PHASES = {
+    "connect_tcp": "connect",
+    "start_tls": "tls",
+    "receive_response_body": "body",
+}
+
+PHASES = ("dns", "connect", "tls", "ttfb", "body")
+
+
+class PhaseTimer:
+    """
+    Collects per-phase timings (ms) of one request from httpcore trace events.
+
+    - dns: host lookup, recorded by the DNS caching network backend
+    - connect: TCP connect (without dns)
+    - tls: TLS handshake
+    - ttfb: from sending request headers to receiving response headers
+    - body: reading the response body
+
+    Phases that did not happen (dns/connect/tls on a reused connection) stay None.
+    """
+
+    def __init__(self):
+        self._started: dict[str, float] = {}
+        self._durations: dict[str, float] = {}
+
+    def record(self, phase: str, duration_ms: float):
+        self._durations[phase] = self._durations.get(phase, 0.0) + duration_ms
+
+    async def trace(self, event_name: str, info: dict):
+        name, _, step = event_name.rpartition(".")
+        name = name.split(".", 1)[-1]
+        now = time.perf_counter()
+
+        if name == "send_request_headers" and step == "started":
+            self._started["ttfb"] = now
+        elif name == "receive_response_headers" and step == "complete":
+            self._stop("ttfb", now)
+        elif name in _TRACE_PHASES:
+            phase = _TRACE_PHASES[name]
+            if step == "started":
+                self._started[phase] = now
+            elif step == "complete":
+                self._stop(phase, now)
+
+    def _stop(self, phase: str, now: float):
+        started = self._started.pop(phase, None)
+        if started is not None:
+            self.record(phase, (now - started) * 1000)
+
+    def phases(self) -> dict[str, float | None]:
+        durations = dict(self._durations)
+        # The DNS lookup runs inside connect_tcp, so it is subtracted from the connect phase.
+        if "connect" in durations and "dns" in durations:
+            durations["connect"] = max(durations["connect"] - durations["dns"], 0.0)
+        elif "connect" not in durations:
+            durations.pop("dns", None)
+        return {phase: durations.get(phase) for phase in PHASES}
+
+
+current_phase_timer: ContextVar[PhaseTimer | None] = ContextVar("current_phase_timer", default=None)
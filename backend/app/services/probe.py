@@ -0,0 +1,155 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from logging import getLogger
+from typing import Iterable
+from urllib.parse import urlsplit
+
+import httpx
+
+from backend.app.core.config import settings
+from backend.app.core.event_loop import on_worker_loop_shutdown
+from backend.app.models import Monitor
+from backend.app.services.dns_cache import DNSCache, PooledProbeTransport
+from backend.app.services.phase_timing import PhaseTimer, current_phase_timer
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class ProbeResult:
+    monitor_id: int
+    status: str  # 'healthy', 'down', 'degraded'
+    status_code: int | None
+    latency: float | None  # ms
+    error_message: str | None
+    checked_at: datetime
+    phases: dict[str, float | None] = field(default_factory=dict)  # ms, see PhaseTimer
+    remote_ip: str | None = None  # address the host last resolved to, if known
+
+
+class ProbeEngine:
+    """
+    Checks monitors concurrently through one shared httpx.AsyncClient.
+    The client keeps a bounded keep-alive pool (HTTP/2 where the server supports it)
+    and resolves hosts through a TTL-respecting DNS cache.
+    Monitors with cold_connection=True get a fresh connection and DNS lookup on every check.
+    The number of in-flight requests is bounded by a semaphore.
+    An engine is bound to the event loop it is first used on (see core.event_loop).
+    """
+
+    def __init__(
+            self,
+            concurrency: int = settings.PROBE_CONCURRENCY,
+            timeout: float = settings.PROBE_TIMEOUT,
+            transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._timeout = timeout
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self.dns_cache = DNSCache()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            transport = self._transport or PooledProbeTransport(
+                self.dns_cache,
+                http2=settings.PROBE_HTTP2,
+                limits=httpx.Limits(
+                    max_connections=settings.PROBE_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.PROBE_MAX_KEEPALIVE,
+                    keepalive_expiry=settings.PROBE_KEEPALIVE_EXPIRY,
+                ),
+            )
+            self._client = httpx.AsyncClient(timeout=self._timeout, transport=transport)
+        return self._client
+
+    def _cold_client(self) -> httpx.AsyncClient:
+        """
+        One-off client without connection reuse and with an empty DNS cache, to measure the full handshake.
+        """
+        transport = self._transport or PooledProbeTransport(
+            DNSCache(),
+            http2=settings.PROBE_HTTP2,
+            limits=httpx.Limits(max_keepalive_connections=0),
+        )
+        return httpx.AsyncClient(timeout=self._timeout, transport=transport)
+
+    async def _get(self, monitor: Monitor, timer: PhaseTimer) -> httpx.Response:
+        extensions = {"trace": timer.trace}
+
+        if not monitor.cold_connection:
+            return await self.client.get(monitor.url, extensions=extensions)
+
+        async with self._cold_client() as client:
+            return await client.get(monitor.url, extensions=extensions)
+
+    async def probe(self, monitor: Monitor) -> ProbeResult:
+        async with self._semaphore:
+            timer = PhaseTimer()
+            token = current_phase_timer.set(timer)
+            started = time.perf_counter()
+            try:
+                response = await self._get(monitor, timer)
+                status_code = response.status_code
+                latency = (time.perf_counter() - started) * 1000
+                error_message = None
+            except Exception as e:
+                status_code = None
+                latency = None
+                error_message = str(e) or e.__class__.__name__
+            finally:
+                current_phase_timer.reset(token)
+
+        if error_message is not None:
+            status = "down"
+        elif status_code != monitor.expected_status_code:
+            status = "degraded"
+            error_message = f"Unexpected status code: {status_code}"
+        else:
+            status = "healthy"
+
+        return ProbeResult(
+            monitor_id=monitor.id,
+            status=status,
+            status_code=status_code,
+            latency=latency,
+            error_message=error_message,
+            checked_at=datetime.now(timezone.utc),
+            phases=timer.phases(),
+            remote_ip=self.dns_cache.peek(urlsplit(monitor.url).hostname or ""),
+        )
+
+    async def probe_many(self, monitors: Iterable[Monitor]) -> list[ProbeResult]:
+        return list(await asyncio.gather(*(self.probe(monitor) for monitor in monitors)))
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_engine: ProbeEngine | None = None
+_engine_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_probe_engine() -> ProbeEngine:
+    """
+    Returns the probe engine bound to the running worker loop.
+    """
+    global _engine, _engine_loop
+
+    loop = asyncio.get_running_loop()
+    if _engine is None or _engine_loop is not loop:
+        _engine = ProbeEngine()
+        _engine_loop = loop
+
+    return _engine
+
+
+@on_worker_loop_shutdown
+async def close_probe_engine():
+    if _engine is not None:
+        await _engine.aclose()
@@ -0,0 +1,80 @@
+from redis import Redis
+
+# Pops due members and reschedules each one by its interval in the same atomic step,
+# so concurrent replicas can never claim the same monitor twice.
+CLAIM_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+local claimed = {}
+for _, member in ipairs(due) do
+    local interval = tonumber(redis.call('HGET', KEYS[2], member) or ARGV[3])
+    local next_due = tonumber(ARGV[1]) + interval
+    redis.call('ZADD', KEYS[1], next_due, member)
+    table.insert(claimed, member)
+    table.insert(claimed, tostring(next_due))
+end
+return claimed
+"""
+
+# Takes the lease if it is free or already ours, and extends it.
+ACQUIRE_LEASE_SCRIPT = """
+local holder = redis.call('GET', KEYS[1])
+if holder == false or holder == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', tonumber(ARGV[2]))
+    return 1
+end
+return 0
+"""
+
+
+class RedisDueQueue:
+    """
+    Monitor due times shared by several scheduler replicas.
+
+    Due times live in a sorted set (member = monitor id, score = due timestamp) and intervals in a hash.
+    Every replica may claim due monitors. Only the lease holder (leader) syncs the set with Postgres.
+    """
+
+    DUE_KEY = "scheduler:due"
+    INTERVALS_KEY = "scheduler:intervals"
+    LEASE_KEY = "scheduler:leader"
+
+    def __init__(self, redis: Redis, default_interval: int = 60):
+        self._redis = redis
+        self._default_interval = default_interval
+        self._claim_due = redis.register_script(CLAIM_DUE_SCRIPT)
+        self._acquire_lease = redis.register_script(ACQUIRE_LEASE_SCRIPT)
+
+    def acquire_lease(self, token: str, ttl_ms: int) -> bool:
+        return bool(self._acquire_lease(keys=[self.LEASE_KEY], args=[token, ttl_ms]))
+
+    def sync(self, monitors: dict[int, tuple[float, int]]):
+        """
+        Aligns the set with the active monitors: {monitor_id: (next_check_at timestamp, check_interval)}.
+        Due times of monitors already in the set are kept, as replicas reschedule them on claim.
+        """
+        current = {int(member) for member in self._redis.zrange(self.DUE_KEY, 0, -1)}
+        removed = current - monitors.keys()
+
+        pipe = self._redis.pipeline(transaction=True)
+        if removed:
+            pipe.zrem(self.DUE_KEY, *removed)
+            pipe.hdel(self.INTERVALS_KEY, *removed)
+        if monitors:
+            pipe.hset(self.INTERVALS_KEY, mapping={
+                monitor_id: interval for monitor_id, (_, interval) in monitors.items()
+            })
+            pipe.zadd(self.DUE_KEY, {
+                monitor_id: due_at for monitor_id, (due_at, _) in monitors.items()
+            }, nx=True)
+        pipe.execute()
+
+    def claim_due(self, now: float, limit: int = 1000) -> list[tuple[int, float]]:
+        """
+        Atomically claims up to `limit` due monitors.
+        Returns: [(monitor_id, next due timestamp), ...]
+        """
+        claimed = self._claim_due(
+            keys=[self.DUE_KEY, self.INTERVALS_KEY],
+            args=[now, limit, self._default_interval],
+        )
+        return [(int(claimed[i]), float(claimed[i + 1])) for i in range(0, len(claimed), 2)]
@@ -0,0 +1,174 @@
+import math
+from datetime import datetime, timezone, timedelta
+from typing import Iterable
+
+from sqlalchemy import literal_column, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from backend.app.models import MonitorRollup
+
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+RESOLUTIONS = (MINUTE, HOUR, DAY)
+
+
+class LatencySketch:
+    """
+    Mergeable latency histogram with logarithmic bins: bin i holds latencies in [GAMMA^i, GAMMA^(i+1)) ms.
+    Quantiles are estimated within ~10% relative error. Sketches merge by adding bins element-wise,
+    which Postgres does in the rollup upsert.
+    """
+
+    GAMMA = 1.2
+    BINS = 64  # up to ~1.2^64 ms, everything above lands in the last bin
+
+    @classmethod
+    def empty(cls) -> list[int]:
+        return [0] * cls.BINS
+
+    @classmethod
+    def bin(cls, latency_ms: float) -> int:
+        if latency_ms < 1:
+            return 0
+        return min(int(math.log(latency_ms, cls.GAMMA)), cls.BINS - 1)
+
+    @classmethod
+    def merge(cls, target: list[int], other: list[int] | None) -> list[int]:
+        if other:
+            for i, count in enumerate(other):
+                target[i] += count
+        return target
+
+    @classmethod
+    def quantile(cls, sketch: list[int], q: float) -> float | None:
+        total = sum(sketch)
+        if not total:
+            return None
+
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(sketch):
+            seen += count
+            if count and seen >= rank:
+                # geometric middle of the bin
+                return cls.GAMMA ** (i + 0.5)
+        return cls.GAMMA ** cls.BINS
+
+
+def bucket_start(moment: datetime, resolution: int) -> datetime:
+    timestamp = int(moment.timestamp())
+    return datetime.fromtimestamp(timestamp - timestamp % resolution, timezone.utc)
+
+
+def aggregate(history_rows: Iterable[dict]) -> list[dict]:
+    """
+    Folds check results into rollup rows, one per (monitor, resolution, bucket).
+    """
+    rollups: dict[tuple, dict] = {}
+
+    for row in history_rows:
+        latency = row.get("latency")
+
+        for resolution in RESOLUTIONS:
+            key = (row["monitor_id"], resolution, bucket_start(row["checked_at"], resolution))
+            rollup = rollups.get(key)
+            if rollup is None:
+                rollup = rollups[key] = {
+                    "monitor_id": key[0],
+                    "resolution": resolution,
+                    "bucket_start": key[2],
+                    "check_count": 0,
+                    "down_count": 0,
+                    "degraded_count": 0,
+                    "latency_count": 0,
+                    "latency_sum": 0.0,
+                    "latency_min": None,
+                    "latency_max": None,
+                    "latency_sketch": LatencySketch.empty(),
+                }
+
+            rollup["check_count"] += 1
+            if row["status"] == "down":
+                rollup["down_count"] += 1
+            elif row["status"] == "degraded":
+                rollup["degraded_count"] += 1
+
+            if latency is not None:
+                rollup["latency_count"] += 1
+                rollup["latency_sum"] += latency
+                if rollup["latency_min"] is None or latency < rollup["latency_min"]:
+                    rollup["latency_min"] = latency
+                if rollup["latency_max"] is None or latency > rollup["latency_max"]:
+                    rollup["latency_max"] = latency
+                rollup["latency_sketch"][LatencySketch.bin(latency)] += 1
+
+    return list(rollups.values())
+
+
+def upsert_rollups(session: Session, rollups: list[dict]):
+    """
+    Adds aggregated rows to the stored buckets with one INSERT ... ON CONFLICT DO UPDATE (Postgres).
+    """
+    if not rollups:
+        return
+
+    stmt = insert(MonitorRollup).values(rollups)
+    table = MonitorRollup.__table__
+    excluded = stmt.excluded
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.monitor_id, table.c.resolution, table.c.bucket_start],
+        set_={
+            "check_count": table.c.check_count + excluded.check_count,
+            "down_count": table.c.down_count + excluded.down_count,
+            "degraded_count": table.c.degraded_count + excluded.degraded_count,
+            "latency_count": table.c.latency_count + excluded.latency_count,
+            "latency_sum": table.c.latency_sum + excluded.latency_sum,
+            "latency_min": func.least(table.c.latency_min, excluded.latency_min),
+            "latency_max": func.greatest(table.c.latency_max, excluded.latency_max),
+            "latency_sketch": literal_column(
+                "(SELECT array_agg(coalesce(a, 0) + coalesce(b, 0) ORDER BY i) "
+                "FROM unnest(monitor_rollups.latency_sketch, excluded.latency_sketch) WITH ORDINALITY AS t(a, b, i))"
+            ),
+        },
+    )
+    session.execute(stmt)
+
+
+def update_rollups(session: Session, checks):
+    """
+    HistorySink flush hook: rolls the flushed results into the rollup tables in the same transaction.
+    """
+    upsert_rollups(session, aggregate(check.history for check in checks))
+
+
+def window_segments(start: datetime, end: datetime) -> list[tuple[int, datetime, datetime]]:
+    """
+    Covers [start, end) with the coarsest aligned buckets: whole days in the middle,
+    hours and then minutes at the edges. Edges are widened to whole minutes.
+    Returns: [(resolution, first bucket_start, bucket_start upper bound), ...]
+    """
+    start = bucket_start(start, MINUTE)
+    end_minute = bucket_start(end, MINUTE)
+    end = end_minute if end_minute == end else end_minute + timedelta(seconds=MINUTE)
+
+    def cover(lo: datetime, hi: datetime, resolutions: tuple[int, ...]) -> list:
+        if lo >= hi:
+            return []
+        resolution, finer = resolutions[0], resolutions[1:]
+        if not finer:
+            return [(resolution, lo, hi)]
+
+        inner_lo = bucket_start(lo, resolution)
+        if inner_lo < lo:
+            inner_lo += timedelta(seconds=resolution)
+        inner_hi = bucket_start(hi, resolution)
+
+        if inner_lo >= inner_hi:
+            return cover(lo, hi, finer)
+
+        return cover(lo, inner_lo, finer) + [(resolution, inner_lo, inner_hi)] + cover(inner_hi, hi, finer)
+
+    return cover(start, end, (DAY, HOUR, MINUTE))
@@ -0,0 +1,53 @@
+import heapq
+
+
+class DueQueue:
+    """
+    Min-heap of (due timestamp, monitor id).
+    Rescheduled or removed monitors leave stale heap entries which are skipped on pop (lazy deletion),
+    so push, remove and pop cost O(log n).
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int]] = []
+        self._due: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, monitor_id: int) -> bool:
+        return monitor_id in self._due
+
+    def push(self, monitor_id: int, due_at: float):
+        self._due[monitor_id] = due_at
+        heapq.heappush(self._heap, (due_at, monitor_id))
+
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._compact()
+
+    def remove(self, monitor_id: int):
+        self._due.pop(monitor_id, None)
+
+    def pop_due(self, now: float) -> list[int]:
+        """
+        Pops every monitor whose due time is <= now, earliest first.
+        """
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, monitor_id = heapq.heappop(self._heap)
+            if self._due.get(monitor_id) != due_at:
+                continue
+            del self._due[monitor_id]
+            due.append(monitor_id)
+        return due
+
+    def replace(self, entries: dict[int, float]):
+        """
+        Rebuilds the queue from a full snapshot in O(n).
+        """
+        self._due = dict(entries)
+        self._compact()
+
+    def _compact(self):
+        self._heap = [(due_at, monitor_id) for monitor_id, due_at in self._due.items()]
+        heapq.heapify(self._heap)
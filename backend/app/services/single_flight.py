@@ -0,0 +1,166 @@
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any, Awaitable, Callable
+
+from redis.exceptions import RedisError
+
+from backend.app.core.config import settings
+from backend.app.services.utils.cache import TTLCache
+
+logger = getLogger(__name__)
+
+# Deletes the lock only if it is still ours: it may have expired and been taken by another worker.
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class CacheStats:
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.local_hits + self.redis_hits + self.misses
+        return (self.local_hits + self.redis_hits) / total if total else 0.0
+
+
+class SingleFlight:
+    """
+    Coalesces identical expensive calls (web search, LLM analysis) across coroutines and workers.
+
+    The result of `fn` is cached in Redis under `key`. On a miss, the first caller takes a short lock
+    (`{key}:lock`) and computes the result; others subscribe to `{key}:done` and get the result published
+    by the leader. Inside one process, concurrent callers of the same key share one future.
+
+    If the leader fails or takes longer than `wait_timeout`, waiters compute the result themselves;
+    if Redis is unavailable, every caller does. Results must be JSON-serializable.
+
+    With a `local` cache, cached results are also kept in process and served without a Redis round trip.
+    `stats` counts local hits, Redis hits (including results received from another worker) and misses.
+    """
+
+    def __init__(
+            self,
+            redis,
+            lock_ttl: int = settings.SINGLE_FLIGHT_LOCK_SECONDS,
+            wait_timeout: float = settings.SINGLE_FLIGHT_WAIT_SECONDS,
+            poll_interval: float = 1.0,
+            local: TTLCache | None = None,
+    ):
+        self._redis = redis
+        self._lock_ttl = lock_ttl
+        self._wait_timeout = wait_timeout
+        self._poll_interval = poll_interval
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._local = local
+        self.stats = CacheStats()
+
+    async def do(
+            self,
+            key: str,
+            fn: Callable[[], Awaitable[Any]],
+            ttl: int,
+            cache_if: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        if self._local is not None:
+            cached = self._local.get(key)
+            if cached is not None:
+                self.stats.local_hits += 1
+                return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._do(key, fn, ttl, cache_if)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: no "never retrieved" warning when nobody else waited
+            raise
+        else:
+            future.set_result(value)
+            if self._local is not None and value is not None and cache_if(value):
+                self._local.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _do(self, key: str, fn, ttl: int, cache_if) -> Any:
+        lock = f"{key}:lock"
+        channel = f"{key}:done"
+        deadline = time.monotonic() + self._wait_timeout
+        pubsub = None
+
+        try:
+            while True:
+                cached = await self._redis.get(key)
+                if cached is not None:
+                    self.stats.redis_hits += 1
+                    return json.loads(cached)
+
+                token = uuid.uuid4().hex
+                if await self._redis.set(lock, token, nx=True, ex=self._lock_ttl):
+                    return await self._lead(key, lock, channel, token, fn, ttl, cache_if)
+
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Gave up waiting for {key}, computing it here")
+                    self.stats.misses += 1
+                    return await fn()
+
+                if pubsub is None:
+                    # Subscribe, then loop to re-check the cache: the leader may have finished in between.
+                    pubsub = self._redis.pubsub()
+                    await pubsub.subscribe(channel)
+                    continue
+
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=min(self._poll_interval, max(deadline - time.monotonic(), 0)),
+                )
+                if message is not None:
+                    self.stats.redis_hits += 1
+                    return json.loads(message["data"])
+
+        except (RedisError, OSError) as e:
+            logger.warning(f"Single-flight unavailable for {key}: {e}")
+            self.stats.misses += 1
+            return await fn()
+
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.unsubscribe(channel)
+                    await pubsub.aclose()
+                except (RedisError, OSError):
+                    pass
+
+    async def _lead(self, key: str, lock: str, channel: str, token: str, fn, ttl: int, cache_if) -> Any:
+        self.stats.misses += 1
+        try:
+            value = await fn()
+            try:
+                payload = json.dumps(value)
+                if cache_if(value):
+                    await self._redis.set(key, payload, ex=ttl)
+                await self._redis.publish(channel, payload)
+            except (RedisError, OSError) as e:
+                logger.warning(f"Failed to share the result of {key}: {e}")
+            return value
+        finally:
+            try:
+                await self._redis.eval(RELEASE_LOCK_SCRIPT, 1, lock, token)
+            except (RedisError, OSError) as e:
+                logger.warning(f"Failed to release {lock}: {e}")
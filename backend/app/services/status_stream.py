@@ -0,0 +1,169 @@
+import asyncio
+import json
+from logging import getLogger
+from typing import AsyncIterator
+
+from redis.exceptions import RedisError
+
+from backend.app.core.config import settings
+from backend.app.core.redis import redis_client, sync_redis_client
+
+logger = getLogger(__name__)
+
+CHANNEL = "status:{owner_id}"
+
+
+def publish_check_results(checks):
+    """
+    HistorySink after-commit hook: publishes every check result on its owner's channel.
+    The owner comes from check.meta (set by the probe task); checks without one are skipped.
+    """
+    published = [check for check in checks if check.meta.get("owner_id") is not None]
+    if not published:
+        return
+    try:
+        with sync_redis_client.pipeline(transaction=False) as pipe:
+            for check in published:
+                pipe.publish(CHANNEL.format(owner_id=check.meta["owner_id"]), json.dumps(check_event(check)))
+            pipe.execute()
+    except (RedisError, OSError) as e:
+        logger.warning(f"Failed to publish {len(published)} check results: {e}")
+
+
+def check_event(check) -> dict:
+    history = check.history
+    checked_at = history.get("checked_at")
+    return {
+        "monitor_id": history["monitor_id"],
+        "history_id": check.history_id,
+        "status": history.get("status"),
+        "status_code": history.get("status_code"),
+        "latency": history.get("latency"),
+        "error_message": history.get("error_message"),
+        "checked_at": checked_at.isoformat() if checked_at else None,
+        "incident_id": check.incident_id,
+        "transition": check.transition,
+    }
+
+
+class Subscription:
+    """
+    One client's bounded queue of events. When the client reads slower than events arrive,
+    the oldest ones are dropped and counted in `dropped`.
+    """
+
+    def __init__(self, owner_id: int, max_size: int):
+        self.owner_id = owner_id
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_size)
+        self.dropped = 0
+
+    def put(self, data: str):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(data)
+
+
+class StatusBroker:
+    """
+    Fans status events out to the stream clients of this process over one Redis pub/sub connection.
+    A channel is subscribed while at least one client of its owner is connected.
+    The reader reconnects (and resubscribes) after Redis errors; events published meanwhile are lost.
+    """
+
+    def __init__(self, redis, queue_size: int = settings.STATUS_STREAM_QUEUE_SIZE, retry_delay: float = 1.0):
+        self._redis = redis
+        self._queue_size = queue_size
+        self._retry_delay = retry_delay
+        self._subscriptions: dict[int, set[Subscription]] = {}
+        self._pubsub = None
+        self._reader: asyncio.Task | None = None
+
+    async def subscribe(self, owner_id: int) -> Subscription:
+        subscription = Subscription(owner_id, self._queue_size)
+        first = owner_id not in self._subscriptions
+        self._subscriptions.setdefault(owner_id, set()).add(subscription)
+
+        if self._pubsub is None:
+            self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read())
+        if first:
+            try:
+                await self._pubsub.subscribe(CHANNEL.format(owner_id=owner_id))
+            except (RedisError, OSError) as e:
+                logger.warning(f"Failed to subscribe to status of {owner_id}, the reader will retry: {e}")
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscriptions.get(subscription.owner_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if subscriptions:
+            return
+
+        del self._subscriptions[subscription.owner_id]
+        try:
+            await self._pubsub.unsubscribe(CHANNEL.format(owner_id=subscription.owner_id))
+        except (RedisError, OSError) as e:
+            logger.warning(f"Failed to unsubscribe from status of {subscription.owner_id}: {e}")
+
+    async def _read(self):
+        # Ends (without awaiting anything after the check) once the last client has left.
+        while self._subscriptions:
+            try:
+                if not self._pubsub.subscribed:
+                    await self._pubsub.subscribe(*(CHANNEL.format(owner_id=owner) for owner in self._subscriptions))
+                message = await self._pubsub.get_message(timeout=1.0)
+            except (RedisError, OSError) as e:
+                logger.warning(f"Status stream lost Redis, reconnecting: {e}")
+                await self._reset_pubsub()
+                await asyncio.sleep(self._retry_delay)
+                continue
+
+            if message is None or message["type"] != "message":
+                continue
+            owner_id = int(message["channel"].rsplit(":", 1)[1])
+            for subscription in self._subscriptions.get(owner_id, ()):
+                subscription.put(message["data"])
+
+    async def _reset_pubsub(self):
+        pubsub, self._pubsub = self._pubsub, self._redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.aclose()
+        except (RedisError, OSError):
+            pass
+
+    async def aclose(self):
+        if self._reader is not None:
+            self._reader.cancel()
+        self._subscriptions.clear()
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+
+status_broker = StatusBroker(redis_client)
+
+
+async def status_events(
+        subscription: Subscription,
+        keepalive: float = settings.STATUS_STREAM_KEEPALIVE_SECONDS,
+) -> AsyncIterator[str]:
+    """
+    Server-Sent Events of a subscription: "check" events, a "dropped" event with the number of
+    events skipped when the client fell behind, and comment lines to keep idle connections open.
+    """
+    reported = 0
+    while True:
+        try:
+            data = await asyncio.wait_for(subscription.queue.get(), timeout=keepalive)
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+
+        if subscription.dropped > reported:
+            yield f"event: dropped\ndata: {subscription.dropped - reported}\n\n"
+            reported = subscription.dropped
+        yield f"event: check\ndata: {data}\n\n"
@@ -0,0 +1,28 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Set membership with false positives but no false negatives, in `size` bits.
+    Positions come from one blake2b digest by double hashing.
+    """
+
+    def __init__(self, size: int, hashes: int):
+        self._size = size
+        self._hashes = hashes
+        self._bits = bytearray(math.ceil(size / 8))
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self._size for i in range(self._hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
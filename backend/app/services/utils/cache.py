@@ -1,11 +1,83 @@
 import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+from urllib.parse import urlsplit
+
+from backend.app.services.utils.fingerprint import OTHER, classify, fingerprint, normalize, status_code
 
 
 def prompt_cache_key(url: str, error: str) -> str:
     """
     Generate a persistent cache key for identical incidents.
-    Useful for Redis or in-memory caching.
+    Errors that differ only by volatile tokens (ports, IPs, request ids, timestamps) share a key,
+    see utils.fingerprint. Useful for Redis or in-memory caching.
     """
-    normalized_error = " ".join(error.lower().split()[:10])
-    payload = f"{url}:{normalized_error}"
+    payload = f"{url}:{fingerprint(error)}"
     return hashlib.md5(payload.encode()).hexdigest()
+
+
+def error_class(error: str) -> str:
+    """
+    Coarse class of a check error: 'http_503', 'timeout', 'dns', ... or its first words, normalized
+    by utils.fingerprint.normalize.
+    """
+    code = status_code(error)
+    if code is not None:
+        return f"http_{code}"
+    name = classify(error)
+    if name != OTHER:
+        return name
+    return normalize(error, max_words=6)
+
+
+def search_cache_key(url: str, error: str) -> str:
+    """
+    Cache key of web searches about a failure: the same error class on the same host finds the same pages.
+    """
+    host = (urlsplit(url).hostname or url).lower().removeprefix("www.")
+    return hashlib.md5(f"{host}:{error_class(error)}".encode()).hexdigest()
+
+
+class TTLCache:
+    """
+    In-process cache with per-entry expiry and LRU eviction beyond `max_size` entries.
+    Not thread-safe: meant for use from one event loop.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key, self._MISSING)
+        if entry is self._MISSING:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        self._data[key] = (self._clock() + (self._ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        self._data.clear()
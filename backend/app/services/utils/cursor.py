@@ -0,0 +1,24 @@
+import base64
+import json
+from datetime import datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(moment: datetime, row_id: int) -> str:
+    """
+    Opaque keyset cursor for a (timestamp, id) position, safe to pass in a query string.
+    """
+    payload = json.dumps([moment.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime, int]:
+    try:
+        payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        moment, row_id = json.loads(payload)
+        return datetime.fromisoformat(moment), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {token!r}") from e
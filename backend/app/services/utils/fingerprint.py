@@ -0,0 +1,73 @@
+import re
+
+DNS = "dns"
+CONNECT_REFUSED = "connect_refused"
+CONNECT_RESET = "connect_reset"
+TLS = "tls"
+TIMEOUT = "timeout"
+HTTP_5XX = "http_5xx"
+HTTP_4XX = "http_4xx"
+HTTP_OTHER = "http_other"
+OTHER = "other"
+
+_CLASSES = (
+    (TIMEOUT, re.compile(r"timed? ?out", re.I)),
+    (CONNECT_REFUSED, re.compile(
+        r"connection refused|econnrefused|connect call failed"
+        r"|all connection attempts failed",
+        re.I,
+    )),
+    (CONNECT_RESET, re.compile(r"connection reset|econnreset|broken pipe|remote ?protocol|disconnected", re.I)),
+    (DNS, re.compile(r"name or service not known|nodename|getaddrinfo|name resolution|nxdomain|no address", re.I)),
+    (TLS, re.compile(r"ssl|tls|certificate", re.I)),
+)
+
+_STATUS = re.compile(r"status code:?\s*(\d{3})", re.I)
+
+# Order matters: longer tokens go before the numbers they contain.
+_VOLATILE = (
+    (re.compile(r"\d{4}-\d{2}-\d{2}[t ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(z|[+-]\d{2}:?\d{2})?", re.I), "<time>"),
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I), "<uuid>"),
+    (re.compile(r"\b0x[0-9a-f]+\b", re.I), "<addr>"),
+    (re.compile(r"\b\d{1,3}(\.\d{1,3}){3}(:\d+)?\b"), "<ip>"),
+    (re.compile(r"\[?\b[0-9a-f]{0,4}(:[0-9a-f]{0,4}){2,7}\b\]?(:\d+)?", re.I), "<ip>"),
+    (re.compile(r"\b(?=[0-9a-f]*\d)(?=[0-9a-f]*[a-f])[0-9a-f]{8,}\b", re.I), "<id>"),
+    (re.compile(r"(?<=[:=])\d+\b"), "<n>"),
+    (re.compile(r"(?<![\w.])\d+(\.\d+)?(ms|s)?\b"), "<n>"),
+)
+
+
+def status_code(error: str) -> int | None:
+    status = _STATUS.search(error)
+    return int(status.group(1)) if status else None
+
+
+def classify(error: str) -> str:
+    """
+    Coarse failure class of a check error: 'dns', 'connect_refused', 'tls', 'timeout', 'http_5xx', ...
+    """
+    code = status_code(error)
+    if code is not None:
+        return HTTP_5XX if code >= 500 else HTTP_4XX if code >= 400 else HTTP_OTHER
+    for name, pattern in _CLASSES:
+        if pattern.search(error):
+            return name
+    return OTHER
+
+
+def normalize(error: str, max_words: int = 16) -> str:
+    """
+    Error text without volatile tokens (timestamps, ids, IPs, ports, counters), lowercased.
+    HTTP status codes are kept: a 502 and a 503 have different causes.
+    """
+    text = _STATUS.sub(lambda match: f"status_{match.group(1)}", error.lower())
+    for pattern, replacement in _VOLATILE:
+        text = pattern.sub(replacement, text)
+    return " ".join(text.split()[:max_words])
+
+
+def fingerprint(error: str) -> str:
+    """
+    Stable identity of an error for caching: "{class}:{normalized text}".
+    """
+    return f"{classify(error)}:{normalize(error)}"
@@ -1,7 +1,7 @@
-import aiohttp
 import logging
 
 from backend.app.core.config import settings
+from backend.app.services.utils.providers import GeminiProvider, ProviderError, ProviderParseError, register_provider
 
 logger = logging.getLogger(__name__)
 
@@ -10,28 +10,15 @@ GEMINI_URL = (
     f"gemini-2.0-flash:generateContent?key={settings.GEMINI_API_KEY}"
 )
 
+gemini = register_provider(GeminiProvider(url=GEMINI_URL, api_key=settings.GEMINI_API_KEY))
 
-async def call_gemini(prompt: str) -> str:
-    payload = {
-        "contents": [{
-            "role": "user",
-            "parts": [{"text": prompt}],
-        }],
-        "generationConfig": {
-            "temperature": 0.2,
-            "maxOutputTokens": 1024,
-        }
-    }
-
-    async with aiohttp.ClientSession() as session:
-        async with session.post(GEMINI_URL, json=payload) as resp:
-            if resp.status != 200:
-                logger.error(f"Gemini API error: {resp.status}")
-                return "AI response error"
-            data = await resp.json()
 
+async def call_gemini(prompt: str) -> str:
     try:
-        return data["candidates"][0]["content"]["parts"][0]["text"]
-    except Exception as e:
-        logger.error(f"Failed to parse Gemini response: {e}")
+        return await gemini.complete(prompt)
+    except ProviderParseError as e:
+        logger.error(str(e))
         return "AI parsing error"
+    except ProviderError as e:
+        logger.error(str(e))
+        return "AI response error"
@@ -1,26 +1,24 @@
 import logging
 
-from openai import OpenAI
-
 from backend.app.core.config import settings
+from backend.app.services.utils.providers import OpenAICompatibleProvider, ProviderError, register_provider
 
 logger = logging.getLogger(__name__)
 
-client = OpenAI(
-    base_url="https://router.huggingface.co/v1",
+HUGGING_FACE_URL = "https://router.huggingface.co/v1/chat/completions"
+
+huggingface = register_provider(OpenAICompatibleProvider(
+    url=HUGGING_FACE_URL,
     api_key=settings.HUGGING_FACE_API_KEY,
-)
+    model="moonshotai/Kimi-K2-Instruct-0905",
+    name="huggingface",
+    max_tokens=512,
+))
 
 
 async def call_huggingface(prompt: str) -> str:
     try:
-        completion = client.chat.completions.create(
-            model="moonshotai/Kimi-K2-Instruct-0905",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-            max_tokens=512
-        )
-        return completion.choices[0].message.content
-    except Exception as e:
+        return await huggingface.complete(prompt)
+    except ProviderError as e:
         logger.error(f"Error calling HuggingFace model: {e}")
         return "AI response error"
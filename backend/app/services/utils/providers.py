@@ -0,0 +1,224 @@
+import abc
+import asyncio
+import logging
+import time
+from typing import Sequence
+
+import aiohttp
+
+from backend.app.core.config import settings
+from backend.app.core.event_loop import on_worker_loop_shutdown
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderError(Exception):
+    """
+    The provider did not return a usable completion: bad status, timeout or connection error.
+    """
+
+
+class ProviderParseError(ProviderError):
+    """
+    The provider answered, but the completion could not be found in the response.
+    """
+
+
+class LLMProvider(abc.ABC):
+    """
+    An LLM HTTP API called over a persistent aiohttp session.
+
+    At most `concurrency` requests run at once per provider, each limited to `timeout` seconds.
+    The session and the limit are bound to the running event loop and recreated for a new one.
+    """
+
+    name = "provider"
+
+    def __init__(
+            self,
+            url: str,
+            api_key: str | None,
+            model: str | None = None,
+            name: str | None = None,
+            max_tokens: int = 1024,
+            timeout: float = settings.LLM_TIMEOUT,
+            concurrency: int = settings.LLM_CONCURRENCY,
+    ):
+        self.name = name or self.name
+        self.url = url
+        self.api_key = api_key
+        self.model = model
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.concurrency = concurrency
+
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @abc.abstractmethod
+    def payload(self, prompt: str) -> dict:
+        """The JSON request body asking for a completion of `prompt`."""
+
+    def headers(self) -> dict:
+        return {}
+
+    @abc.abstractmethod
+    def parse(self, data: dict) -> str:
+        """The completion text in the decoded response body."""
+
+    async def complete(self, prompt: str) -> str:
+        session, semaphore = self._resources()
+
+        async with semaphore:
+            try:
+                async with session.post(
+                        self.url,
+                        json=self.payload(prompt),
+                        headers=self.headers(),
+                        timeout=aiohttp.ClientTimeout(total=self.timeout),
+                ) as resp:
+                    if resp.status != 200:
+                        error_text = await resp.text()
+                        raise ProviderError(f"{self.name} API error: {resp.status} | {error_text[:200]}")
+                    data = await resp.json(content_type=None)
+            except asyncio.TimeoutError as e:
+                raise ProviderError(f"{self.name} timed out after {self.timeout}s") from e
+            except aiohttp.ClientError as e:
+                raise ProviderError(f"{self.name} request failed: {e}") from e
+            except ValueError as e:  # not JSON
+                raise ProviderParseError(f"Failed to parse {self.name} response: {e}") from e
+
+        try:
+            return self.parse(data)
+        except (KeyError, IndexError, TypeError) as e:
+            raise ProviderParseError(f"Failed to parse {self.name} response: {e}") from e
+
+    def _resources(self) -> tuple[aiohttp.ClientSession, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60),
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._session, self._semaphore
+
+    async def aclose(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """
+    /v1/chat/completions APIs: HuggingFace router, DeepSeek.
+    """
+
+    def payload(self, prompt: str) -> dict:
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.2,
+            "max_tokens": self.max_tokens,
+        }
+
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    def parse(self, data: dict) -> str:
+        return data["choices"][0]["message"]["content"]
+
+
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+
+    def payload(self, prompt: str) -> dict:
+        return {
+            "contents": [{
+                "role": "user",
+                "parts": [{"text": prompt}],
+            }],
+            "generationConfig": {
+                "temperature": 0.2,
+                "maxOutputTokens": self.max_tokens,
+            }
+        }
+
+    def parse(self, data: dict) -> str:
+        return data["candidates"][0]["content"]["parts"][0]["text"]
+
+
+class ProviderChain:
+    """
+    Tries providers in order until one returns a completion.
+
+    With `hedge_after` set, a provider that has not answered within that many seconds is not waited on alone:
+    the next provider is started too, and whichever answers first wins (the others are cancelled).
+    A provider that fails starts the next one right away.
+    """
+
+    def __init__(self, providers: Sequence[LLMProvider], hedge_after: float | None = None):
+        self.providers = list(providers)
+        self.hedge_after = hedge_after or None
+
+    async def complete(self, prompt: str) -> str:
+        pending: dict[asyncio.Task, LLMProvider] = {}
+        remaining = iter(self.providers)
+        errors = []
+
+        def start_next() -> bool:
+            provider = next(remaining, None)
+            if provider is None:
+                return False
+            pending[asyncio.ensure_future(provider.complete(prompt))] = provider
+            return True
+
+        if not start_next():
+            raise ProviderError("No LLM providers configured")
+
+        try:
+            while pending:
+                started = time.monotonic()
+                done, _ = await asyncio.wait(
+                    pending, timeout=self.hedge_after, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    if start_next():
+                        logger.info(f"No LLM answer after {time.monotonic() - started:.1f}s, hedging")
+                    else:
+                        await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    try:
+                        return task.result()
+                    except ProviderError as e:
+                        logger.warning(f"LLM provider {provider.name} failed: {e}")
+                        errors.append(e)
+                        start_next()
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise ProviderError(f"All LLM providers failed: {'; '.join(map(str, errors))}")
+
+
+_providers: list[LLMProvider] = []
+
+
+def register_provider(provider: LLMProvider) -> LLMProvider:
+    """
+    Adds a long-lived provider to those whose sessions are closed with the worker loop.
+    """
+    _providers.append(provider)
+    return provider
+
+
+@on_worker_loop_shutdown
+async def close_providers():
+    for provider in _providers:
+        await provider.aclose()
@@ -0,0 +1,84 @@
+import uuid
+from logging import getLogger
+
+from redis.exceptions import RedisError
+
+from backend.app.core.redis import redis_client, sync_redis_client
+
+logger = getLogger(__name__)
+
+EPOCH_KEY = "version:epoch"
+
+
+def monitor_scope(monitor_id: int) -> str:
+    """
+    Version of a monitor and everything under it (history, problems): bumped on writes and new checks.
+    """
+    return f"version:monitor:{monitor_id}"
+
+
+def owner_scope(owner_id: int) -> str:
+    """
+    Version of a user's monitor list: bumped when monitors are created or deleted.
+    """
+    return f"version:owner:{owner_id}"
+
+
+class VersionStore:
+    """
+    Version counters in Redis, from which the API derives ETags (see api.conditional).
+
+    The epoch is part of every version: it changes when Redis loses the counters (they restart
+    from zero and could repeat old values) and when data changes in bulk (partition drops), so that
+    no ETag issued before can match again. Reads return None when Redis is unavailable:
+    the API then answers without ETags rather than risk a wrong 304.
+    """
+
+    def __init__(self, redis, sync_redis):
+        self._redis = redis
+        self._sync_redis = sync_redis
+
+    async def get(self, scopes: list[str]) -> list[str] | None:
+        try:
+            epoch, *versions = await self._redis.mget(EPOCH_KEY, *scopes)
+            if epoch is None:
+                await self._redis.set(EPOCH_KEY, uuid.uuid4().hex, nx=True)
+                epoch, *versions = await self._redis.mget(EPOCH_KEY, *scopes)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Versions unavailable: {e}")
+            return None
+        return [epoch, *(version or "0" for version in versions)]
+
+    async def bump(self, scopes: list[str]):
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for scope in scopes:
+                    pipe.incr(scope)
+                await pipe.execute()
+        except (RedisError, OSError) as e:
+            logger.warning(f"Failed to bump versions {scopes}: {e}")
+
+    def bump_sync(self, scopes: list[str]):
+        try:
+            with self._sync_redis.pipeline(transaction=False) as pipe:
+                for scope in scopes:
+                    pipe.incr(scope)
+                pipe.execute()
+        except (RedisError, OSError) as e:
+            logger.warning(f"Failed to bump versions of {len(scopes)} scopes: {e}")
+
+    def new_epoch_sync(self):
+        try:
+            self._sync_redis.set(EPOCH_KEY, uuid.uuid4().hex)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Failed to start a new version epoch: {e}")
+
+
+versions = VersionStore(redis_client, sync_redis_client)
+
+
+def bump_checked_monitors(checks):
+    """
+    HistorySink after-commit hook: new checks change the history of their monitors.
+    """
+    versions.bump_sync([monitor_scope(monitor_id) for monitor_id in {check.history["monitor_id"] for check in checks}])
@@ -1,5 +1,18 @@
 from .scheduler import schedule_monitoring
-from .monitoring_tasks import check_monitor
-from .alerts import send_alert_email
+from .monitoring_tasks import check_monitor, check_monitors_batch
+from .alerts import send_alert_email, send_alert_digest
+from .enrichment import enrich_problem, enrich_cluster, notify_problem, notify_incident_resolved
+from .maintenance import maintain_history_partitions
 
-__all__ = ['schedule_monitoring', 'check_monitor', 'send_alert_email']
+__all__ = [
+    'schedule_monitoring',
+    'check_monitor',
+    'check_monitors_batch',
+    'send_alert_email',
+    'send_alert_digest',
+    'enrich_problem',
+    'enrich_cluster',
+    'notify_problem',
+    'notify_incident_resolved',
+    'maintain_history_partitions',
+]
@@ -1,13 +1,20 @@
-import smtplib
+import json
 from email.message import EmailMessage
 from logging import getLogger
 
+from redis.exceptions import RedisError
+
 from backend.app.core.config import settings
 from backend.app.core.celery_app import celery
+from backend.app.core.redis import sync_redis_client
+from backend.app.services.mailer import mailer
 
 
 logger = getLogger(__name__)
 
+DIGEST_KEY = "alerts:digest:{email}"
+
+
 @celery.task
 def send_alert_email(
         user_email: str,
@@ -21,34 +28,97 @@ def send_alert_email(
 ):
     """
     Sends an email notification to the monitor owner.
+    With ALERT_DIGEST_SECONDS set, alerts for the same owner within that window are merged into one email.
     """
+    alert = {
+        "monitor_name": monitor_name,
+        "monitor_user_name": monitor_user_name,
+        "monitor_url": monitor_url,
+        "monitor_status": monitor_status,
+        "ai_recommendations": ai_recommendations,
+        "monitor_check_interval": monitor_check_interval,
+    }
+
+    if settings.ALERT_DIGEST_SECONDS and _queue_for_digest(user_email, alert):
+        return
 
+    _send(build_alert_message(user_email, [alert]), user_email)
+
+
+@celery.task
+def send_alert_digest(user_email: str):
+    """
+    Sends the alerts collected for the owner during the digest window as one email.
+    """
+    key = DIGEST_KEY.format(email=user_email)
+    with sync_redis_client.pipeline() as pipe:
+        pipe.lrange(key, 0, -1)
+        pipe.delete(key)
+        raw_alerts, _ = pipe.execute()
+
+    alerts = [json.loads(raw) for raw in raw_alerts]
+    if alerts:
+        _send(build_alert_message(user_email, alerts), user_email)
+
+
+def _queue_for_digest(user_email: str, alert: dict) -> bool:
+    """
+    Adds the alert to the owner's digest; the first alert of a window schedules the digest.
+    Returns False when Redis is unavailable, so the alert is sent right away instead.
+    """
+    key = DIGEST_KEY.format(email=user_email)
+    try:
+        with sync_redis_client.pipeline() as pipe:
+            pipe.rpush(key, json.dumps(alert))
+            # only a new list gets a TTL, so a digest whose task was lost still expires
+            pipe.expire(key, settings.ALERT_DIGEST_SECONDS * 10, nx=True)
+            queued, _ = pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Alert digest unavailable, sending right away: {e}")
+        return False
+
+    if queued == 1:
+        send_alert_digest.apply_async(args=[user_email], countdown=settings.ALERT_DIGEST_SECONDS)
+    return True
+
+
+def build_alert_message(user_email: str, alerts: list[dict]) -> EmailMessage:
     msg = EmailMessage()
     msg["From"] = settings.EMAIL_HOST_USER
     msg["To"] = user_email
-    msg["Subject"] = f"Monitoring: {monitor_name} caught on change status"
-    msg.set_content(
-        f"""
-            Hello, {monitor_user_name}!
 
-            Site monitoring has shown a change in the result:
+    if len(alerts) == 1:
+        msg["Subject"] = f"Monitoring: {alerts[0]['monitor_name']} caught on change status"
+    else:
+        msg["Subject"] = f"Monitoring: {len(alerts)} monitors caught on change status"
 
-            Name: {monitor_name}
-            URL: {monitor_url}
-            New status: {monitor_status}
-            
-            Checked: {monitor_check_interval} seconds ago.
+    sections = "\n".join(
+        f"""
+            Name: {alert['monitor_name']}
+            URL: {alert['monitor_url']}
+            New status: {alert['monitor_status']}
             
-            Recommendations: {ai_recommendations}
+            Checked: {alert['monitor_check_interval']} seconds ago.
             
+            Recommendations: {alert['ai_recommendations']}
+        """
+        for alert in alerts
+    )
+    msg.set_content(
+        f"""
+            Hello, {alerts[0]['monitor_user_name']}!
+
+            Site monitoring has shown a change in the result:
+            {sections}
             -- 
             API Health Monitor
         """)
+    return msg
+
+
+def _send(msg: EmailMessage, user_email: str):
     try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.starttls()
-            server.login(settings.EMAIL_HOST_USER, settings.EMAIL_HOST_PASSWORD)
-            server.send_message(msg)
+        mailer.send(msg)
         logger.info(f"Alert was sent to: {user_email}")
 
     except Exception as e:
@@ -0,0 +1,210 @@
+from datetime import datetime, timezone
+from logging import getLogger
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import joinedload
+
+from backend.app.core.celery_app import celery
+from backend.app.core.config import settings
+from backend.app.core.database import sync_session_maker
+from backend.app.core.event_loop import run_in_worker_loop
+from backend.app.models import Incident, Monitor, Problem, ProblemCluster
+from backend.app.services.ai_analysis import ai_analyze_issue
+from backend.app.services.duckduckgo import duckduckgo_search
+from backend.app.services.clusters import ANALYZED, CREATED
+from backend.app.services.incidents import OPENED, RESOLVED
+from backend.app.services.utils.cache import search_cache_key
+from backend.app.tasks.alerts import send_alert_email
+
+logger = getLogger('monitoring')
+
+
+def dispatch_incident_jobs(checks):
+    """
+    HistorySink after-commit hook: queues enrichment of every newly opened incident
+    and the recovery alert of every resolved one.
+
+    Problems in a cluster (see services.clusters) are enriched once per cluster: the first one queues
+    the cluster analysis, the others are alerted when it is done, or right away if it already is.
+    """
+    for check in checks:
+        if check.transition == OPENED and check.problem_id is not None:
+            priority = settings.ENRICHMENT_PRIORITY_DOWN \
+                if check.history.get("status") == "down" else settings.ENRICHMENT_PRIORITY_DEGRADED
+            if check.cluster_id is None:
+                enrich_problem.apply_async(args=[check.problem_id], priority=priority)
+            elif check.cluster_state == CREATED:
+                enrich_cluster.apply_async(args=[check.cluster_id], priority=priority)
+            elif check.cluster_state == ANALYZED:
+                notify_problem.delay(check.problem_id)
+        elif check.transition == RESOLVED and check.incident_id is not None:
+            notify_incident_resolved.delay(check.incident_id)
+
+
+@celery.task(acks_late=True)
+def enrich_problem(problem_id: int):
+    """
+    Fills in the DuckDuckGo results and AI analysis of a problem, then alerts the monitor owner.
+    Runs on the "enrichment" queue so slow searches and LLM calls never hold a probe worker.
+    """
+    return run_in_worker_loop(_enrich_problem_async(problem_id))
+
+
+async def _enrich_problem_async(problem_id: int):
+    with sync_session_maker() as session:
+        problem = session.get(
+            Problem,
+            problem_id,
+            options=[joinedload(Problem.monitor).joinedload(Monitor.owner), joinedload(Problem.history)],
+        )
+        if problem is None or problem.ai_analysis is not None:
+            return None  # deleted meanwhile, or already enriched by an earlier delivery of this task
+
+        monitor = problem.monitor
+        error_message = problem.history.error_message if problem.history else "Unknown error"
+        status_code = problem.history.status_code if problem.history else None
+
+    ddg, ai_analysis, ai_recommendations = await _analyze_failure(monitor.url, error_message)
+
+    with sync_session_maker() as session:
+        problem = session.get(Problem, problem_id)
+        if problem is None:
+            return None
+        problem.duckduckgo_search_data = ddg
+        problem.ai_analysis = ai_analysis
+        problem.ai_recommendations = ai_recommendations
+        session.commit()
+
+    _send_alert(monitor, status_code, ai_recommendations)
+    return {"problem_id": problem_id}
+
+
+@celery.task(acks_late=True)
+def enrich_cluster(cluster_id: int):
+    """
+    Analyzes the first failure of a cluster and shares the result with every problem in it,
+    then alerts the owners of the affected monitors.
+    """
+    return run_in_worker_loop(_enrich_cluster_async(cluster_id))
+
+
+async def _enrich_cluster_async(cluster_id: int):
+    with sync_session_maker() as session:
+        cluster = session.get(ProblemCluster, cluster_id)
+        if cluster is None or cluster.analyzed_at is not None:
+            return None
+        url, error_message = cluster.url, cluster.error_message or "Unknown error"
+
+    ddg, ai_analysis, ai_recommendations = await _analyze_failure(url, error_message)
+
+    with sync_session_maker() as session:
+        # Waits for flushes still adding problems to the cluster, so that the update below sees them.
+        cluster = session.get(ProblemCluster, cluster_id, with_for_update=True)
+        if cluster is None:
+            return None
+        cluster.duckduckgo_search_data = ddg
+        cluster.ai_analysis = ai_analysis
+        cluster.ai_recommendations = ai_recommendations
+        cluster.analyzed_at = datetime.now(timezone.utc)
+        problem_ids = session.scalars(
+            update(Problem)
+            .where(Problem.cluster_id == cluster_id, Problem.ai_analysis.is_(None))
+            .values(duckduckgo_search_data=ddg, ai_analysis=ai_analysis, ai_recommendations=ai_recommendations)
+            .returning(Problem.id)
+        ).all()
+        session.commit()
+
+    _alert_problems(problem_ids)
+    return {"cluster_id": cluster_id, "problems": len(problem_ids)}
+
+
+@celery.task
+def notify_problem(problem_id: int):
+    """
+    Alerts the owner about a problem that joined an already analyzed cluster.
+    """
+    _alert_problems([problem_id])
+    return {"problem_id": problem_id}
+
+
+def _alert_problems(problem_ids: list[int]):
+    if not problem_ids:
+        return
+    with sync_session_maker() as session:
+        problems = session.scalars(
+            select(Problem)
+            .where(Problem.id.in_(problem_ids))
+            .options(joinedload(Problem.monitor).joinedload(Monitor.owner), joinedload(Problem.history))
+        ).all()
+
+    for problem in problems:
+        _send_alert(
+            problem.monitor,
+            problem.history.status_code if problem.history else None,
+            problem.ai_recommendations,
+        )
+
+
+async def _analyze_failure(url: str, error_message: str) -> tuple[list | None, str, str]:
+    """
+    Looks for the failure cause on DuckDuckGo and asks AI for analysis.
+    Returns: (ddg_results, ai_analysis, ai_recommendations)
+    """
+    logger.info(f'{url} receive unexpected response')
+    ddg = None
+    try:
+        ddg = await duckduckgo_search(
+            f"Why {url} is down, {error_message}",
+            cache_key=search_cache_key(url, error_message),
+        )
+
+        logger.info('-' * 50)
+        logger.info(f'DDg:  {ddg}')
+        logger.info('-' * 50)
+
+        if ddg:
+            ai_analysis, ai_recommendations = await ai_analyze_issue(
+                url=url,
+                error_message=error_message,
+                ddg_results=ddg,
+            )
+        else:
+            logger.error('Something went wrong with duckduckgo_search ')
+            ai_analysis, ai_recommendations = "Search for solutions failed", "Check the error manually"
+
+    except Exception as e:
+        logger.error(f"Error in problem analysis: {e}")
+        ai_analysis, ai_recommendations = "Analysis error", str(e)
+
+    logger.info('-' * 50)
+    logger.info('AI Analysis: ' + ai_analysis)
+    logger.info('AI Recommendations: ' + ai_recommendations)
+    logger.info('-' * 50)
+
+    return ddg, ai_analysis, ai_recommendations
+
+
+@celery.task
+def notify_incident_resolved(incident_id: int):
+    with sync_session_maker() as session:
+        incident = session.get(
+            Incident, incident_id, options=[joinedload(Incident.monitor).joinedload(Monitor.owner)]
+        )
+        if incident is None:
+            return None
+        monitor = incident.monitor
+
+    _send_alert(monitor, "healthy", "The monitor is healthy again, the incident is resolved.")
+    return {"incident_id": incident_id}
+
+
+def _send_alert(monitor: Monitor, status, recommendations: str):
+    send_alert_email.delay(
+        user_email=monitor.owner.email,
+        monitor_name=monitor.name,
+        monitor_user_name=monitor.owner.full_name,
+        monitor_url=monitor.url,
+        monitor_status=status,
+        ai_recommendations=recommendations,
+        monitor_check_interval=monitor.check_interval,
+    )
@@ -0,0 +1,65 @@
+from datetime import datetime, timezone, timedelta
+from logging import getLogger
+
+from sqlalchemy import text
+
+from backend.app.core.celery_app import celery
+from backend.app.core.config import settings
+from backend.app.core.database import sync_session_maker
+from backend.app.services.partitions import (
+    apply_monitor_retention,
+    drop_expired_partitions,
+    ensure_future_partitions,
+    prune_rollups,
+)
+from backend.app.services.versions import versions
+
+logger = getLogger(__name__)
+
+
+@celery.task
+def maintain_history_partitions():
+    """
+    Creates upcoming monitor_history partitions, drops expired ones (downsampling them into rollups first)
+    and applies per-monitor retention.
+
+    Partitions are dropped once they are older than the longest retention in use
+    (HISTORY_RETENTION_DAYS or any monitor's history_retention_days). Monitors with a shorter
+    retention get their older rows deleted.
+    """
+    now = datetime.now(timezone.utc)
+
+    with sync_session_maker() as session:
+        session.execute(text("SET LOCAL TimeZone = 'UTC'"))
+
+        created = ensure_future_partitions(
+            session,
+            now,
+            span_days=settings.HISTORY_PARTITION_DAYS,
+            days_ahead=settings.HISTORY_PARTITIONS_AHEAD,
+        )
+
+        longest = session.execute(text("SELECT max(history_retention_days) FROM monitors")).scalar()
+        retention_days = max(settings.HISTORY_RETENTION_DAYS, longest or 0)
+        dropped = drop_expired_partitions(
+            session,
+            cutoff=now - timedelta(days=retention_days),
+            downsample=settings.HISTORY_DOWNSAMPLE_ON_DROP,
+        )
+
+        deleted = apply_monitor_retention(session, now, settings.HISTORY_RETENTION_DAYS)
+
+        prune_rollups(
+            session,
+            now,
+            minute_days=settings.ROLLUP_MINUTE_RETENTION_DAYS,
+            hour_days=settings.ROLLUP_HOUR_RETENTION_DAYS,
+        )
+
+        session.commit()
+
+    if dropped or deleted:
+        versions.new_epoch_sync()  # old history pages changed: no ETag issued before may match
+
+    logger.info(f"History partitions created: {created}, dropped: {dropped}, expired rows deleted: {deleted}")
+    return {"created": created, "dropped": dropped, "deleted": deleted}
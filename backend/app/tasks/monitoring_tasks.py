@@ -1,16 +1,19 @@
-import asyncio
 from logging import getLogger, basicConfig, DEBUG, FileHandler, ERROR, StreamHandler, Formatter
 
-import httpx
-from datetime import datetime, timezone
-
-from backend.app.services.duckduckgo import duckduckgo_search
-from backend.app.services.ai_analysis import ai_analyze_issue
+from backend.app.services.clusters import cluster_problems
+from backend.app.services.history_sink import history_sink
+from backend.app.services.incidents import track_incidents
+from backend.app.services.monitor_status import update_monitor_status
+from backend.app.services.probe import ProbeResult, get_probe_engine
+from backend.app.services.rollups import update_rollups
+from backend.app.services.status_stream import publish_check_results
+from backend.app.services.versions import bump_checked_monitors
 from backend.app.core.celery_app import celery
 from backend.app.core.database import sync_session_maker
+from backend.app.core.event_loop import run_in_worker_loop
 
-from backend.app.models import Monitor, MonitorHistory, Problem
-from backend.app.tasks.alerts import send_alert_email
+from backend.app.models import Monitor
+from backend.app.tasks.enrichment import dispatch_incident_jobs
 
 
 logger = getLogger('monitoring')
@@ -29,97 +32,65 @@ console.setFormatter(formatter)
 
 basicConfig(level=DEBUG, format=FORMAT, handlers=[file_handler, console])
 
+history_sink.on_flush(update_rollups)
+history_sink.on_flush(track_incidents)
+history_sink.on_flush(update_monitor_status)
+history_sink.on_flush(cluster_problems)
+history_sink.after_commit(dispatch_incident_jobs)
+history_sink.after_commit(bump_checked_monitors)
+history_sink.after_commit(publish_check_results)
+
 
 @celery.task
 def check_monitor(monitor_id: int):
-    return asyncio.run(_check_monitor_async(monitor_id))
+    return run_in_worker_loop(_check_monitor_async(monitor_id))
+
+
+@celery.task
+def check_monitors_batch(monitor_ids: list[int]):
+    """
+    Probes a batch of monitors concurrently on the worker's long-lived event loop.
+    """
+    return run_in_worker_loop(_check_monitors_batch_async(monitor_ids))
 
 
 async def _check_monitor_async(monitor_id: int):
+    results = await _check_monitors_batch_async([monitor_id])
+    return results[0] if results else None
+
+
+async def _check_monitors_batch_async(monitor_ids: list[int]):
+    # The session is closed before probing, so no connection is held while waiting on the network.
     with sync_session_maker() as session:
-        monitor = session.get(Monitor, monitor_id)
-
-        if not monitor or not monitor.is_active:
-            return
-
-        try:
-            with httpx.Client(timeout=10) as client:
-                response = client.get(monitor.url)
-                status_code = response.status_code
-                latency = response.elapsed.total_seconds() * 1000
-                error_message = None
-        except Exception as e:
-            status_code = None
-            latency = None
-            error_message = str(e)
-
-        if error_message is not None:
-            status = "down"
-        elif status_code != monitor.expected_status_code:
-            status = "degraded"
-            error_message = f"Unexpected status code: {status_code}"
-        else:
-            status = "healthy"
-
-        history = MonitorHistory(
-            monitor_id=monitor_id,
-            status=status,
-            status_code=status_code,
-            latency=latency,
-            error_message=error_message,
-            checked_at=datetime.now(timezone.utc)
+        monitors = (
+            session.query(Monitor)
+            .filter(Monitor.id.in_(monitor_ids), Monitor.is_active.is_(True))
+            .all()
         )
 
-        session.add(history)
-        session.flush()
-
-        if error_message:
-            logger.info(f'Monitor {monitor.name} receive unexpected response')
-            try:
-                ddg = await duckduckgo_search(f"Why {monitor.url} is down, {error_message}")
-
-                logger.info('-' * 50)
-                logger.info(f'DDg:  {ddg}')
-                logger.info('-' * 50)
-
-                if ddg:
-                    ai_analysis, ai_recommendations = await ai_analyze_issue(
-                        url=monitor.url,
-                        error_message=error_message,
-                        ddg_results=ddg,
-                    )
-                else:
-                    logger.error('Something went wrong with duckduckgo_search ')
-                    ai_analysis, ai_recommendations = "Search for solutions failed", "Check the error manually"
-
-            except Exception as e:
-                logger.error(f"Error in problem analysis: {e}")
-                ai_analysis, ai_recommendations = "Analysis error", str(e)
-
-            logger.info('-' * 50)
-            logger.info('AI Analysis: ' + ai_analysis)
-            logger.info('AI Recommendations: ' + ai_recommendations)
-            logger.info('-' * 50)
-
-            send_alert_email.delay(
-                user_email=monitor.owner.email,
-                monitor_name=monitor.name,
-                monitor_user_name=monitor.owner.full_name,
-                monitor_url=monitor.url,
-                monitor_status=status_code,
-                ai_recommendations=ai_recommendations,
-                monitor_check_interval=monitor.check_interval,
-            )
-
-            problem = Problem(
-                history_id=history.id,
-                monitor_id=monitor_id,
-                duckduckgo_search_data=ddg,
-                ai_analysis=ai_analysis,
-                ai_recommendations=ai_recommendations
-            )
-            session.add(problem)
-
-        session.commit()
-
-        return {"monitor_id": monitor_id, "status": status}
+    if not monitors:
+        return []
+
+    results = await get_probe_engine().probe_many(monitors)
+
+    for monitor, result in zip(monitors, results):
+        _record_result(monitor, result)
+
+    return [{"monitor_id": result.monitor_id, "status": result.status} for result in results]
+
+
+def _record_result(monitor: Monitor, result: ProbeResult):
+    """
+    Hands the result to the history sink, which writes it in bulk with other results.
+    Incidents are opened and resolved by the sink's flush hook; their enrichment and alerts
+    are queued after the commit (see tasks.enrichment).
+    """
+    history_sink.add({
+        "monitor_id": monitor.id,
+        "status": result.status,
+        "status_code": result.status_code,
+        "latency": result.latency,
+        "error_message": result.error_message,
+        "checked_at": result.checked_at,
+        **{f"{phase}_ms": duration for phase, duration in result.phases.items()},
+    }, meta={"url": monitor.url, "remote_ip": result.remote_ip, "owner_id": monitor.owner_id})
@@ -1,41 +1,137 @@
+import os
+import socket
+import time
+import uuid
 from datetime import datetime, timezone, timedelta
 from logging import getLogger
 
+from sqlalchemy import select, update
+
 from backend.app.core.celery_app import celery
+from backend.app.core.config import settings
 from backend.app.core.database import sync_session_maker
+from backend.app.core.redis import sync_redis_client
 from backend.app.models import Monitor
-from backend.app.tasks.monitoring_tasks import check_monitor
+from backend.app.services.redis_schedule import RedisDueQueue
+from backend.app.services.schedule_queue import DueQueue
+from backend.app.tasks.monitoring_tasks import check_monitor, check_monitors_batch
 
 logger = getLogger(__name__)
 
-@celery.task
-def schedule_monitoring():
-    with sync_session_maker() as session:
-        monitors = session.query(Monitor).filter(Monitor.is_active == True).all()
+# SCHEDULER_BACKEND="memory": the queue lives in the scheduler worker process
+# (see the "scheduler" queue in celery_app).
+# SCHEDULER_BACKEND="redis": due times live in a Redis sorted set shared by any number of scheduler replicas.
+# In both modes the persistent source of truth is monitors.next_check_at.
+_queue = DueQueue()
+_intervals: dict[int, int] = {}
+_synced_at: float | None = None
+
+_redis_queue: RedisDueQueue | None = None
+_replica_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def dispatch_checks(monitor_ids: list[int]):
+    """
+    Sends due monitors to the workers in batches of PROBE_BATCH_SIZE.
+    A batch size of 1 falls back to one check_monitor task per monitor.
+    """
+    batch_size = settings.PROBE_BATCH_SIZE
+
+    if batch_size <= 1:
+        for monitor_id in monitor_ids:
+            check_monitor.delay(monitor_id)
+        return
+
+    for i in range(0, len(monitor_ids), batch_size):
+        check_monitors_batch.delay(monitor_ids[i:i + batch_size])
+
+
+def _resync_due() -> bool:
+    return _synced_at is None or time.monotonic() - _synced_at >= settings.SCHEDULER_RESYNC_SECONDS
+
+
+def _load_active(session):
+    """
+    Reads due times of active monitors: only three columns, history is never touched.
+    """
+    return session.execute(
+        select(Monitor.id, Monitor.next_check_at, Monitor.check_interval)
+        .where(Monitor.is_active.is_(True))
+    ).all()
+
+
+def _resync(session):
+    global _synced_at
 
-        now = datetime.now(timezone.utc)
+    rows = _load_active(session)
 
-        for monitor in monitors:
-            last_history = monitor.history[-1] if monitor.history else None
+    _intervals.clear()
+    _intervals.update({monitor_id: interval or 60 for monitor_id, _, interval in rows})
+    _queue.replace({monitor_id: next_check_at.timestamp() for monitor_id, next_check_at, _ in rows})
+    _synced_at = time.monotonic()
 
-            if not last_history:
-                check_monitor.delay(monitor.id)
-                continue
+    logger.info(f"Scheduler resynced {len(rows)} active monitors")
 
-            last_check = last_history.checked_at
-            last_check = last_check.astimezone(timezone.utc)
-            interval = monitor.check_interval
 
-            time_passed = (now - last_check).total_seconds()
+def _claim_from_memory(session, now: datetime) -> list[tuple[int, datetime]]:
+    if _resync_due():
+        _resync(session)
+
+    claimed = []
+    for monitor_id in _queue.pop_due(now.timestamp()):
+        next_check_at = now + timedelta(seconds=_intervals[monitor_id])
+        _queue.push(monitor_id, next_check_at.timestamp())
+        claimed.append((monitor_id, next_check_at))
+    return claimed
+
+
+def get_redis_queue() -> RedisDueQueue:
+    global _redis_queue
+    if _redis_queue is None:
+        _redis_queue = RedisDueQueue(sync_redis_client)
+    return _redis_queue
+
+
+def _claim_from_redis(session, now: datetime) -> list[tuple[int, datetime]]:
+    global _synced_at
+
+    queue = get_redis_queue()
+
+    if queue.acquire_lease(_replica_id, settings.SCHEDULER_LEASE_SECONDS * 1000):
+        if _resync_due():
+            queue.sync({
+                monitor_id: (next_check_at.timestamp(), interval or 60)
+                for monitor_id, next_check_at, interval in _load_active(session)
+            })
+            _synced_at = time.monotonic()
+    else:
+        # Another replica leads: sync immediately if this one takes over later.
+        _synced_at = None
+
+    return [
+        (monitor_id, datetime.fromtimestamp(next_due, timezone.utc))
+        for monitor_id, next_due in queue.claim_due(now.timestamp(), settings.SCHEDULER_CLAIM_LIMIT)
+    ]
+
+
+@celery.task
+def schedule_monitoring():
+    now = datetime.now(timezone.utc)
+
+    with sync_session_maker() as session:
+        if settings.SCHEDULER_BACKEND == "redis":
+            claimed = _claim_from_redis(session, now)
+        else:
+            claimed = _claim_from_memory(session, now)
+
+        if not claimed:
+            return
 
-            if time_passed > interval * 10:
-                logger.info(f"Updating the time of last check (was: {last_check})")
-                last_history.checked_at = now - timedelta(seconds=interval - 1)
-                session.commit()
-                session.refresh(last_history)
-                logger.info(f"Now: {last_history.checked_at}")
-                check_monitor.delay(monitor.id)
-            elif time_passed >= interval:
-                logger.info(f'Monitor {monitor.name} send to check')
-                check_monitor.delay(monitor.id)
+        session.execute(update(Monitor), [
+            {"id": monitor_id, "next_check_at": next_check_at} for monitor_id, next_check_at in claimed
+        ])
+        session.commit()
 
+    due = [monitor_id for monitor_id, _ in claimed]
+    logger.info(f"{len(due)} monitors send to check")
+    dispatch_checks(due)
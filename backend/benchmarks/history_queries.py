@@ -0,0 +1,144 @@
+"""
+Query-plan benchmark for the monitor history hot queries.
+
+Seeds a local database with synthetic checks and prints EXPLAIN ANALYZE timings of the
+history / problem-history queries without and with the indexes from the "history indexes" migration.
+The "without" run drops the indexes inside a transaction that is rolled back, so the schema is left intact.
+
+Run against a disposable database (migrated to head):
+
+    python -m backend.benchmarks.history_queries --rows 5000000 --monitors 500
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from backend.app.core.database import sync_engine
+from backend.app.services.partitions import aligned_start, create_partition
+
+INDEXES = (
+    "ix_monitor_history_monitor_id_checked_at",
+    "ix_monitor_history_failures",
+    "ix_problem_monitor_id",
+    "ix_problem_history_id",
+)
+
+QUERIES = {
+    "history": """
+        SELECT * FROM monitor_history
+        WHERE monitor_id = :monitor_id
+        ORDER BY checked_at DESC
+        LIMIT 10
+    """,
+    "problem_history": """
+        SELECT * FROM monitor_history
+        WHERE monitor_id = :monitor_id AND error_message IS NOT NULL
+        ORDER BY checked_at DESC
+        LIMIT 10
+    """,
+    "problems_of_monitor": """
+        SELECT * FROM problem
+        WHERE monitor_id = :monitor_id
+        ORDER BY id DESC
+        LIMIT 10
+    """,
+    "problem_of_check": """
+        SELECT * FROM problem
+        WHERE history_id = (SELECT max(history_id) FROM problem WHERE monitor_id = :monitor_id)
+    """,
+}
+
+
+def seed(connection, rows: int, monitors: int, days: int, failure_rate: float) -> list[int]:
+    owner_id = connection.execute(text(
+        "INSERT INTO users (email, hashed_password) "
+        "VALUES ('benchmark-' || gen_random_uuid() || '@example.com', 'x') RETURNING id"
+    )).scalar_one()
+    monitor_ids = connection.execute(text(
+        "INSERT INTO monitors (url, name, expected_status_code, check_interval, is_active, owner_id) "
+        "SELECT 'http://bench-' || g || '.example.com', 'bench ' || g, 200, 60, false, :owner_id "
+        "FROM generate_series(1, :monitors) g RETURNING id"
+    ), {"owner_id": owner_id, "monitors": monitors}).scalars().all()
+
+    now = datetime.now(timezone.utc)
+    start = aligned_start(now - timedelta(days=days), 1)
+    while start <= now:
+        create_partition(connection, start, start + timedelta(days=1))
+        start += timedelta(days=1)
+
+    # Rows are spread evenly over the window, monitors interleaved like the real check stream.
+    connection.execute(text(
+        """
+        INSERT INTO monitor_history (monitor_id, status, status_code, latency, error_message, checked_at)
+        SELECT
+            (:first_id + g % :monitors),
+            CASE WHEN failed THEN 'down' ELSE 'healthy' END,
+            CASE WHEN failed THEN 503 ELSE 200 END,
+            CASE WHEN failed THEN NULL ELSE 20 + random() * 400 END,
+            CASE WHEN failed THEN 'HTTP 503' ELSE NULL END,
+            now() - (:rows - g) * (CAST(:days AS int) * interval '1 day' / :rows)
+        FROM (SELECT g, random() < :failure_rate AS failed FROM generate_series(1, :rows) g) s
+        """
+    ), {"first_id": monitor_ids[0], "monitors": monitors, "rows": rows, "days": days, "failure_rate": failure_rate})
+    connection.execute(text(
+        "INSERT INTO problem (monitor_id, history_id) "
+        "SELECT monitor_id, id FROM monitor_history "
+        "WHERE error_message IS NOT NULL AND monitor_id = ANY(:ids)"
+    ), {"ids": monitor_ids})
+    connection.execute(text("ANALYZE monitor_history"))
+    connection.execute(text("ANALYZE problem"))
+    return monitor_ids
+
+
+def explain(connection, monitor_ids: list[int], repeat: int) -> dict[str, float]:
+    """
+    Median execution time (ms) per query, sampled over different monitors.
+    """
+    timings = {}
+    for name, query in QUERIES.items():
+        samples = []
+        for i in range(repeat):
+            plan = connection.execute(
+                text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}"),
+                {"monitor_id": monitor_ids[i * 7919 % len(monitor_ids)]},
+            ).scalar_one()
+            plan = plan if isinstance(plan, list) else json.loads(plan)
+            samples.append(plan[0]["Execution Time"])
+        timings[name] = sorted(samples)[len(samples) // 2]
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--monitors", type=int, default=200)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    with sync_engine.begin() as connection:
+        started = time.perf_counter()
+        monitor_ids = seed(connection, args.rows, args.monitors, args.days, args.failure_rate)
+        print(f"seeded {args.rows} checks for {args.monitors} monitors in {time.perf_counter() - started:.1f}s")
+
+    with sync_engine.connect() as connection:
+        with connection.begin() as transaction:
+            for index in INDEXES:
+                connection.execute(text(f"DROP INDEX IF EXISTS {index}"))
+            before = explain(connection, monitor_ids, args.repeat)
+            transaction.rollback()
+
+        after = explain(connection, monitor_ids, args.repeat)
+
+    print(f"{'query':<22}{'no indexes, ms':>16}{'indexes, ms':>14}{'speedup':>10}")
+    for name in QUERIES:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<22}{before[name]:>16.3f}{after[name]:>14.3f}{speedup:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Serialization benchmark of the history endpoints.
+
+Seeds a throwaway SQLite database with one monitor's checks and reports rows/sec of one history page,
+fetched and encoded the old way (ORM objects -> dicts with isoformat() -> jsonable_encoder -> json)
+and the new way (column rows -> orjson), plus the cost and size of brotli / gzip on the encoded page.
+
+    python -m backend.benchmarks.history_serialization --rows 10000 --repeat 20
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import brotli
+import orjson
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.app.core.config import settings
+from backend.app.core.database import Base
+from backend.app.models import Monitor, MonitorHistory, User
+from backend.app.services.monitor_services import HISTORY_COLUMNS
+
+
+def old_row(record: MonitorHistory) -> dict:
+    return {
+        "id": record.id,
+        "status": record.status,
+        "status_code": record.status_code,
+        "latency": record.latency,
+        "dns_ms": record.dns_ms,
+        "connect_ms": record.connect_ms,
+        "tls_ms": record.tls_ms,
+        "ttfb_ms": record.ttfb_ms,
+        "body_ms": record.body_ms,
+        "error_message": record.error_message,
+        "checked_at": record.checked_at.isoformat(),
+    }
+
+
+async def old_page(session, limit: int) -> bytes:
+    result = await session.execute(select(MonitorHistory).order_by(MonitorHistory.checked_at.desc()).limit(limit))
+    content = {"monitor_id": 1, "history": [old_row(record) for record in result.scalars().all()]}
+    return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+
+
+async def new_page(session, limit: int) -> bytes:
+    result = await session.execute(select(*HISTORY_COLUMNS).order_by(MonitorHistory.checked_at.desc()).limit(limit))
+    return orjson.dumps({"monitor_id": 1, "history": [row._asdict() for row in result.all()]})
+
+
+async def seed(session_maker, rows: int):
+    started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    async with session_maker() as session:
+        user = User(email="benchmark@example.com", hashed_password="x")
+        monitor = Monitor(url="https://example.com", name="benchmark", owner=user)
+        session.add_all([user, monitor])
+        await session.flush()
+        await session.execute(insert(MonitorHistory), [
+            {
+                "monitor_id": monitor.id,
+                "status": "healthy" if i % 50 else "down",
+                "status_code": 200 if i % 50 else None,
+                "latency": 120.5 + i % 40,
+                "dns_ms": 1.2, "connect_ms": 10.4, "tls_ms": 22.1, "ttfb_ms": 80.3, "body_ms": 6.5,
+                "error_message": None if i % 50 else "Connection refused",
+                "checked_at": started + timedelta(seconds=30 * i),
+            }
+            for i in range(rows)
+        ])
+        await session.commit()
+
+
+async def timed(fn, repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = await fn()
+    return result, (time.perf_counter() - started) / repeat
+
+
+async def main(rows: int, repeat: int):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(directory) / 'benchmark.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        await seed(session_maker, rows)
+
+        results = {}
+        async with session_maker() as session:
+            for name, page in (("orm+json", old_page), ("columns+orjson", new_page)):
+                body, seconds = await timed(lambda: page(session, rows), repeat)
+                session.expunge_all()
+                results[name] = {"ms": round(seconds * 1000, 1), "rows_per_s": int(rows / seconds), "bytes": len(body)}
+
+        for name, compress in (
+                (f"brotli q{settings.BROTLI_QUALITY}", lambda: brotli.compress(body, quality=settings.BROTLI_QUALITY)),
+                (f"gzip {settings.GZIP_LEVEL}", lambda: gzip.compress(body, compresslevel=settings.GZIP_LEVEL)),
+        ):
+            started = time.perf_counter()
+            compressed = compress()
+            results[name] = {"ms": round((time.perf_counter() - started) * 1000, 1), "bytes": len(compressed)}
+
+        await engine.dispose()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="rows seeded and fetched per page")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,103 @@
+"""
+Latency benchmark of the API under concurrent login load.
+
+Runs the app in process (one event loop, like one uvicorn worker) on a throwaway SQLite database.
+While `--logins` clients log in back to back, another client polls GET /monitors/ and records its latency.
+The "inline" run verifies passwords on the event loop (as before the bcrypt pool),
+the "pool" run uses auth.utils.verify_password.
+
+    python -m backend.benchmarks.password_hashing --logins 8 --seconds 10
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.app.auth import utils
+from backend.app.auth.user_cache import user_cache
+from backend.app.core.database import Base, get_async_session
+from backend.app.main import app
+from backend.app.services import auth_services
+
+USER = {"email": "benchmark@example.com", "password": "benchmark-password", "full_name": "Benchmark"}
+
+
+async def verify_inline(plain_password: str, hashed_password: str) -> bool:
+    return utils.pwd_context.verify(plain_password, hashed_password)
+
+
+def percentile(values: list[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * share), len(ordered) - 1)]
+
+
+async def run(client: AsyncClient, headers: dict, logins: int, seconds: float) -> dict:
+    deadline = time.perf_counter() + seconds
+    latencies, login_count = [], 0
+
+    async def login_loop():
+        nonlocal login_count
+        while time.perf_counter() < deadline:
+            response = await client.post("/auth/login/", json={"email": USER["email"], "password": USER["password"]})
+            response.raise_for_status()
+            login_count += 1
+
+    async def poll_loop():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            (await client.get("/monitors/", headers=headers)).raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(poll_loop(), *(login_loop() for _ in range(logins)))
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p99_ms": round(percentile(latencies, 0.99), 1),
+        "max_ms": round(max(latencies), 1),
+        "logins_per_s": round(login_count / seconds, 1),
+    }
+
+
+async def main(logins: int, seconds: float):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(directory) / 'benchmark.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def get_session():
+            async with session_maker() as session:
+                yield session
+
+        app.dependency_overrides[get_async_session] = get_session
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark") as client:
+                tokens = (await client.post("/auth/register/", json=USER)).json()
+                headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+                user_cache.clear()
+
+                results = {}
+                for mode, verify in (("inline", verify_inline), ("pool", utils.verify_password)):
+                    auth_services.verify_password = verify
+                    results[mode] = await run(client, headers, logins, seconds)
+                auth_services.verify_password = utils.verify_password
+        finally:
+            app.dependency_overrides.clear()
+            await engine.dispose()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=8, help="concurrent login clients")
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.seconds))
@@ -1,8 +1,11 @@
 import asyncio
+from datetime import datetime, timedelta, timezone
 
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import create_engine
+from starlette import status
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
@@ -54,3 +57,50 @@ async def client(async_session):
         yield ac
 
     app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture
+def user_data():
+    return {
+        "email": "test@gmail.com",
+        "password": "secret123",
+        "full_name": "Test User"
+    }
+
+
+@pytest_asyncio.fixture
+async def authenticated_client(client, user_data):
+    await client.post("/auth/register/", json=user_data)
+
+    user_login_data = {'email': user_data['email'], "password": user_data['password']}
+
+    response = await client.post("/auth/login/", json=user_login_data)
+    assert response.status_code == status.HTTP_200_OK
+
+    access_token = response.json().get('access_token')
+    client.headers.update({"Authorization": f"Bearer {access_token}"})
+    return client
+
+
+@pytest.fixture
+def session_maker(tmp_path):
+    """Synchronous sessions on a fresh SQLite database, for the Celery-side code (history sink and its hooks)."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def check():
+    """Builds a history row for ``monitor_id`` ``minute`` minutes into 2026, failing with an HTTP 500 if ``failed``."""
+    def build(monitor_id: int, minute: int, failed: bool) -> dict:
+        return {
+            "monitor_id": monitor_id,
+            "status": "down" if failed else "healthy",
+            "status_code": 500 if failed else 200,
+            "latency": 10.0 + minute,
+            "error_message": "HTTP 500" if failed else None,
+            "checked_at": datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=minute),
+        }
+    return build
@@ -0,0 +1,106 @@
+import socket
+
+import fakeredis
+import pytest
+from aiosmtpd.controller import Controller
+
+from backend.app.services.mailer import SMTPMailer
+from backend.app.tasks import alerts
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.sessions.add(id(session))
+        self.messages.append(envelope.content.decode())
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield handler, controller.port
+    controller.stop()
+
+
+def alert(name: str) -> dict:
+    return {
+        "user_email": "owner@gmail.com",
+        "monitor_name": name,
+        "monitor_user_name": "Owner",
+        "monitor_url": f"http://{name}.com",
+        "monitor_status": 503,
+        "ai_recommendations": "Restart the upstream",
+        "monitor_check_interval": 30,
+    }
+
+
+def test_mailer_reuses_one_connection(smtp_server):
+    handler, port = smtp_server
+    mailer = SMTPMailer(host="127.0.0.1", port=port, username=None, use_tls=False)
+
+    for i in range(3):
+        mailer.send(alerts.build_alert_message("owner@gmail.com", [alert(f"site-{i}")]))
+    mailer.close()
+
+    assert len(handler.messages) == 3
+    assert len(handler.sessions) == 1
+
+
+def test_mailer_reconnects_after_max_messages(smtp_server):
+    handler, port = smtp_server
+    mailer = SMTPMailer(host="127.0.0.1", port=port, username=None, use_tls=False, max_messages=2)
+
+    for i in range(3):
+        mailer.send(alerts.build_alert_message("owner@gmail.com", [alert(f"site-{i}")]))
+    mailer.close()
+
+    assert len(handler.sessions) == 2
+
+
+def test_digest_merges_alerts_for_one_recipient(smtp_server, monkeypatch):
+    handler, port = smtp_server
+    scheduled = []
+    monkeypatch.setattr(alerts.settings, "ALERT_DIGEST_SECONDS", 30)
+    monkeypatch.setattr(alerts, "sync_redis_client", fakeredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(alerts, "mailer", SMTPMailer(host="127.0.0.1", port=port, username=None, use_tls=False))
+    monkeypatch.setattr(alerts.send_alert_digest, "apply_async", lambda args, countdown: scheduled.append(args))
+
+    for name in ("api", "web", "cdn"):
+        alerts.send_alert_email(**alert(name))
+
+    assert scheduled == [["owner@gmail.com"]]
+    assert handler.messages == []
+
+    alerts.send_alert_digest("owner@gmail.com")
+    alerts.mailer.close()
+
+    assert len(handler.messages) == 1
+    assert "3 monitors caught on change status" in handler.messages[0]
+    assert all(f"http://{name}.com" in handler.messages[0] for name in ("api", "web", "cdn"))
+
+
+def test_digest_ttl_is_not_extended_by_later_alerts(monkeypatch):
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(alerts.settings, "ALERT_DIGEST_SECONDS", 30)
+    monkeypatch.setattr(alerts, "sync_redis_client", redis)
+    monkeypatch.setattr(alerts.send_alert_digest, "apply_async", lambda args, countdown: None)
+    key = alerts.DIGEST_KEY.format(email="owner@gmail.com")
+
+    alerts.send_alert_email(**alert("api"))
+    assert redis.ttl(key) == 300
+
+    redis.expire(key, 5)
+    alerts.send_alert_email(**alert("web"))
+
+    assert redis.llen(key) == 2
+    assert redis.ttl(key) <= 5
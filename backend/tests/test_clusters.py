@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from backend.app.models import Monitor, Problem, ProblemCluster, User
+from backend.app.services.clusters import ANALYZED, CREATED, PENDING, cluster_problems
+from backend.app.services.history_sink import BufferedCheck, HistorySink
+from backend.app.services.incidents import OPENED, track_incidents
+from backend.app.tasks import enrichment
+
+
+@pytest.fixture
+def monitors(session_maker):
+    with session_maker() as session:
+        user = User(email="owner@gmail.com", hashed_password="x", full_name="Owner")
+        monitors = [
+            Monitor(url=f"https://app{i}.shared-host.com/health", name=f"app{i}", owner=user, check_interval=30)
+            for i in range(4)
+        ]
+        session.add_all([user, *monitors])
+        session.commit()
+    return monitors
+
+
+def sink_for(session_maker):
+    sink = HistorySink(session_maker=session_maker, max_rows=1000, max_delay_ms=60_000)
+    sink.on_flush(track_incidents)
+    sink.on_flush(cluster_problems)
+    return sink
+
+
+def fail(sink, monitor, minute, error="[Errno 111] Connection refused", remote_ip="203.0.113.7"):
+    return sink.add(
+        {
+            "monitor_id": monitor.id,
+            "status": "down",
+            "error_message": error,
+            "checked_at": datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=minute),
+        },
+        meta={"url": monitor.url, "remote_ip": remote_ip, "owner_id": monitor.owner_id},
+    )
+
+
+def test_shared_outage_forms_one_cluster(session_maker, monitors):
+    sink = sink_for(session_maker)
+    first, second, third = (fail(sink, monitor, minute) for monitor, minute in zip(monitors, (0, 1, 2)))
+    other_error = fail(sink, monitors[3], 2, error="Unexpected status code: 503")
+    sink.flush()
+
+    assert (first.cluster_state, second.cluster_state, third.cluster_state) == (CREATED, PENDING, PENDING)
+    assert first.cluster_id == second.cluster_id == third.cluster_id
+    assert other_error.cluster_state == CREATED and other_error.cluster_id != first.cluster_id
+
+    with session_maker() as session:
+        cluster = session.get(ProblemCluster, first.cluster_id)
+        assert cluster.problem_count == 3
+        assert cluster.url == monitors[0].url
+        problems = session.scalars(select(Problem).where(Problem.cluster_id == cluster.id)).all()
+        assert len(problems) == 3
+
+
+def test_clusters_do_not_cross_owners_or_virtual_hosts(session_maker, monitors):
+    with session_maker() as session:
+        stranger = User(email="stranger@gmail.com", hashed_password="x", full_name="Stranger")
+        foreign = Monitor(url="https://other.shared-host.com/", name="other", owner=stranger, check_interval=30)
+        session.add_all([stranger, foreign])
+        session.commit()
+
+    sink = sink_for(session_maker)
+    refused = fail(sink, monitors[0], 0)
+    foreign_refused = fail(sink, foreign, 0)
+    server_error = fail(sink, monitors[1], 0, error="Unexpected status code: 503")
+    other_host_error = fail(sink, monitors[2], 0, error="Unexpected status code: 503")
+    sink.flush()
+
+    assert foreign_refused.cluster_id != refused.cluster_id
+    assert other_host_error.cluster_id != server_error.cluster_id
+    assert len({refused.cluster_id, foreign_refused.cluster_id, server_error.cluster_id,
+                other_host_error.cluster_id}) == 4
+
+
+def test_late_failures_join_an_analyzed_cluster_or_open_a_new_one(session_maker, monitors):
+    sink = sink_for(session_maker)
+    first = fail(sink, monitors[0], 0)
+    sink.flush()
+    with session_maker() as session:
+        cluster = session.get(ProblemCluster, first.cluster_id)
+        cluster.ai_analysis, cluster.ai_recommendations = "host is down", "fail over"
+        cluster.analyzed_at = datetime.now(timezone.utc)
+        session.commit()
+
+    joined = fail(sink, monitors[1], 4)
+    too_late = fail(sink, monitors[2], 10)
+    sink.flush()
+
+    assert joined.cluster_state == ANALYZED and joined.cluster_id == first.cluster_id
+    assert too_late.cluster_state == CREATED and too_late.cluster_id != first.cluster_id
+    with session_maker() as session:
+        assert session.get(Problem, joined.problem_id).ai_recommendations == "fail over"
+
+
+@pytest.mark.asyncio
+async def test_cluster_is_analyzed_once_for_all_problems(session_maker, monitors):
+    sink = sink_for(session_maker)
+    checks = [fail(sink, monitor, 0) for monitor in monitors[:3]]
+    sink.flush()
+    cluster_id = checks[0].cluster_id
+
+    analyze = AsyncMock(return_value=("shared host is down", "wait for the provider"))
+    send_alert = MagicMock()
+    with patch.object(enrichment, "sync_session_maker", session_maker), \
+            patch.object(enrichment, "duckduckgo_search", AsyncMock(return_value=[{"title": "outage"}])), \
+            patch.object(enrichment, "ai_analyze_issue", analyze), \
+            patch.object(enrichment.send_alert_email, "delay", send_alert):
+        result = await enrichment._enrich_cluster_async(cluster_id)
+        await enrichment._enrich_cluster_async(cluster_id)  # redelivery is a no-op
+
+    assert result == {"cluster_id": cluster_id, "problems": 3}
+    analyze.assert_awaited_once()
+    assert send_alert.call_count == 3
+    with session_maker() as session:
+        problems = session.scalars(select(Problem).where(Problem.cluster_id == cluster_id)).all()
+        assert {problem.ai_analysis for problem in problems} == {"shared host is down"}
+
+
+def test_dispatch_enriches_once_per_cluster():
+    def opened(problem_id, cluster_id=None, cluster_state=None):
+        return BufferedCheck(
+            history={"status": "down"}, transition=OPENED, problem_id=problem_id,
+            cluster_id=cluster_id, cluster_state=cluster_state,
+        )
+
+    checks = [opened(1), opened(2, 10, CREATED), opened(3, 10, PENDING), opened(4, 11, ANALYZED)]
+    with patch.object(enrichment.enrich_problem, "apply_async") as enrich_problem, \
+            patch.object(enrichment.enrich_cluster, "apply_async") as enrich_cluster, \
+            patch.object(enrichment.notify_problem, "delay") as notify:
+        enrichment.dispatch_incident_jobs(checks)
+
+    assert enrich_problem.call_args.kwargs["args"] == [1]
+    enrich_cluster.assert_called_once()
+    assert enrich_cluster.call_args.kwargs["args"] == [10]
+    notify.assert_called_once_with(4)
@@ -0,0 +1,52 @@
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from httpx import ASGITransport, AsyncClient
+
+from backend.app.api.compression import CompressionMiddleware, accepted_encodings
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+
+@app.get("/big")
+async def big():
+    return ORJSONResponse({"history": [{"id": i, "status": "healthy"} for i in range(100)]})
+
+
+@app.get("/small")
+async def small():
+    return {"ok": True}
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, deflate, br;q=0.5") == {"gzip", "deflate", "br"}
+    assert accepted_encodings("br;q=0, gzip") == {"gzip"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("accept, encoding, decompress", [
+    ("gzip, deflate, br", "br", brotli.decompress),
+    ("gzip", "gzip", gzip.decompress),
+    ("identity", None, lambda body: body),
+])
+async def test_large_responses_are_compressed(accept, encoding, decompress):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        # httpx would decode the body itself; read the raw bytes instead
+        async with client.stream("GET", "/big", headers={"Accept-Encoding": accept}) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+
+    assert response.headers.get("content-encoding") == encoding
+    assert decompress(raw).startswith(b'{"history":[{"id":0,"status":"healthy"}')
+
+
+@pytest.mark.asyncio
+async def test_small_responses_are_sent_as_is():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/small", headers={"Accept-Encoding": "br"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"ok": True}
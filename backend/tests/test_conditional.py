@@ -0,0 +1,108 @@
+from datetime import datetime, timezone
+
+import fakeredis
+import pytest
+import pytest_asyncio
+
+from backend.app.api import conditional
+from backend.app.api.conditional import etag_matches
+from backend.app.core.config import settings
+from backend.app.models import MonitorHistory
+from backend.app.services import versions as versions_module
+from backend.app.services.history_sink import BufferedCheck
+from backend.app.services.monitor_services import HistoryCRUD
+from backend.app.services.versions import EPOCH_KEY, VersionStore, bump_checked_monitors
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    server = fakeredis.FakeServer()
+    redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    store = VersionStore(redis, fakeredis.FakeRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(versions_module, "versions", store)
+    monkeypatch.setattr(conditional, "versions", store)
+    monkeypatch.setattr("backend.app.api.routers.monitor_router.versions", store)
+    monkeypatch.setattr(conditional, "redis_client", redis)
+    return redis
+
+
+@pytest_asyncio.fixture
+async def monitor_id(authenticated_client, async_session, redis):
+    response = await authenticated_client.post("/monitors/", json={"url": "http://etag.com", "name": "etag"})
+    monitor_id = response.json()["id"]
+    async_session.add(MonitorHistory(
+        monitor_id=monitor_id, status="healthy", status_code=200, checked_at=datetime.now(timezone.utc),
+    ))
+    await async_session.commit()
+    return monitor_id
+
+
+@pytest.fixture
+def history_queries(monkeypatch):
+    calls = []
+    get_history = HistoryCRUD.get_history
+
+    async def counting(**kwargs):
+        calls.append(kwargs)
+        return await get_history(**kwargs)
+
+    monkeypatch.setattr(HistoryCRUD, "get_history", counting)
+    return calls
+
+
+def test_etag_matching():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc", "other"', '"abc"')
+    assert etag_matches('"abc-br"', '"abc"')  # compressed variant of the same representation
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+@pytest.mark.asyncio
+async def test_unchanged_history_is_answered_with_304(client, monitor_id, history_queries):
+    url = f"/monitors/{monitor_id}/history/"
+    first = await client.get(url)
+    etag = first.headers["etag"]
+
+    unchanged = await client.get(url, headers={"If-None-Match": etag})
+    other_page = await client.get(url, params={"limit": 5}, headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert unchanged.status_code == 304 and unchanged.headers["etag"] == etag
+    assert other_page.status_code == 200  # the query is part of the ETag
+    assert len(history_queries) == 2  # the 304 never reached the database
+
+    bump_checked_monitors([BufferedCheck(history={"monitor_id": monitor_id})])
+    changed = await client.get(url, headers={"If-None-Match": etag})
+
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_monitor_list_changes_when_monitors_are_created(client, monitor_id, redis):
+    etag = (await client.get("/monitors/")).headers["etag"]
+    assert (await client.get("/monitors/", headers={"If-None-Match": etag})).status_code == 304
+
+    await client.post("/monitors/", json={"url": "http://etag-two.com", "name": "etag two"})
+    assert (await client.get("/monitors/", headers={"If-None-Match": etag})).status_code == 200
+
+    await redis.delete(EPOCH_KEY)  # Redis lost its counters: earlier ETags must not match
+    fresh = (await client.get("/monitors/")).headers["etag"]
+    await redis.delete(EPOCH_KEY)
+    assert (await client.get("/monitors/", headers={"If-None-Match": fresh})).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_response_cache_serves_other_workers(client, monitor_id, history_queries, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_SECONDS", 30)
+    url = f"/monitors/{monitor_id}/history/"
+
+    first = await client.get(url)
+    second = await client.get(url)
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["content-type"] == "application/json"
+    assert len(history_queries) == 1
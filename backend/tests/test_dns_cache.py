@@ -0,0 +1,121 @@
+import asyncio
+
+import httpcore
+import pytest
+
+from backend.app.services.dns_cache import DNSCache, DNSCachingBackend
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_cache_respects_record_ttl():
+    clock = FakeClock()
+    lookups = []
+
+    async def lookup(host):
+        lookups.append(host)
+        return ["10.0.0.1"], 30
+
+    cache = DNSCache(lookup=lookup, min_ttl=1, max_ttl=300, clock=clock)
+
+    assert await cache.resolve("api.test") == "10.0.0.1"
+    clock.now = 29
+    assert await cache.resolve("api.test") == "10.0.0.1"
+    assert len(lookups) == 1
+
+    clock.now = 31
+    await cache.resolve("api.test")
+    assert len(lookups) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_of_one_host_are_shared():
+    lookups = []
+
+    async def lookup(host):
+        lookups.append(host)
+        await asyncio.sleep(0.01)
+        return ["10.0.0.2"], 60
+
+    cache = DNSCache(lookup=lookup)
+
+    results = await asyncio.gather(*(cache.resolve("api.test") for _ in range(20)))
+
+    assert set(results) == {"10.0.0.2"}
+    assert len(lookups) == 1
+
+
+@pytest.mark.asyncio
+async def test_ip_literals_skip_lookup():
+    async def lookup(host):
+        raise AssertionError("must not be called")
+
+    cache = DNSCache(lookup=lookup)
+
+    assert await cache.resolve("127.0.0.1") == "127.0.0.1"
+
+
+@pytest.mark.asyncio
+async def test_backend_connects_to_cached_address():
+    connected = []
+
+    class RecordingBackend:
+        async def connect_tcp(self, host, port, **kwargs):
+            connected.append((host, port))
+            return "stream"
+
+    async def lookup(host):
+        return ["10.0.0.3"], 60
+
+    backend = DNSCachingBackend(DNSCache(lookup=lookup), backend=RecordingBackend())
+
+    assert await backend.connect_tcp("api.test", 443, timeout=1) == "stream"
+    assert connected == [("10.0.0.3", 443)]
+
+
+@pytest.mark.asyncio
+async def test_timed_out_probe_does_not_cancel_shared_lookup():
+    class RecordingBackend:
+        async def connect_tcp(self, host, port, **kwargs):
+            return host
+
+    async def lookup(host):
+        await asyncio.sleep(0.05)
+        return ["10.0.0.4"], 60
+
+    backend = DNSCachingBackend(DNSCache(lookup=lookup), backend=RecordingBackend())
+
+    impatient, patient = await asyncio.gather(
+        backend.connect_tcp("slow.test", 443, timeout=0.01),
+        backend.connect_tcp("slow.test", 443, timeout=1),
+        return_exceptions=True,
+    )
+
+    assert isinstance(impatient, httpcore.ConnectTimeout)
+    assert patient == "10.0.0.4"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_shared_lookup_is_a_connect_error():
+    started = asyncio.Event()
+
+    async def lookup(host):
+        started.set()
+        await asyncio.sleep(1)
+        return ["10.0.0.5"], 60
+
+    cache = DNSCache(lookup=lookup)
+    backend = DNSCachingBackend(cache)
+    probe = asyncio.create_task(backend.connect_tcp("gone.test", 443, timeout=1))
+    await started.wait()
+    cache._pending["gone.test"].cancel()
+
+    with pytest.raises(httpcore.ConnectError):
+        await probe
@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.app.models import Monitor, MonitorHistory, Problem, User
+from backend.app.services.history_sink import BufferedCheck
+from backend.app.services.incidents import OPENED, RESOLVED
+from backend.app.tasks import enrichment
+
+
+def test_dispatch_queues_jobs_only_for_transitions():
+    opened = BufferedCheck(history={"status": "down"}, transition=OPENED, problem_id=7)
+    attached = BufferedCheck(history={"status": "down"}, problem_id=None, incident_id=3)
+    resolved = BufferedCheck(history={"status": "healthy"}, transition=RESOLVED, incident_id=3)
+
+    with patch.object(enrichment.enrich_problem, "apply_async") as enrich, \
+            patch.object(enrichment.notify_incident_resolved, "delay") as notify:
+        enrichment.dispatch_incident_jobs([opened, attached, resolved])
+
+    enrich.assert_called_once()
+    assert enrich.call_args.kwargs["args"] == [7]
+    notify.assert_called_once_with(3)
+
+
+@pytest.mark.asyncio
+async def test_enrich_problem_fills_analysis_and_alerts(session_maker):
+    with session_maker() as session:
+        user = User(email="owner@gmail.com", hashed_password="x", full_name="Owner")
+        monitor = Monitor(url="http://down.com", name="down", owner=user, check_interval=30)
+        history = MonitorHistory(
+            monitor=monitor, status="down", error_message="Connection refused",
+            checked_at=datetime.now(timezone.utc),
+        )
+        session.add_all([user, monitor, history])
+        session.flush()
+        problem = Problem(monitor_id=monitor.id, history_id=history.id)
+        session.add(problem)
+        session.commit()
+
+    send_alert = MagicMock()
+    with patch.object(enrichment, "sync_session_maker", session_maker), \
+            patch.object(enrichment, "duckduckgo_search", AsyncMock(return_value=[{"title": "outage"}])), \
+            patch.object(enrichment, "ai_analyze_issue", AsyncMock(return_value=("analysis", "restart it"))), \
+            patch.object(enrichment.send_alert_email, "delay", send_alert):
+        await enrichment._enrich_problem_async(problem.id)
+        await enrichment._enrich_problem_async(problem.id)  # redelivery is a no-op
+
+    with session_maker() as session:
+        enriched = session.get(Problem, problem.id)
+        assert enriched.ai_analysis == "analysis"
+        assert enriched.ai_recommendations == "restart it"
+        assert enriched.duckduckgo_search_data == [{"title": "outage"}]
+
+    send_alert.assert_called_once()
+    assert send_alert.call_args.kwargs["user_email"] == "owner@gmail.com"
@@ -0,0 +1,76 @@
+import fakeredis
+import pytest
+
+from backend.app.services.single_flight import SingleFlight
+from backend.app.services.utils.cache import TTLCache, prompt_cache_key
+from backend.app.services.utils.fingerprint import classify, fingerprint
+
+
+@pytest.mark.parametrize("error, expected", [
+    ("Unexpected status code: 503", "http_5xx"),
+    ("Unexpected status code: 404", "http_4xx"),
+    ("[Errno -2] Name or service not known", "dns"),
+    ("[Errno 111] Connect call failed ('10.0.0.12', 8080)", "connect_refused"),
+    ("All connection attempts failed", "connect_refused"),
+    ("[SSL: CERTIFICATE_VERIFY_FAILED] certificate verify failed", "tls"),
+    ("ReadTimeout: timed out after 10.5s", "timeout"),
+    ("Something odd", "other"),
+])
+def test_classify(error, expected):
+    assert classify(error) == expected
+
+
+@pytest.mark.parametrize("first, second", [
+    ("[Errno 111] Connect call failed ('10.0.0.12', 8080)", "[Errno 111] Connect call failed ('10.0.0.13', 9090)"),
+    ("timed out after 3s request_id=8f3a9c2d1e4b", "timed out after 12.5s request_id=1234abcd99ff"),
+    (
+        "2026-10-18T12:00:01Z upstream 7f9c0d2e-1111-2222-3333-444455556666 failed",
+        "2026-10-19 08:30:00 upstream 0a1b2c3d-aaaa-bbbb-cccc-ddddeeeeffff failed",
+    ),
+    ("failed to connect to [2001:db8::1]:443", "failed to connect to [2001:db8::2]:8443"),
+])
+def test_volatile_tokens_are_ignored(first, second):
+    assert fingerprint(first) == fingerprint(second)
+    assert prompt_cache_key("https://site.com", first) == prompt_cache_key("https://site.com", second)
+
+
+def test_meaningful_differences_are_kept():
+    assert fingerprint("Unexpected status code: 502") != fingerprint("Unexpected status code: 503")
+    assert fingerprint("Error A") != fingerprint("Error B")
+    assert prompt_cache_key("https://a.com", "Error A") != prompt_cache_key("https://b.com", "Error A")
+
+
+@pytest.mark.asyncio
+async def test_local_tier_answers_without_redis():
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    flight = SingleFlight(redis, local=TTLCache(max_size=10, ttl=60))
+    calls = 0
+
+    async def analyze():
+        nonlocal calls
+        calls += 1
+        return {"analysis": "certificate expired"}
+
+    for _ in range(3):
+        assert await flight.do("incident:1", analyze, ttl=60) == {"analysis": "certificate expired"}
+
+    await redis.aclose()  # the local tier must not touch Redis
+    assert await flight.do("incident:1", analyze, ttl=60) == {"analysis": "certificate expired"}
+
+    assert calls == 1
+    assert (flight.stats.local_hits, flight.stats.redis_hits, flight.stats.misses) == (3, 0, 1)
+    assert flight.stats.hit_ratio == 0.75
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_results_skip_the_local_tier():
+    flight = SingleFlight(fakeredis.FakeAsyncRedis(decode_responses=True), local=TTLCache(max_size=10, ttl=60))
+
+    async def failed():
+        return {"analysis": "AI timeout", "error": True}
+
+    for _ in range(2):
+        await flight.do("incident:2", failed, ttl=60, cache_if=lambda data: not data.get("error"))
+
+    assert flight.stats.misses == 2
+    assert flight.stats.local_hits == 0
@@ -0,0 +1,95 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from backend.app.models import Incident, MonitorHistory, Problem
+from backend.app.services.history_sink import HistorySink
+from backend.app.services.incidents import OPENED, track_incidents
+
+
+def history_row(monitor_id: int, status: str = "healthy") -> dict:
+    return {
+        "monitor_id": monitor_id,
+        "status": status,
+        "status_code": 200 if status == "healthy" else None,
+        "latency": 12.5,
+        "error_message": None if status == "healthy" else "Connection refused",
+        "checked_at": datetime.now(timezone.utc),
+    }
+
+
+def test_flushes_in_bulk_when_buffer_is_full(session_maker):
+    sink = HistorySink(session_maker=session_maker, max_rows=3, max_delay_ms=60_000)
+    flushed = []
+    sink.after_commit(flushed.append)
+
+    first = sink.add(history_row(1))
+    sink.add(history_row(2))
+    assert first.history_id is None
+
+    failed = sink.add(history_row(3, "down"), problem={"monitor_id": 3, "ai_analysis": "analysis"})
+
+    assert len(flushed) == 1
+    assert len(sink) == 0
+    assert first.history_id is not None
+    with session_maker() as session:
+        problem = session.get(Problem, failed.problem_id)
+        assert problem.history_id == failed.history_id
+        assert len(session.scalars(select(MonitorHistory)).all()) == 3
+
+
+def test_flushes_after_delay(session_maker):
+    sink = HistorySink(session_maker=session_maker, max_rows=1000, max_delay_ms=50)
+
+    check = sink.add(history_row(1))
+
+    deadline = time.monotonic() + 2
+    while check.history_id is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert check.history_id is not None
+
+
+def test_flush_hooks_run_inside_the_transaction(session_maker):
+    sink = HistorySink(session_maker=session_maker, max_rows=1000, max_delay_ms=60_000)
+    seen = []
+
+    @sink.on_flush
+    def hook(session, checks):
+        seen.extend(check.history_id for check in checks)
+
+    checks = [sink.add(history_row(monitor_id)) for monitor_id in range(5)]
+    sink.flush()
+
+    assert seen == [check.history_id for check in checks]
+
+
+def test_failed_flush_is_retried_without_stale_hook_results(session_maker):
+    sink = HistorySink(session_maker=session_maker, max_rows=1000, max_delay_ms=60_000)
+    sink.on_flush(track_incidents)
+    attempts = []
+
+    @sink.on_flush
+    def fail_once(session, checks):
+        attempts.append(len(checks))
+        if len(attempts) == 1:
+            raise RuntimeError("connection lost")
+
+    failed = sink.add(history_row(1, "down"), problem={"monitor_id": 1, "ai_analysis": "analysis"})
+    with pytest.raises(RuntimeError):
+        sink.flush()
+
+    assert len(sink) == 1
+    assert failed.transition is None and failed.incident_id is None and failed.history_id is None
+    assert failed.problem == {"monitor_id": 1, "ai_analysis": "analysis"}
+
+    sink.flush()
+
+    assert failed.transition == OPENED
+    with session_maker() as session:
+        incidents = session.scalars(select(Incident)).all()
+        assert [incident.id for incident in incidents] == [failed.incident_id]
+        problem = session.get(Problem, failed.problem_id)
+        assert problem.incident_id == failed.incident_id and problem.history_id == failed.history_id
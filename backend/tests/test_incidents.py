@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+from starlette import status
+
+from backend.app.models import Incident, Problem
+from backend.app.services.history_sink import HistorySink
+from backend.app.services.incidents import OPENED, RESOLVED, track_incidents
+
+
+def test_failures_attach_to_one_incident_until_recovery(session_maker, check):
+    sink = HistorySink(session_maker=session_maker, max_rows=1000, max_delay_ms=60_000)
+    sink.on_flush(track_incidents)
+
+    first = sink.add(check(1, 0, True), problem={"monitor_id": 1, "ai_analysis": "analysis"})
+    repeated = [sink.add(check(1, minute, True)) for minute in (1, 2)]
+    sink.flush()
+    recovery = sink.add(check(1, 3, False))
+    again = sink.add(check(1, 4, True))
+    sink.flush()
+
+    assert first.transition == OPENED
+    assert all(c.transition is None and c.incident_id == first.incident_id for c in repeated)
+    assert recovery.transition == RESOLVED
+    assert again.transition == OPENED and again.incident_id != first.incident_id
+
+    with session_maker() as session:
+        resolved = session.get(Incident, first.incident_id)
+        assert resolved.state == Incident.RESOLVED
+        assert resolved.failure_count == 3
+        assert resolved.resolved_history_id == recovery.history_id
+
+        problems = session.scalars(select(Problem).order_by(Problem.id)).all()
+        assert [p.incident_id for p in problems] == [first.incident_id, again.incident_id]
+        assert problems[0].ai_analysis == "analysis"
+
+
+@pytest.mark.asyncio
+async def test_acknowledge_incident(authenticated_client, async_session):
+    response = await authenticated_client.post("/monitors/", json={"url": "http://incident.com", "name": "incident"})
+    monitor_id = response.json()["id"]
+    opened_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    incident = Incident(monitor_id=monitor_id, state=Incident.OPEN, opened_at=opened_at, last_failure_at=opened_at)
+    async_session.add(incident)
+    await async_session.commit()
+
+    acknowledged = await authenticated_client.post(f"/monitors/{monitor_id}/incidents/{incident.id}/acknowledge/")
+    listed = await authenticated_client.get(f"/monitors/{monitor_id}/incidents/", params={"state": "acknowledged"})
+    missing = await authenticated_client.post(f"/monitors/{monitor_id}/incidents/{incident.id + 1000}/acknowledge/")
+
+    assert acknowledged.status_code == status.HTTP_200_OK
+    assert acknowledged.json()["state"] == "acknowledged"
+    assert [item["id"] for item in listed.json()] == [incident.id]
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.app.models import MonitorStatus
+from backend.app.services.history_sink import HistorySink
+from backend.app.services.incidents import track_incidents
+from backend.app.services.monitor_status import update_monitor_status
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def sink(session_maker):
+    sink = HistorySink(session_maker=session_maker, max_rows=1000, max_delay_ms=60_000)
+    sink.on_flush(track_incidents)
+    sink.on_flush(update_monitor_status)
+    return sink
+
+
+def _as_utc(moment: datetime) -> datetime:
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def test_status_follows_checks_across_flushes(sink, session_maker, check):
+    sink.add(check(1, 0, False))
+    sink.add(check(2, 0, False))
+    sink.flush()
+    sink.add(check(1, 1, False))
+    first_failure = sink.add(check(1, 2, True))
+    sink.add(check(1, 3, True))
+    sink.flush()
+
+    with session_maker() as session:
+        failing = session.get(MonitorStatus, 1)
+        assert failing.status == "down" and failing.status_code == 500 and failing.latency == 13.0
+        assert failing.consecutive_failures == 2
+        assert _as_utc(failing.last_change_at) == START + timedelta(minutes=2)
+        assert _as_utc(failing.checked_at) == START + timedelta(minutes=3)
+        assert failing.incident_id == first_failure.incident_id is not None
+
+        healthy = session.get(MonitorStatus, 2)
+        assert healthy.status == "healthy" and healthy.consecutive_failures == 0
+        assert _as_utc(healthy.last_change_at) == START
+
+    sink.add(check(1, 4, False))
+    sink.flush()
+
+    with session_maker() as session:
+        recovered = session.get(MonitorStatus, 1)
+        assert recovered.status == "healthy" and recovered.error_message is None
+        assert recovered.consecutive_failures == 0 and recovered.incident_id is None
+        assert _as_utc(recovered.last_change_at) == START + timedelta(minutes=4)
+
+
+@pytest.mark.asyncio
+async def test_status_endpoint_lists_all_monitors(authenticated_client, async_session):
+    checked = (
+        await authenticated_client.post("/monitors/", json={"url": "http://checked.com", "name": "checked"})
+    ).json()
+    new = (await authenticated_client.post("/monitors/", json={"url": "http://new.com", "name": "new"})).json()
+    async_session.add(MonitorStatus(
+        monitor_id=checked["id"], status="down", status_code=503, latency=12.5, error_message="HTTP 503",
+        checked_at=START, last_change_at=START, consecutive_failures=3,
+    ))
+    await async_session.commit()
+
+    response = await authenticated_client.get("/monitors/status/")
+
+    assert response.status_code == 200
+    statuses = {status["monitor_id"]: status for status in response.json()}
+    assert statuses[checked["id"]]["status"] == "down"
+    assert statuses[checked["id"]]["consecutive_failures"] == 3
+    assert statuses[new["id"]]["status"] is None and statuses[new["id"]]["consecutive_failures"] == 0
+    assert statuses[new["id"]]["url"] == "http://new.com"
@@ -1,31 +1,7 @@
 import pytest
-import pytest_asyncio
 from starlette import status
 
 
-@pytest_asyncio.fixture
-def user_data():
-    return {
-        "email": "test@gmail.com",
-        "password": "secret123",
-        "full_name": "Test User"
-    }
-
-
-@pytest_asyncio.fixture
-async def authenticated_client(client, user_data):
-    await client.post("/auth/register/", json=user_data)
-
-    user_login_data = {'email': 'test@gmail.com', "password": "secret123"}
-
-    response = await client.post("/auth/login/", json=user_login_data)
-    assert response.status_code == status.HTTP_200_OK
-
-    access_token = response.json().get('access_token')
-    client.headers.update({"Authorization": f"Bearer {access_token}"})
-    return client
-
-
 @pytest.mark.asyncio
 async def test_create_monitor(client, authenticated_client):
     payload = {
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from starlette import status
+
+from sqlalchemy import update
+
+from backend.app.models import Monitor, MonitorHistory
+from backend.app.services.utils.cursor import InvalidCursor, decode_cursor, encode_cursor
+
+
+@pytest_asyncio.fixture
+def user_data():
+    return {
+        "email": "paging@gmail.com",
+        "password": "secret123",
+        "full_name": "Paging User"
+    }
+
+
+def test_cursor_round_trip():
+    moment = datetime(2026, 1, 1, 12, 30, tzinfo=timezone.utc)
+
+    assert decode_cursor(encode_cursor(moment, 42)) == (moment, 42)
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_history_pages_with_cursors(authenticated_client, async_session):
+    response = await authenticated_client.post("/monitors/", json={"url": "http://paging.com", "name": "paging"})
+    monitor_id = response.json()["id"]
+
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    # two checks share a timestamp, the id breaks the tie
+    moments = [start + timedelta(minutes=i) for i in range(5)] + [start + timedelta(minutes=4)]
+    async_session.add_all([
+        MonitorHistory(
+            monitor_id=monitor_id,
+            status="down" if i % 2 else "healthy",
+            error_message="HTTP 500" if i % 2 else None,
+            checked_at=moment,
+        )
+        for i, moment in enumerate(moments)
+    ])
+    await async_session.commit()
+
+    url = f"/monitors/{monitor_id}/history/"
+    seen = []
+    page = (await authenticated_client.get(url, params={"limit": 4})).json()
+    seen += [record["id"] for record in page["history"]]
+    page = (await authenticated_client.get(url, params={"limit": 4, "before": page["next_cursor"]})).json()
+    seen += [record["id"] for record in page["history"]]
+
+    assert len(seen) == len(set(seen)) == 6
+    assert page["next_cursor"] is None
+
+    newer = (await authenticated_client.get(url, params={"limit": 4, "after": page["prev_cursor"]})).json()
+    assert [record["id"] for record in newer["history"]] == seen[:4]
+
+    window = await authenticated_client.get(
+        url, params={"since": "2026-01-01T00:01:00", "until": "2026-01-01T00:03:00"}
+    )
+    assert [record["checked_at"][:16] for record in window.json()["history"]] == [
+        "2026-01-01T00:02", "2026-01-01T00:01",
+    ]
+
+    problems = await authenticated_client.get(f"/monitors/{monitor_id}/problem_history/", params={"limit": 2})
+    assert problems.json()["problems_count"] == 2
+    assert problems.json()["next_cursor"] is not None
+
+    invalid = await authenticated_client.get(url, params={"before": "garbage"})
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_monitor_list_next_cursor_header(authenticated_client, async_session):
+    created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(3):
+        response = await authenticated_client.post(
+            "/monitors/", json={"url": f"http://list-{i}.com", "name": f"list-{i}"}
+        )
+        await async_session.execute(
+            update(Monitor).where(Monitor.id == response.json()["id"]).values(created_at=created + timedelta(hours=i))
+        )
+    await async_session.commit()
+
+    first = await authenticated_client.get("/monitors/", params={"limit": 2})
+    cursor = first.headers["X-Next-Cursor"]
+    second = await authenticated_client.get("/monitors/", params={"limit": 2, "cursor": cursor})
+
+    first_ids = {monitor["id"] for monitor in first.json()}
+    assert second.status_code == status.HTTP_200_OK
+    assert first_ids.isdisjoint(monitor["id"] for monitor in second.json())
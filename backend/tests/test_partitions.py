@@ -0,0 +1,165 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+from backend.app.models import Monitor, MonitorHistory, MonitorRollup, Problem, User
+from backend.app.services.partitions import (
+    DEFAULT,
+    aligned_start,
+    apply_monitor_retention,
+    create_partition,
+    drop_expired_partitions,
+    ensure_future_partitions,
+    list_partitions,
+    partition_name,
+)
+from backend.app.services.rollups import DAY, HOUR
+
+# A Postgres database migrated to head, e.g. postgresql://postgres@localhost:5432/monitor.
+# Every test runs in a transaction that is rolled back.
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+class _Rows:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class _Session:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def execute(self, *args, **kwargs):
+        return _Rows(self._rows)
+
+
+def test_aligned_start_and_name():
+    moment = datetime(2026, 10, 18, 15, 30, tzinfo=timezone.utc)
+
+    assert aligned_start(moment, 1) == datetime(2026, 10, 18, tzinfo=timezone.utc)
+    assert (aligned_start(moment, 7) - datetime(1970, 1, 1, tzinfo=timezone.utc)).days % 7 == 0
+    assert aligned_start(moment, 7) <= moment
+    assert partition_name(aligned_start(moment, 1)) == "monitor_history_p20261018"
+
+
+def test_list_partitions_parses_bounds_and_skips_default():
+    session = _Session([
+        ("monitor_history_p20261019",
+         "FOR VALUES FROM ('2026-10-19 00:00:00+00') TO ('2026-10-20 00:00:00+00')"),
+        ("monitor_history_default", "DEFAULT"),
+        ("monitor_history_p20261018",
+         "FOR VALUES FROM ('2026-10-18 00:00:00+00') TO ('2026-10-19 00:00:00+00')"),
+    ])
+
+    partitions = list_partitions(session)
+
+    assert [name for name, _, _ in partitions] == ["monitor_history_p20261018", "monitor_history_p20261019"]
+    assert partitions[0][1] == datetime(2026, 10, 18, tzinfo=timezone.utc)
+    assert partitions[1][2] == datetime(2026, 10, 20, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def pg_session():
+    if not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    engine = create_engine(POSTGRES_URL)
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection)
+    session.execute(text("SET LOCAL TimeZone = 'UTC'"))
+    yield session
+    session.close()
+    transaction.rollback()
+    connection.close()
+    engine.dispose()
+
+
+def add_monitor(session, name: str, retention_days: int | None = None) -> Monitor:
+    user = User(email=f"{name}@partitions.test", hashed_password="x", full_name=name)
+    monitor = Monitor(url=f"http://{name}.com", name=name, owner=user, history_retention_days=retention_days)
+    session.add_all([user, monitor])
+    session.flush()
+    return monitor
+
+
+def add_history(session, monitor: Monitor, checked_at: datetime, status: str = "healthy") -> MonitorHistory:
+    row = MonitorHistory(monitor_id=monitor.id, status=status, status_code=200, latency=50.0, checked_at=checked_at)
+    session.add(row)
+    session.flush()
+    return row
+
+
+def partition_of(session, row: MonitorHistory) -> str:
+    return session.execute(
+        text("SELECT tableoid::regclass::text FROM monitor_history WHERE id = :id"), {"id": row.id}
+    ).scalar()
+
+
+def test_ensure_future_partitions_moves_rows_out_of_default(pg_session):
+    partitions = list_partitions(pg_session)
+    now = (partitions[-1][2] if partitions else datetime(2030, 1, 1, tzinfo=timezone.utc)) + timedelta(days=30)
+    monitor = add_monitor(pg_session, "future")
+    early = add_history(pg_session, monitor, now + timedelta(hours=1))
+    assert partition_of(pg_session, early) == DEFAULT
+
+    created = ensure_future_partitions(pg_session, now, span_days=1, days_ahead=2)
+
+    start = aligned_start(now, 1)
+    assert created == [partition_name(start + timedelta(days=i)) for i in range(3)]
+    assert list_partitions(pg_session)[-1][2] == start + timedelta(days=3)
+    assert partition_of(pg_session, early) == partition_name(start)
+    assert ensure_future_partitions(pg_session, now, span_days=1, days_ahead=2) == []
+
+
+def test_drop_expired_partitions_downsamples_into_missing_buckets(pg_session):
+    start = datetime(2001, 1, 1, tzinfo=timezone.utc)
+    create_partition(pg_session, start, start + timedelta(days=1))
+    monitor = add_monitor(pg_session, "expired")
+    down = add_history(pg_session, monitor, start + timedelta(minutes=10), status="down")
+    add_history(pg_session, monitor, start + timedelta(minutes=20))
+    add_history(pg_session, monitor, start + timedelta(hours=1, minutes=10))
+    pg_session.add_all([
+        Problem(history_id=down.id, monitor_id=monitor.id),
+        # maintained by the check pipeline, kept as it is
+        MonitorRollup(monitor_id=monitor.id, resolution=HOUR, bucket_start=start + timedelta(hours=1), check_count=7),
+    ])
+    pg_session.flush()
+
+    dropped = drop_expired_partitions(pg_session, cutoff=start + timedelta(days=1), downsample=True)
+
+    assert dropped == [partition_name(start)]
+    assert partition_name(start) not in [name for name, _, _ in list_partitions(pg_session)]
+    assert pg_session.scalar(select(Problem).where(Problem.monitor_id == monitor.id)) is None
+
+    rollups = {
+        (rollup.resolution, rollup.bucket_start): rollup
+        for rollup in pg_session.scalars(select(MonitorRollup).where(MonitorRollup.monitor_id == monitor.id))
+    }
+    assert rollups[(HOUR, start)].check_count == 2 and rollups[(HOUR, start)].down_count == 1
+    assert rollups[(HOUR, start + timedelta(hours=1))].check_count == 7
+    assert rollups[(DAY, start)].check_count == 3 and rollups[(DAY, start)].latency_count == 3
+
+
+def test_apply_monitor_retention_deletes_rows_past_the_monitor_retention(pg_session):
+    now = datetime(2001, 2, 10, tzinfo=timezone.utc)
+    short = add_monitor(pg_session, "short", retention_days=2)
+    default = add_monitor(pg_session, "default")
+    expired = add_history(pg_session, short, now - timedelta(days=5))
+    recent = add_history(pg_session, short, now - timedelta(days=1))
+    kept = add_history(pg_session, default, now - timedelta(days=5))
+    pg_session.add(Problem(history_id=expired.id, monitor_id=short.id))
+    pg_session.flush()
+
+    assert apply_monitor_retention(pg_session, now, default_days=30) == 1
+
+    remaining = pg_session.scalars(
+        select(MonitorHistory.id).where(MonitorHistory.monitor_id.in_([short.id, default.id]))
+    ).all()
+    assert sorted(remaining) == sorted([recent.id, kept.id])
+    assert pg_session.scalar(select(Problem).where(Problem.monitor_id == short.id)) is None
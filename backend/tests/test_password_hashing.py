@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+
+from backend.app.auth.utils import hash_password, verify_password
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_the_event_loop():
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    try:
+        hashed = await hash_password("secret123")
+        valid, invalid = await asyncio.gather(verify_password("secret123", hashed), verify_password("wrong", hashed))
+    finally:
+        ticking.cancel()
+
+    assert (valid, invalid) == (True, False)
+    assert ticks >= 5  # the loop kept serving other coroutines while bcrypt ran
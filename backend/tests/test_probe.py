@@ -0,0 +1,83 @@
+import asyncio
+
+import httpx
+import pytest
+
+from backend.app.models import Monitor
+from backend.app.services.probe import ProbeEngine
+
+
+def make_monitor(monitor_id: int, url: str, expected_status_code: int = 200) -> Monitor:
+    return Monitor(id=monitor_id, url=url, name=url, expected_status_code=expected_status_code)
+
+
+@pytest.mark.asyncio
+async def test_probe_classifies_results():
+    def handler(request: httpx.Request):
+        if request.url.host == "down.test":
+            raise httpx.ConnectError("Connection refused", request=request)
+        if request.url.host == "degraded.test":
+            return httpx.Response(503)
+        return httpx.Response(200)
+
+    engine = ProbeEngine(transport=httpx.MockTransport(handler))
+
+    healthy, degraded, down = await engine.probe_many([
+        make_monitor(1, "http://ok.test/"),
+        make_monitor(2, "http://degraded.test/"),
+        make_monitor(3, "http://down.test/"),
+    ])
+    await engine.aclose()
+
+    assert healthy.status == "healthy"
+    assert healthy.latency is not None
+    assert degraded.status == "degraded"
+    assert degraded.error_message == "Unexpected status code: 503"
+    assert down.status == "down"
+    assert down.status_code is None
+
+
+@pytest.mark.asyncio
+async def test_probe_many_respects_concurrency_limit():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: httpx.Request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200)
+
+    engine = ProbeEngine(concurrency=5, transport=httpx.MockTransport(handler))
+
+    results = await engine.probe_many([make_monitor(i, f"http://site{i}.test/") for i in range(50)])
+    await engine.aclose()
+
+    assert len(results) == 50
+    assert all(result.status == "healthy" for result in results)
+    assert max_in_flight == 5
+
+
+@pytest.mark.asyncio
+async def test_probe_records_latency_phases():
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    engine = ProbeEngine()
+    async with server:
+        result = await engine.probe(make_monitor(1, f"http://127.0.0.1:{port}/"))
+    await engine.aclose()
+
+    assert result.status == "healthy"
+    assert result.phases["connect"] is not None
+    assert result.phases["ttfb"] is not None
+    assert result.phases["body"] is not None
+    assert result.phases["tls"] is None
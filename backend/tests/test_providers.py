@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from backend.app.services.utils.providers import (
+    GeminiProvider,
+    OpenAICompatibleProvider,
+    ProviderChain,
+    ProviderError,
+    ProviderParseError,
+)
+
+
+@pytest_asyncio.fixture
+async def fake_llm():
+    """
+    Local stand-in for the LLM APIs. /{behaviour}/chat answers like OpenAI, /{behaviour}/gemini like Gemini.
+    Behaviours: ok, slow (1 s delay), fail (HTTP 500), garbage (unexpected JSON), html (not JSON).
+    """
+    calls = []
+
+    async def handle(request):
+        behaviour, api = request.match_info["behaviour"], request.match_info["api"]
+        calls.append((behaviour, api, request.headers.get("Authorization")))
+        if behaviour == "fail":
+            return web.Response(status=500, text="overloaded")
+        if behaviour == "garbage":
+            return web.json_response({"unexpected": True})
+        if behaviour == "html":
+            return web.Response(text="<html>maintenance</html>", content_type="text/html")
+        if behaviour == "slow":
+            await asyncio.sleep(1)
+
+        text = f"{behaviour} {api} answer"
+        if api == "gemini":
+            return web.json_response({"candidates": [{"content": {"parts": [{"text": text}]}}]})
+        return web.json_response({"choices": [{"message": {"content": text}}]})
+
+    app = web.Application()
+    app.router.add_post("/{behaviour}/{api}", handle)
+    server = TestServer(app)
+    await server.start_server()
+    server.calls = calls
+    yield server
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def chat(fake_llm):
+    providers = []
+
+    def build(behaviour: str, **kwargs) -> OpenAICompatibleProvider:
+        provider = OpenAICompatibleProvider(
+            url=str(fake_llm.make_url(f"/{behaviour}/chat")), api_key="key", model="m", name=behaviour, **kwargs
+        )
+        providers.append(provider)
+        return provider
+
+    yield build
+    for provider in providers:
+        await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_provider_reuses_session_and_parses(fake_llm, chat):
+    provider = chat("ok")
+    gemini = GeminiProvider(url=str(fake_llm.make_url("/ok/gemini")), api_key="key")
+
+    assert await provider.complete("ping") == "ok chat answer"
+    session = provider._session
+    assert await provider.complete("ping") == "ok chat answer"
+    assert provider._session is session
+    assert await gemini.complete("ping") == "ok gemini answer"
+    assert fake_llm.calls[0][2] == "Bearer key"
+
+    with pytest.raises(ProviderParseError):
+        await chat("garbage").complete("ping")
+    with pytest.raises(ProviderError):
+        await chat("slow", timeout=0.1).complete("ping")
+
+    await gemini.aclose()
+
+
+@pytest.mark.asyncio
+async def test_chain_falls_back_in_order(fake_llm, chat):
+    chain = ProviderChain([
+        chat("fail"), chat("garbage"), chat("html"), chat("ok"),
+    ])
+
+    assert await chain.complete("ping") == "ok chat answer"
+    assert [behaviour for behaviour, _, _ in fake_llm.calls] == ["fail", "garbage", "html", "ok"]
+
+    with pytest.raises(ProviderError):
+        await ProviderChain([chat("fail")]).complete("ping")
+
+
+@pytest.mark.asyncio
+async def test_chain_hedges_slow_provider(chat):
+    chain = ProviderChain([chat("slow"), chat("ok")], hedge_after=0.1)
+
+    started = time.monotonic()
+    assert await chain.complete("ping") == "ok chat answer"
+    assert time.monotonic() - started < 0.9
+
+
+@pytest.mark.asyncio
+async def test_chain_failure_while_hedging_starts_next_provider(fake_llm, chat):
+    chain = ProviderChain([chat("slow"), chat("fail"), chat("ok")], hedge_after=0.3)
+
+    started = time.monotonic()
+    assert await chain.complete("ping") == "ok chat answer"
+    # "ok" started as soon as "fail" failed, not after another hedge_after or the slow answer
+    assert time.monotonic() - started < 0.5
+    assert [behaviour for behaviour, _, _ in fake_llm.calls] == ["slow", "fail", "ok"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_per_provider(chat):
+    provider = chat("slow", concurrency=2)
+
+    started = time.monotonic()
+    await asyncio.gather(*(provider.complete("ping") for _ in range(4)))
+
+    assert time.monotonic() - started >= 2
@@ -0,0 +1,56 @@
+import fakeredis
+import pytest
+
+from backend.app.services.redis_schedule import RedisDueQueue
+
+
+@pytest.fixture
+def fake_redis():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def test_claim_reschedules_by_interval(fake_redis):
+    queue = RedisDueQueue(fake_redis)
+    queue.sync({1: (100.0, 30), 2: (200.0, 60)})
+
+    assert queue.claim_due(now=150.0) == [(1, 180.0)]
+    assert queue.claim_due(now=150.0) == []
+    assert queue.claim_due(now=200.0) == [(1, 230.0), (2, 260.0)]
+
+
+def test_replicas_never_claim_the_same_monitor(fake_redis):
+    replica_a = RedisDueQueue(fake_redis)
+    replica_b = RedisDueQueue(fake_redis)
+    replica_a.sync({monitor_id: (10.0, 60) for monitor_id in range(100)})
+
+    claimed_a = replica_a.claim_due(now=10.0, limit=40)
+    claimed_b = replica_b.claim_due(now=10.0)
+
+    ids_a = {monitor_id for monitor_id, _ in claimed_a}
+    ids_b = {monitor_id for monitor_id, _ in claimed_b}
+    assert len(ids_a) == 40
+    assert ids_a.isdisjoint(ids_b)
+    assert ids_a | ids_b == set(range(100))
+
+
+def test_sync_keeps_claimed_due_times_and_drops_inactive(fake_redis):
+    queue = RedisDueQueue(fake_redis)
+    queue.sync({1: (10.0, 60), 2: (10.0, 60)})
+    queue.claim_due(now=10.0)
+
+    queue.sync({1: (10.0, 60), 3: (5.0, 60)})
+
+    assert fake_redis.zscore(RedisDueQueue.DUE_KEY, "1") == 70.0
+    assert fake_redis.zscore(RedisDueQueue.DUE_KEY, "2") is None
+    assert queue.claim_due(now=10.0) == [(3, 70.0)]
+
+
+def test_only_one_replica_holds_the_lease(fake_redis):
+    queue = RedisDueQueue(fake_redis)
+
+    assert queue.acquire_lease("replica-a", ttl_ms=10_000)
+    assert not queue.acquire_lease("replica-b", ttl_ms=10_000)
+    assert queue.acquire_lease("replica-a", ttl_ms=10_000)
+
+    fake_redis.delete(RedisDueQueue.LEASE_KEY)
+    assert queue.acquire_lease("replica-b", ttl_ms=10_000)
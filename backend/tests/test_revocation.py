@@ -0,0 +1,134 @@
+import time
+
+import fakeredis
+import pytest
+import pytest_asyncio
+
+from backend.app.auth import revocation
+from backend.app.auth.revocation import TokenRevocation
+from backend.app.services.utils.bloom import BloomFilter
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    store = TokenRevocation(redis, sync_interval=60)
+    for module in ("backend.app.auth.dependencies", "backend.app.services.auth_services"):
+        monkeypatch.setattr(f"{module}.token_revocation", store)
+    return redis
+
+
+@pytest_asyncio.fixture
+async def tokens(client, redis):
+    user = {"email": "revocation@gmail.com", "password": "secret123", "full_name": "Revocation User"}
+    await client.post("/auth/register/", json=user)
+    response = await client.post("/auth/login/", json={"email": user["email"], "password": user["password"]})
+    return response.json()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(size=1 << 16, hashes=7)
+    added = [f"jti-{i}" for i in range(1000)]
+    for item in added:
+        bloom.add(item)
+
+    assert all(item in bloom for item in added)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 100
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_the_access_token(client, tokens):
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert (await client.get("/monitors/", headers=headers)).status_code == 200
+
+    logout = await client.post("/auth/logout/", headers=headers)
+    after = await client.get("/monitors/", headers=headers)
+
+    assert logout.status_code == 200
+    assert after.status_code == 401
+    assert after.json()["detail"] == "Token has been revoked"
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_the_refresh_token(client, tokens):
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    logout = await client.post("/auth/logout/", headers=headers, json={"refresh_token": tokens["refresh_token"]})
+    refresh = await client.post("/auth/refresh/", json={"refresh_token": tokens["refresh_token"]})
+
+    assert logout.status_code == 200
+    assert refresh.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_refresh_tokens_are_single_use(client, tokens):
+    first = await client.post("/auth/refresh/", json={"refresh_token": tokens["refresh_token"]})
+    replay = await client.post("/auth/refresh/", json={"refresh_token": tokens["refresh_token"]})
+    rotated = await client.post("/auth/refresh/", json={"refresh_token": first.json()["refresh_token"]})
+    as_bearer = await client.get("/monitors/", headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+
+    assert first.status_code == 200
+    assert replay.status_code == 401
+    assert rotated.status_code == 200
+    assert as_bearer.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_filter_skips_redis_for_valid_tokens_and_syncs_other_processes():
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    now = [1000.0]
+    this, other = (TokenRevocation(redis, sync_interval=5, clock=lambda: now[0]) for _ in range(2))
+    exists_calls = []
+    exists = redis.exists
+
+    async def counting_exists(*keys):
+        exists_calls.append(keys)
+        return await exists(*keys)
+
+    redis.exists = counting_exists
+
+    assert not await other.is_revoked("a")  # first sync, empty filter
+    await this.revoke("a", expires_at=now[0] + 1800)
+
+    assert await this.is_revoked("a")
+    assert not await other.is_revoked("a")  # not synced yet
+    assert not await this.is_revoked("b")
+    assert len(exists_calls) == 1  # only the filter hit went to Redis
+
+    now[0] += 5
+    assert await other.is_revoked("a")
+
+    now[0] += 1800  # expired tokens drop out of the filter
+    assert not await other.is_revoked("a")
+    assert await redis.zcard(revocation.REVOKED_ACCESS_KEY) == 0
+
+
+class BrokenRedis:
+    def pipeline(self, transaction=True):
+        raise ConnectionError("Redis is down")
+
+    async def exists(self, *keys):
+        raise ConnectionError("Redis is down")
+
+    async def set(self, *args, **kwargs):
+        raise ConnectionError("Redis is down")
+
+
+@pytest.mark.asyncio
+async def test_checks_fail_open_and_rotation_fails_closed_without_redis():
+    store = TokenRevocation(BrokenRedis(), sync_interval=5)
+    store._bloom.add("a")
+
+    assert not await store.is_revoked("a")
+    with pytest.raises(ConnectionError):
+        await store.consume("r", expires_at=time.time() + 60)
+
+
+@pytest.mark.asyncio
+async def test_refresh_fails_closed_without_redis(client, tokens, monkeypatch):
+    monkeypatch.setattr("backend.app.services.auth_services.token_revocation", TokenRevocation(BrokenRedis()))
+
+    refresh = await client.post("/auth/refresh/", json={"refresh_token": tokens["refresh_token"]})
+
+    assert refresh.status_code == 503
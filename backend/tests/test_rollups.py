@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from starlette import status
+
+from backend.app.models import MonitorRollup
+from backend.app.services.rollups import DAY, HOUR, MINUTE, LatencySketch, aggregate, window_segments
+
+
+def test_aggregate_folds_results_into_every_resolution():
+    checked_at = datetime(2026, 1, 1, 10, 30, 15, tzinfo=timezone.utc)
+    rows = [
+        {"monitor_id": 1, "status": "healthy", "latency": 100.0, "checked_at": checked_at},
+        {"monitor_id": 1, "status": "down", "latency": None, "checked_at": checked_at + timedelta(seconds=20)},
+        {"monitor_id": 1, "status": "degraded", "latency": 300.0, "checked_at": checked_at + timedelta(seconds=50)},
+    ]
+
+    rollups = {(r["resolution"], r["bucket_start"]): r for r in aggregate(rows)}
+
+    minute = rollups[(MINUTE, datetime(2026, 1, 1, 10, 30, tzinfo=timezone.utc))]
+    assert (minute["check_count"], minute["down_count"], minute["degraded_count"]) == (2, 1, 0)
+
+    day = rollups[(DAY, datetime(2026, 1, 1, tzinfo=timezone.utc))]
+    assert day["check_count"] == 3
+    assert day["latency_count"] == 2
+    assert (day["latency_min"], day["latency_max"], day["latency_sum"]) == (100.0, 300.0, 400.0)
+    assert sum(day["latency_sketch"]) == 2
+
+
+def test_window_segments_tile_the_window_with_coarse_buckets():
+    start = datetime(2026, 1, 1, 22, 45, tzinfo=timezone.utc)
+    end = datetime(2026, 1, 4, 1, 30, tzinfo=timezone.utc)
+
+    segments = window_segments(start, end)
+
+    assert (DAY, datetime(2026, 1, 2, tzinfo=timezone.utc), datetime(2026, 1, 4, tzinfo=timezone.utc)) in segments
+    assert sum(1 for resolution, _, _ in segments if resolution == MINUTE) == 2
+    covered = sorted((lo, hi) for _, lo, hi in segments)
+    assert covered[0][0] == start
+    assert covered[-1][1] == end
+    assert all(prev[1] == nxt[0] for prev, nxt in zip(covered, covered[1:]))
+
+
+def test_sketch_quantile_is_within_bin_error():
+    sketch = LatencySketch.empty()
+    for latency in range(1, 1001):
+        sketch[LatencySketch.bin(latency)] += 1
+
+    p50 = LatencySketch.quantile(sketch, 0.5)
+    p99 = LatencySketch.quantile(sketch, 0.99)
+
+    assert 500 / LatencySketch.GAMMA <= p50 <= 500 * LatencySketch.GAMMA
+    assert 990 / LatencySketch.GAMMA <= p99 <= 990 * LatencySketch.GAMMA
+
+
+@pytest.mark.asyncio
+async def test_uptime_endpoint_reads_rollups(authenticated_client, async_session):
+    response = await authenticated_client.post("/monitors/", json={"url": "http://rollup.com", "name": "rollup"})
+    monitor_id = response.json()["id"]
+
+    day = datetime(2026, 1, 2, tzinfo=timezone.utc)
+    sketch = LatencySketch.empty()
+    sketch[LatencySketch.bin(120)] = 8
+    async_session.add(MonitorRollup(
+        monitor_id=monitor_id, resolution=DAY, bucket_start=day,
+        check_count=10, down_count=1, degraded_count=1,
+        latency_count=8, latency_sum=960.0, latency_min=100.0, latency_max=150.0, latency_sketch=sketch,
+    ))
+    async_session.add(MonitorRollup(
+        monitor_id=monitor_id, resolution=HOUR, bucket_start=day + timedelta(days=1),
+        check_count=10, down_count=0, degraded_count=0,
+        latency_count=0, latency_sum=0.0,
+    ))
+    await async_session.commit()
+
+    params = {"start": "2026-01-02T00:00:00+00:00", "end": "2026-01-03T01:00:00+00:00"}
+    uptime = await authenticated_client.get(f"/monitors/{monitor_id}/uptime/", params=params)
+    latency = await authenticated_client.get(f"/monitors/{monitor_id}/latency/", params=params)
+
+    assert uptime.status_code == status.HTTP_200_OK
+    assert uptime.json()["checks"] == 20
+    assert uptime.json()["uptime_percent"] == 90.0
+    assert latency.json()["avg_ms"] == 120.0
+    assert latency.json()["max_ms"] == 150.0
@@ -0,0 +1,41 @@
+from backend.app.services.schedule_queue import DueQueue
+
+
+def test_pop_due_returns_only_due_monitors_in_order():
+    queue = DueQueue()
+    queue.push(1, 30.0)
+    queue.push(2, 10.0)
+    queue.push(3, 20.0)
+
+    assert queue.pop_due(now=25.0) == [2, 3]
+    assert len(queue) == 1
+    assert queue.pop_due(now=25.0) == []
+    assert queue.pop_due(now=30.0) == [1]
+
+
+def test_rescheduled_monitor_is_popped_once():
+    queue = DueQueue()
+    queue.push(1, 10.0)
+    queue.push(1, 50.0)
+
+    assert queue.pop_due(now=20.0) == []
+    assert queue.pop_due(now=60.0) == [1]
+
+
+def test_removed_monitor_is_skipped():
+    queue = DueQueue()
+    queue.push(1, 10.0)
+    queue.push(2, 10.0)
+    queue.remove(1)
+
+    assert queue.pop_due(now=10.0) == [2]
+
+
+def test_replace_rebuilds_queue_from_snapshot():
+    queue = DueQueue()
+    queue.push(1, 10.0)
+
+    queue.replace({2: 5.0, 3: 100.0})
+
+    assert 1 not in queue
+    assert queue.pop_due(now=50.0) == [2]
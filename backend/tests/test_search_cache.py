@@ -0,0 +1,64 @@
+import fakeredis
+import pytest
+
+from backend.app.services import duckduckgo
+from backend.app.services.single_flight import SingleFlight
+from backend.app.services.utils.cache import TTLCache, error_class, search_cache_key
+
+
+def test_ttl_cache_expires_and_evicts_lru():
+    now = [0.0]
+    cache = TTLCache(max_size=2, ttl=10, clock=lambda: now[0])
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    now[0] = 11
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+def test_search_key_groups_similar_failures():
+    assert error_class("Unexpected status code: 503") == "http_503"
+    assert error_class("ReadTimeout('timed out')") == "timeout"
+    assert error_class("[Errno -2] Name or service not known") == "dns"
+    pool_error = error_class("Pool exhausted after 3 retries talking to 10.0.0.7:5432")
+    assert pool_error == error_class("Pool exhausted after 5 retries talking to 10.0.0.9:6432")
+    assert pool_error == "pool exhausted after <n> retries talking"
+
+    assert search_cache_key("https://www.shop.com/api/v1", "Unexpected status code: 503") == \
+        search_cache_key("http://shop.com/health", "Unexpected status code: 503")
+    assert search_cache_key("https://shop.com", "Unexpected status code: 503") != \
+        search_cache_key("https://shop.com", "Unexpected status code: 502")
+    assert search_cache_key("https://shop.com", "timed out") != search_cache_key("https://blog.com", "timed out")
+
+
+@pytest.mark.asyncio
+async def test_search_is_cached_locally_and_in_redis(monkeypatch):
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    scrapes = []
+
+    async def scrape(query, max_results):
+        scrapes.append(query)
+        return [{"title": "Outage", "href": "https://status.example.com", "snippet": "Down"}]
+
+    monkeypatch.setattr(duckduckgo, "_duckduckgo_search", scrape)
+    local_cache = TTLCache(max_size=10, ttl=60)
+    monkeypatch.setattr(duckduckgo, "single_flight", SingleFlight(redis, local=local_cache))
+
+    key = search_cache_key("https://shop.com", "Unexpected status code: 503")
+    first = await duckduckgo.duckduckgo_search("Why https://shop.com is down, 503", cache_key=key)
+    second = await duckduckgo.duckduckgo_search("Why https://shop.com/api is down, 503", cache_key=key)
+
+    local_cache.clear()  # another worker: only Redis has it
+    third = await duckduckgo.duckduckgo_search("Why https://shop.com is down, 503", cache_key=key)
+
+    assert first == second == third
+    assert len(scrapes) == 1
+    stats = duckduckgo.single_flight.stats
+    assert (stats.local_hits, stats.redis_hits, stats.misses) == (1, 1, 1)
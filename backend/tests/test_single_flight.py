@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import fakeredis
+import pytest
+from redis.exceptions import ConnectionError
+
+from backend.app.services.single_flight import SingleFlight
+
+
+def shared_redis():
+    server = fakeredis.FakeServer()
+    return lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+
+
+@pytest.mark.asyncio
+async def test_one_call_across_workers():
+    connect = shared_redis()
+    workers = [SingleFlight(connect(), lock_ttl=10, wait_timeout=5, poll_interval=0.05) for _ in range(3)]
+    calls = 0
+
+    async def analyze():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.2)
+        return {"analysis": "upstream DNS outage"}
+
+    results = await asyncio.gather(*(
+        worker.do("incident:1", analyze, ttl=60) for worker in workers for _ in range(4)
+    ))
+
+    assert calls == 1
+    assert all(result == {"analysis": "upstream DNS outage"} for result in results)
+    assert json.loads(await connect().get("incident:1")) == {"analysis": "upstream DNS outage"}
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_result_is_shared_but_not_stored():
+    connect = shared_redis()
+    leader, follower = SingleFlight(connect(), wait_timeout=5, poll_interval=0.05), SingleFlight(connect())
+    calls = 0
+
+    async def failing_analysis():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return {"analysis": "AI timeout", "error": True}
+
+    first, second = await asyncio.gather(
+        leader.do("incident:2", failing_analysis, ttl=60, cache_if=lambda data: not data.get("error")),
+        follower.do("incident:2", failing_analysis, ttl=60, cache_if=lambda data: not data.get("error")),
+    )
+
+    assert calls == 1
+    assert first == second
+    assert await connect().get("incident:2") is None
+
+
+@pytest.mark.asyncio
+async def test_runs_without_redis():
+    class BrokenRedis:
+        async def get(self, key):
+            raise ConnectionError("Redis is down")
+
+    async def analyze():
+        return "done"
+
+    assert await SingleFlight(BrokenRedis()).do("incident:3", analyze, ttl=60) == "done"
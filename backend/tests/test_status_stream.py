@@ -0,0 +1,137 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import fakeredis
+import pytest
+import pytest_asyncio
+
+from backend.app.api.routers import monitor_router
+from backend.app.models import User
+from backend.app.services import status_stream
+from backend.app.services.history_sink import BufferedCheck
+from backend.app.services.status_stream import (
+    StatusBroker, Subscription, check_event, publish_check_results, status_events,
+)
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest_asyncio.fixture
+async def broker(server):
+    broker = StatusBroker(fakeredis.FakeAsyncRedis(server=server, decode_responses=True), queue_size=3)
+    yield broker
+    await broker.aclose()
+
+
+def make_check(monitor_id, owner_id, status="healthy"):
+    check = BufferedCheck(
+        history={"monitor_id": monitor_id, "status": status, "status_code": 200, "latency": 0.1,
+                 "error_message": None, "checked_at": datetime(2026, 1, 1, tzinfo=timezone.utc)},
+        meta={"owner_id": owner_id},
+    )
+    check.history_id = monitor_id * 10
+    return check
+
+
+async def next_event(subscription):
+    return json.loads(await asyncio.wait_for(subscription.queue.get(), timeout=2))
+
+
+@pytest.mark.asyncio
+async def test_broker_fans_out_per_owner(server, broker, monkeypatch):
+    monkeypatch.setattr(status_stream, "sync_redis_client", fakeredis.FakeRedis(server=server))
+    first, second = await broker.subscribe(1), await broker.subscribe(1)
+    other = await broker.subscribe(2)
+
+    publish_check_results([make_check(5, owner_id=1), make_check(6, owner_id=2), make_check(7, owner_id=None)])
+
+    assert (await next_event(first))["monitor_id"] == 5
+    assert (await next_event(second))["monitor_id"] == 5
+    event = await next_event(other)
+    assert event["monitor_id"] == 6
+    assert event["checked_at"] == "2026-01-01T00:00:00+00:00"
+    await asyncio.sleep(0.1)
+    assert first.queue.empty() and other.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_drops_channel_after_last_client(server, broker, monkeypatch):
+    monkeypatch.setattr(status_stream, "sync_redis_client", fakeredis.FakeRedis(server=server))
+    first, second = await broker.subscribe(1), await broker.subscribe(1)
+
+    await broker.unsubscribe(first)
+    publish_check_results([make_check(5, owner_id=1)])
+    assert (await next_event(second))["monitor_id"] == 5
+    assert first.queue.empty()
+
+    await broker.unsubscribe(second)
+    assert fakeredis.FakeRedis(server=server).pubsub_numsub("status:1") == [(b"status:1", 0)]
+
+
+def test_publish_without_redis_does_not_raise(monkeypatch):
+    redis = fakeredis.FakeRedis()
+    redis.connected = False
+    monkeypatch.setattr(status_stream, "sync_redis_client", redis)
+    publish_check_results([make_check(5, owner_id=1)])
+
+
+def test_subscription_drops_oldest():
+    subscription = Subscription(owner_id=1, max_size=2)
+    for data in ("a", "b", "c", "d"):
+        subscription.put(data)
+
+    assert subscription.dropped == 2
+    assert [subscription.queue.get_nowait(), subscription.queue.get_nowait()] == ["c", "d"]
+
+
+@pytest.mark.asyncio
+async def test_status_events_frames():
+    subscription = Subscription(owner_id=1, max_size=1)
+    subscription.put(json.dumps(check_event(make_check(5, owner_id=1))))
+    subscription.put("{}")
+    events = status_events(subscription, keepalive=0.05)
+
+    assert await anext(events) == "event: dropped\ndata: 1\n\n"
+    assert await anext(events) == "event: check\ndata: {}\n\n"
+    assert await anext(events) == ": keepalive\n\n"
+    await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_requires_token(client):
+    assert (await client.get("/monitors/stream/")).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_disconnect_unsubscribes_even_when_cancelled_again(server, broker, monkeypatch):
+    monkeypatch.setattr(monitor_router, "status_broker", broker)
+    unsubscribe = broker.unsubscribe
+
+    async def slow_unsubscribe(subscription):
+        await asyncio.sleep(0.01)  # a round trip to Redis
+        await unsubscribe(subscription)
+
+    monkeypatch.setattr(broker, "unsubscribe", slow_unsubscribe)
+
+    class Session:
+        async def close(self):
+            pass
+
+    response = await monitor_router.stream_status(db=Session(), current_user=User(id=7))
+    reader = asyncio.create_task(anext(response.body_iterator))
+    await asyncio.sleep(0.05)
+    assert fakeredis.FakeRedis(server=server).pubsub_numsub("status:7") == [(b"status:7", 1)]
+
+    # a disconnected client's scope keeps cancelling the generator while it cleans up
+    reader.cancel()
+    await asyncio.sleep(0.005)
+    reader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await reader
+    await asyncio.sleep(0.05)
+
+    assert fakeredis.FakeRedis(server=server).pubsub_numsub("status:7") == [(b"status:7", 0)]
@@ -0,0 +1,83 @@
+import asyncio
+
+import fakeredis
+import pytest
+from redis.exceptions import ConnectionError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import DetachedInstanceError
+
+from backend.app.auth.user_cache import UserCache, user_cache
+from backend.app.core.database import Base
+from backend.app.models import User
+
+
+@pytest.mark.asyncio
+async def test_authenticated_requests_skip_the_database(client, async_session, monkeypatch):
+    user = {"email": "cached@gmail.com", "password": "secret123", "full_name": "Cached User"}
+    await client.post("/auth/register/", json=user)
+    response = await client.post("/auth/login/", json={"email": user["email"], "password": user["password"]})
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    user_cache.clear()
+
+    lookups = []
+    get = async_session.get
+
+    async def counting_get(entity, ident, **kwargs):
+        if entity is User:
+            lookups.append(ident)
+        return await get(entity, ident, **kwargs)
+
+    monkeypatch.setattr(async_session, "get", counting_get)
+    for _ in range(3):
+        assert (await client.get("/monitors/", headers=headers)).status_code == 200
+
+    assert len(lookups) == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_and_invalidated_on_commit(tmp_path, monkeypatch):
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    first, second = UserCache(ttl=60, max_size=10, redis=redis), UserCache(ttl=60, max_size=10, redis=redis)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    Base.metadata.create_all(engine)
+    session_maker = sessionmaker(bind=engine, expire_on_commit=False)
+    with session_maker() as session:
+        user = User(email="redis@gmail.com", hashed_password="x", full_name="Before")
+        session.add(user)
+        session.commit()
+
+    await first.set(user)
+    cached = await second.get(user.id)  # another process: found in Redis
+    assert (cached.id, cached.email, cached.full_name) == (user.id, "redis@gmail.com", "Before")
+    with pytest.raises(DetachedInstanceError):
+        cached.hashed_password  # never cached
+
+    monkeypatch.setattr(user_cache, "_redis", redis)
+    await user_cache.set(user)
+    with session_maker() as session:
+        session.get(User, user.id).full_name = "After"
+        session.commit()
+    await asyncio.sleep(0)  # let the scheduled Redis delete run
+
+    assert await user_cache.get(user.id) is None
+    assert await redis.get(f"user:{user.id}") is None
+    engine.dispose()
+
+
+class BrokenRedis:
+    async def get(self, key):
+        raise ConnectionError("Redis is down")
+
+    async def set(self, key, value, ex=None):
+        raise ConnectionError("Redis is down")
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_the_database():
+    cache = UserCache(ttl=60, max_size=10, redis=BrokenRedis())
+
+    assert await cache.get(1) is None
+    await cache.set(User(id=1, email="x@gmail.com", full_name="X"))
+    assert (await cache.get(1)).email == "x@gmail.com"  # the local tier still works